@@ -0,0 +1,248 @@
+"""
+alerts.py — delta alerting: only the violations that changed between runs
+
+Each run's violations are reduced to a fingerprint index with one entry
+per (requisition_id, stage, metric, responsible_party): a 64-bit hash of
+that key, the worst severity, the violation count and the penalty total.
+The index is persisted per dataset; the next run hashes its own
+violations the same way and joins the two on the hash, so a diff is
+linear in the violations however long the history:
+
+  new        — key not in the previous run
+  escalated  — key present before, now with a worse severity (more
+               violations at the same worst severity are not an escalation)
+  resolved   — key in the previous run, gone now
+
+The first run of a dataset only records the baseline. Every alert of a
+run is also appended to a local outbox (one JSON line each) that a
+notifier can tail and deliver:
+
+  <alerts dir>/<dataset>.index.npz   — fingerprint index of the last run
+  <alerts dir>/<dataset>.last.json   — that run's diff (served by /api/alerts)
+  <alerts dir>/outbox.jsonl          — one line per alert, all datasets
+
+api.py runs AlertLog.update() for every export version it loads (when a
+snapshot is built or an upload is activated), so every run reaches the
+outbox and is diffed against the run before it, whether or not anyone
+reads /api/alerts.
+
+Usage:
+    python alerts.py --export sample_ats_export.csv
+    python alerts.py --export new_export.csv --dataset emea --dir .alerts
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from events import HIGH_SEVERITY_KEY
+from serialization import dumps
+
+# A violation's identity across runs, the same key /api/stream diffs on
+ALERT_KEY = HIGH_SEVERITY_KEY
+SEVERITY_RANK = {"low": 1, "medium": 2, "high": 3}
+SEVERITIES = {rank: severity for severity, rank in SEVERITY_RANK.items()}
+ALERT_TYPES = ("new", "escalated", "resolved")
+
+
+# ── Fingerprints and diffs ─────────────────────────────────────────────────────
+def key_hash(keys):
+    """
+    Stable 64-bit hash per row of the key columns. Each column is factorized
+    first so only its distinct values are hashed (stage, metric and person
+    repeat heavily), then the column hashes are mixed row-wise.
+    """
+    combined = np.zeros(len(keys), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for column in keys.columns:
+            codes, uniques = pd.factorize(keys[column].astype(str))
+            column_hash = pd.util.hash_array(np.asarray(uniques, dtype=object), categorize=False)[codes]
+            combined = combined * np.uint64(0x100000001B3) ^ column_hash
+    return combined
+
+
+def fingerprint(violations):
+    """
+    One row per ALERT_KEY, indexed by its 64-bit hash: the key columns,
+    severity (worst, as SEVERITY_RANK), count and penalty (total)
+    """
+    if violations.empty:
+        return pd.DataFrame(
+            {**{c: pd.Series(dtype=str) for c in ALERT_KEY},
+             "severity": pd.Series(dtype=np.int8), "count": pd.Series(dtype=np.int64),
+             "penalty": pd.Series(dtype=np.int64)},
+            index=pd.Index([], dtype=np.uint64, name="hash"),
+        )
+    hashes = key_hash(violations[ALERT_KEY])
+    facts = pd.DataFrame({
+        "hash": hashes,
+        "severity": violations["severity"].map(SEVERITY_RANK).fillna(0).astype(np.int8).to_numpy(),
+        "penalty": violations["penalty"].astype(np.int64).to_numpy(),
+    })
+    grouped = facts.groupby("hash", sort=False)
+    prints = pd.DataFrame({
+        "severity": grouped["severity"].max(),
+        "count": grouped.size(),
+        "penalty": grouped["penalty"].sum(),
+    })
+    # Key columns from each hash's first violation
+    first = facts.drop_duplicates("hash")
+    keys = violations[ALERT_KEY].iloc[first.index.to_numpy()].astype(str)
+    keys.index = first["hash"].to_numpy()
+    return pd.concat([keys.reindex(prints.index), prints], axis=1).rename_axis("hash")
+
+
+def _alert_records(prints, alert, previous=None):
+    records = []
+    for key, row in zip(prints.index, prints.itertuples(index=False)):
+        record = {
+            "type": alert,
+            **{c: getattr(row, c) for c in ALERT_KEY},
+            "severity": SEVERITIES.get(row.severity),
+            "count": int(row.count),
+            "penalty": int(row.penalty),
+        }
+        if previous is not None:
+            before = previous.loc[key]
+            record["previous_severity"] = SEVERITIES.get(before["severity"])
+            record["previous_count"] = int(before["count"])
+            record["previous_penalty"] = int(before["penalty"])
+        records.append(record)
+    return records
+
+
+def diff_fingerprints(previous, current):
+    """{'new', 'escalated', 'resolved': [alert records]} between two fingerprint indexes"""
+    was = current.index.isin(previous.index)
+    still = previous.index.isin(current.index)
+
+    new = current[~was]
+    resolved = previous[~still]
+
+    both = current[was]
+    before = previous.reindex(both.index)
+    escalated = both[both["severity"].to_numpy() > before["severity"].to_numpy()]
+
+    return {
+        "new": _alert_records(new, "new"),
+        "escalated": _alert_records(escalated, "escalated", previous),
+        "resolved": _alert_records(resolved, "resolved"),
+    }
+
+
+# ── Persistence ────────────────────────────────────────────────────────────────
+def save_index(prints, path):
+    """Write a fingerprint index as .npz (plain arrays, no pickle)"""
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(
+        tmp,
+        hash=prints.index.to_numpy(dtype=np.uint64),
+        **{c: prints[c].to_numpy(dtype=str) for c in ALERT_KEY},
+        severity=prints["severity"].to_numpy(dtype=np.int8),
+        count=prints["count"].to_numpy(dtype=np.int64),
+        penalty=prints["penalty"].to_numpy(dtype=np.int64),
+    )
+    os.replace(tmp, path)
+
+
+def load_index(path):
+    """A saved fingerprint index, or None"""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return pd.DataFrame(
+                {c: data[c] for c in [*ALERT_KEY, "severity", "count", "penalty"]},
+                index=pd.Index(data["hash"], name="hash"),
+            )
+    except FileNotFoundError:
+        return None
+
+
+class AlertLog:
+    """
+    Per-dataset fingerprint indexes, last diffs and the shared outbox in
+    one directory. update() is safe across processes (file lock per
+    dataset), so every API worker sees the same diff for a version.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.outbox = os.path.join(directory, "outbox.jsonl")
+
+    def _path(self, dataset, suffix):
+        return os.path.join(self.directory, f"{dataset}.{suffix}")
+
+    def last(self, dataset):
+        """The latest diff recorded for a dataset, or None"""
+        try:
+            with open(self._path(dataset, "last.json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def update(self, dataset, version, violations):
+        """
+        Diff a run's violations against the dataset's previous run, append
+        the alerts to the outbox and make this run the new baseline.
+        Returns the diff; a version already recorded returns its stored diff.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(dataset, "lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            last = self.last(dataset)
+            if last is not None and last["version"] == version:
+                return last
+
+            current = fingerprint(violations)
+            previous = load_index(self._path(dataset, "index.npz"))
+            if previous is None:
+                alerts = {alert: [] for alert in ALERT_TYPES}
+            else:
+                alerts = diff_fingerprints(previous, current)
+            diff = {
+                "dataset": dataset,
+                "version": version,
+                "previous_version": None if last is None else last["version"],
+                "baseline": previous is None,
+                "created_at": time.time(),
+                **{alert: alerts[alert] for alert in ALERT_TYPES},
+                "counts": {alert: len(alerts[alert]) for alert in ALERT_TYPES},
+            }
+
+            lines = [
+                dumps({"dataset": dataset, "version": version, "created_at": diff["created_at"], **record})
+                for alert in ALERT_TYPES for record in alerts[alert]
+            ]
+            if lines:
+                with open(self.outbox, "ab") as f:
+                    f.write(b"\n".join(lines) + b"\n")
+            save_index(current, self._path(dataset, "index.npz"))
+            tmp = f"{self._path(dataset, 'last.json')}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(dumps(diff))
+            os.replace(tmp, self._path(dataset, "last.json"))
+            return diff
+
+
+if __name__ == "__main__":
+    from scoring_engine import ScorecardEngine
+    from snapshot import export_version
+
+    parser = argparse.ArgumentParser(description="Diff an export's violations against the previous run")
+    parser.add_argument("--export", default="sample_ats_export.csv", help="ATS export CSV")
+    parser.add_argument("--dataset", default="default", help="dataset the export belongs to")
+    parser.add_argument("--dir", default=".alerts", help="alert state and outbox directory")
+    args = parser.parse_args()
+
+    violations = ScorecardEngine(pd.read_csv(args.export)).calculate_scores()
+    diff = AlertLog(args.dir).update(args.dataset, export_version(args.export), violations)
+    if diff["baseline"]:
+        print(f"✓ Baseline of {len(violations)} violations recorded for {args.dataset}")
+    else:
+        counts = diff["counts"]
+        print(f"✓ {counts['new']} new, {counts['escalated']} escalated, {counts['resolved']} resolved "
+              f"(outbox: {os.path.join(args.dir, 'outbox.jsonl')})")
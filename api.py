@@ -5,27 +5,135 @@ Drop this into: github.com/Talent-Drift/HiringTeam-Scorecard-demo
 Imports your existing scoring_engine.py and exposes endpoints
 the React dashboard calls. Zero changes to your existing files.
 
-Endpoints:
+Endpoints (data endpoints take ?dataset=<name> to pick a business unit's export):
   GET /api/health               — confirm API is running
-  GET /api/scores               — all recruiter + HM scores (latest)
+  POST /api/datasets            — upload an ATS export (raw CSV body; needs X-Admin-Token); scored by a background job
+  GET /api/datasets             — datasets (business units) the API can serve
+  GET /api/jobs/{id}            — upload job progress (rows parsed, metrics done, elapsed)
+  GET /api/cache                — snapshot cache counters and per-dataset memory use
+  GET /api/metrics              — Prometheus metrics (build stage, request and serialization timings)
+  GET /api/admin/profile        — profiled scoring run as a zip (cProfile + memory per stage; needs X-Admin-Token)
+  GET /api/stream               — Server-Sent Events: score changes, new high-severity violations, SLA breaches
+  GET /api/scores               — all recruiter + HM scores (latest, with 14-day deltas); ?names=a,b for a batch;
+                                  ?from=&to= scores only that date window (plus team averages)
   GET /api/scores/{name}        — single person's scores + breakdown
-  GET /api/historical           — all 6 snapshots from historical_performance_data.json
-  GET /api/roles                — all open roles from sample_ats_export.csv
-  GET /api/violations/{name}    — violations for a specific person
-  GET /api/org                  — org summary (averages, totals)
+  GET /api/dashboard/{name}     — scores, violations, roles, trend and counterparts in one call
+  GET /api/historical           — historical snapshots from the history store (?from=&to= range; see history_store.py)
+  GET /api/roles                — open roles (filter / paginate / project)
+  GET /api/violations/{name}    — violations for a specific person (filter / paginate / project)
+  GET /api/org                  — org summary (averages, totals, 14-day deltas)
   GET /api/departments          — scores broken down by department
+  GET /api/leaderboard          — top (or bottom) k by role type, org-wide or per team
+  GET /api/percentile/{name}    — a person's rank and percentile, org-wide and per team
+  GET /api/export/violations    — every matching violation, streamed as NDJSON or CSV
+  GET /api/export/scores        — recruiter / HM score tables, streamed as NDJSON or CSV
+  GET /api/cube                 — violation rollup for any org/team/person/requisition node, with children
+  GET /api/sla/upcoming         — open interviews and stages that breach their SLA in the next N hours, with owners
+  GET /api/alerts               — violations new, escalated or resolved since the previous export (recorded per build; see alerts.py)
 """
 
-import json
+import asyncio
+import base64
+import hmac
+import multiprocessing
 import os
-from fastapi import FastAPI, HTTPException
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Annotated
+
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+import anyio.from_thread
+import anyio.to_thread
+import numpy as np
 import pandas as pd
 
-# Import YOUR existing scoring engine — no changes to that file
-from scoring_engine import ScorecardEngine
+import jobs
+import profiling
+from alerts import ALERT_TYPES, AlertLog
+from events import SnapshotWatcher, format_event
+from history_store import open_store
+from metrics import (
+    CACHE_BYTES, CACHE_EVENTS, REGISTRY, SNAPSHOT_ROWS, STAGE_SECONDS, TimingMiddleware, timed,
+)
+from serialization import (
+    EXPORT_MEDIA_TYPES, CompressionMiddleware, FastJSONResponse, export_chunks, frame_to_records,
+)
+from snapshot import (
+    ROLE_COLUMNS, SnapshotCache, map_snapshot, percentile_rank, person_role_rows,
+    query_roles, query_violations,
+)
+
+# ── Scoring executor — CPU-heavy pandas work runs off the event loop ──────────
+SCORING_WORKERS = int(os.environ.get("HIREIQ_SCORING_WORKERS", "2"))
+
+def scoring_executor():
+    """Bounded process pool for snapshot builds"""
+    return ProcessPoolExecutor(
+        max_workers=SCORING_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+# Scored snapshots are written once to this Arrow store and memory-mapped by
+# every uvicorn worker (requires pyarrow; without it each worker keeps its own)
+SNAPSHOT_STORE = os.environ.get(
+    "HIREIQ_SNAPSHOT_STORE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".snapshots"),
+)
+
+# Scored snapshots of all datasets share this budget; least recently used
+# ones are dropped first and rehydrated from the store on their next request
+SNAPSHOT_CACHE_MB = int(os.environ.get("HIREIQ_SNAPSHOT_CACHE_MB", "1024"))
+
+def record_build(path, snapshot, timings, datasets=None):
+    """
+    Observe a snapshot load: per-stage timings (from the pool process) and
+    table sizes, and record its delta alerts for every dataset it serves
+    (`datasets`, default: those whose export is `path`)
+    """
+    for stage, seconds in timings.items():
+        STAGE_SECONDS.observe(seconds, stage=stage)
+    if datasets is None:
+        datasets = [name for name, p in dataset_exports().items() if p == path]
+    label = datasets[0] if datasets else path
+    SNAPSHOT_ROWS.set(len(snapshot["raw"]), dataset=label, table="raw")
+    SNAPSHOT_ROWS.set(len(snapshot["violations"]), dataset=label, table="violations")
+    for dataset in datasets:
+        record_alerts(dataset, snapshot)
+
+# (dataset, version) -> future of its AlertLog.update, while it runs
+_alert_updates = {}
+
+def record_alerts(dataset, snapshot):
+    """Diff a newly loaded snapshot against the dataset's previous run, off the loop"""
+    key = (dataset, snapshot["version"])
+    if key in _alert_updates:
+        return
+    future = asyncio.get_running_loop().run_in_executor(
+        None, alert_log.update, dataset, snapshot["version"], snapshot["violations"],
+    )
+    _alert_updates[key] = future
+    future.add_done_callback(lambda f: _alert_updates.pop(key, None))
+
+snapshots = SnapshotCache(
+    scoring_executor, store=SNAPSHOT_STORE, max_bytes=SNAPSHOT_CACHE_MB * 2**20, on_build=record_build,
+)
+
+# Sync handlers share the GIL with the event loop; a small pool keeps them
+# from crowding out async endpoints such as /api/health
+HANDLER_THREADS = int(os.environ.get("HIREIQ_HANDLER_THREADS", "4"))
+
+@asynccontextmanager
+async def lifespan(app):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = HANDLER_THREADS
+    watch = asyncio.ensure_future(watcher.run())
+    yield
+    watch.cancel()
+    snapshots.shutdown()
 
-app = FastAPI(title="HireIQ API", version="1.0.0")
+app = FastAPI(title="HireIQ API", version="1.0.0", lifespan=lifespan)
 
 # ── CORS — allows the React frontend (on Vercel) to call this API ──────────────
 app.add_middleware(
@@ -36,151 +144,528 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ── Load data once on startup ──────────────────────────────────────────────────
+# ── Compression — gzip/brotli for JSON bodies over 1 KB ────────────────────────
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+# ── Timing — Server-Timing header and request latency histograms (outermost) ───
+app.add_middleware(TimingMiddleware)
+
+# ── Load data once per export version ─────────────────────────────────────────
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ATS_EXPORT_PATH = os.environ.get("HIREIQ_ATS_EXPORT", os.path.join(BASE_DIR, "sample_ats_export.csv"))
+HISTORICAL_PATH = os.path.join(BASE_DIR, "historical_performance_data.json")
+HISTORY_STORE_PATH = os.environ.get("HIREIQ_HISTORY_STORE", os.path.join(BASE_DIR, ".history.sqlite"))
+DATASETS_DIR = os.environ.get("HIREIQ_DATASETS_DIR", os.path.join(BASE_DIR, ".datasets"))
+ALERTS_DIR = os.environ.get("HIREIQ_ALERTS_DIR", os.path.join(BASE_DIR, ".alerts"))
 
-def load_ats_data():
-    """Load sample_ats_export.csv and run your scoring engine"""
-    csv_path = os.path.join(BASE_DIR, "sample_ats_export.csv")
-    df = pd.read_csv(csv_path)
-    engine = ScorecardEngine(df)
-    violations = engine.calculate_scores()
-    recruiter_scores = engine.score_by_recruiter(violations)
-    hm_scores = engine.score_by_hiring_manager(violations)
-    org_summary = engine.get_org_summary(recruiter_scores, hm_scores)
-    return {
-        "raw": df,
-        "violations": violations,
-        "recruiter_scores": recruiter_scores,
-        "hm_scores": hm_scores,
-        "org_summary": org_summary,
-    }
+# Every export version loaded is diffed against its dataset's previous one
+# (record_build); /api/alerts serves the stored diff
+alert_log = AlertLog(ALERTS_DIR)
+
+# Uploads larger than this are refused (413); finished upload jobs whose
+# export no dataset serves any more are deleted after the retention period
+MAX_UPLOAD_BYTES = int(float(os.environ.get("HIREIQ_MAX_UPLOAD_MB", "512")) * 1024 * 1024)
+JOB_RETENTION_SECONDS = float(os.environ.get("HIREIQ_JOB_RETENTION_HOURS", "24")) * 3600
+
+MAX_PAGE_SIZE = 1000
+
+# One export per business unit: HIREIQ_DATASETS="emea=/data/emea.csv,apac=/data/apac.csv".
+# Every data endpoint takes ?dataset=<name>; without it the default dataset
+# (ATS_EXPORT_PATH) is served.
+DATASET_EXPORTS = {
+    name.strip(): path.strip()
+    for name, _, path in (item.partition("=") for item in os.environ.get("HIREIQ_DATASETS", "").split(","))
+    if name.strip() and path.strip()
+}
+
+def dataset_exports():
+    """dataset -> the export it serves: its last activated upload, else its configured export"""
+    return {jobs.DEFAULT_DATASET: ATS_EXPORT_PATH, **DATASET_EXPORTS, **jobs.active_exports(DATASETS_DIR)}
+
+def dataset_export(dataset=None):
+    """Export path for a dataset (None = default); 404 for unknown datasets"""
+    path = dataset_exports().get(dataset or jobs.DEFAULT_DATASET)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"dataset {dataset} not found")
+    return path
+
+# Pushes snapshot diffs to /api/stream subscribers; only subscribed
+# datasets are polled
+STREAM_POLL_SECONDS = float(os.environ.get("HIREIQ_STREAM_POLL_SECONDS", "2"))
+STREAM_KEEPALIVE_SECONDS = 15
+
+watcher = SnapshotWatcher(snapshots, dataset_export, interval=STREAM_POLL_SECONDS)
+
+async def current_snapshot(dataset=None):
+    """Scored snapshot of a dataset's ATS export, for async handlers"""
+    with timed("snapshot"):
+        return await snapshots.get(dataset_export(dataset))
+
+def load_ats_data(dataset=None):
+    """
+    Scored snapshot of a dataset's ATS export, for sync handlers (threadpool).
+    Served from memory when current; otherwise waits on the shared build.
+    """
+    path = dataset_export(dataset)
+    with timed("snapshot"):
+        cached = snapshots.current(path)
+        if cached is not None:
+            return cached
+        return anyio.from_thread.run(snapshots.get, path)
+
+# Historical snapshots live in a SQLite store (retention + downsampling);
+# a new store is seeded from historical_performance_data.json
+history = open_store(HISTORY_STORE_PATH, seed_json=HISTORICAL_PATH)
+
+# ── Query helpers: dates, cursors, field projection ───────────────────────────
+def parse_date(value, end=False):
+    """Parse a from/to query value; a bare date as `to` covers the whole day"""
+    if value is None:
+        return None
+    try:
+        ts = pd.Timestamp(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+    if end and len(value) == 10:
+        ts = ts + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+    return ts.to_datetime64()
 
-def load_historical():
-    """Load historical_performance_data.json"""
-    json_path = os.path.join(BASE_DIR, "historical_performance_data.json")
-    with open(json_path, "r") as f:
-        return json.load(f)
+def parse_day(value):
+    """A from/to query value as the YYYY-MM-DD day history snapshots are keyed by"""
+    if value is None:
+        return None
+    return pd.Timestamp(parse_date(value)).strftime("%Y-%m-%d")
+
+def encode_cursor(version, position):
+    return base64.urlsafe_b64encode(f"{version}:{position}".encode()).decode()
+
+def decode_cursor(cursor, version):
+    try:
+        cursor_version, position = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit(":", 1)
+        position = int(position)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if cursor_version != version:
+        raise HTTPException(status_code=409, detail="Data changed since this cursor was issued; restart from the first page")
+    return position
+
+def paginate(positions, version, cursor=None, limit=None):
+    """Slice sorted row positions after `cursor`; returns (page, next_cursor)"""
+    if cursor:
+        after = decode_cursor(cursor, version)
+        positions = positions[np.searchsorted(positions, after, side="right"):]
+    if limit is None or len(positions) <= limit:
+        return positions, None
+    page = positions[:limit]
+    return page, encode_cursor(version, int(page[-1]))
+
+def project(fields, available):
+    """Column list for a comma-separated `fields` parameter (None = all)"""
+    if not fields:
+        return list(available)
+    columns = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [c for c in columns if c not in available]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return columns
 
 # ── Health check ───────────────────────────────────────────────────────────────
 @app.get("/api/health")
-def health():
+async def health():
     return {"status": "ok", "message": "HireIQ API is running"}
 
+# ── Admin token ────────────────────────────────────────────────────────────────
+# Uploads and profiling are off unless HIREIQ_ADMIN_TOKEN is set; callers send it as X-Admin-Token
+ADMIN_TOKEN = os.environ.get("HIREIQ_ADMIN_TOKEN")
+
+def require_admin(token, action):
+    """403 unless `token` is the configured admin token"""
+    if ADMIN_TOKEN is None or token is None or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail=f"{action} requires a valid X-Admin-Token")
+
+# ── Dataset uploads and scoring jobs ───────────────────────────────────────────
+_job_tasks = set()
+
+async def finish_job(job_id, dataset, future):
+    """Install a finished job's snapshot, then make its export the dataset's active one"""
+    directory = jobs.job_dir(DATASETS_DIR, job_id)
+    try:
+        result = await future
+        if isinstance(result, dict):
+            snapshot = result
+        else:
+            snapshot = await asyncio.get_running_loop().run_in_executor(None, map_snapshot, result)
+        path = jobs.export_path(DATASETS_DIR, job_id)
+        record_build(path, snapshot, snapshot.get("timings", {}), datasets=[dataset])
+        snapshots.put(path, snapshot)
+        jobs.activate(DATASETS_DIR, job_id, dataset)
+        jobs.update_job(directory, status="done", stage=None, finished_at=time.time())
+    except Exception as exc:
+        # The job records its own errors; this catches a crashed pool process
+        if jobs.read_job(DATASETS_DIR, job_id)["status"] != "failed":
+            jobs.update_job(directory, status="failed", error=f"{type(exc).__name__}: {exc}",
+                            finished_at=time.time())
+    await prune_jobs()
+
+async def prune_jobs():
+    """Drop superseded and failed upload jobs past their retention period"""
+    await asyncio.get_running_loop().run_in_executor(
+        None, jobs.prune_jobs, DATASETS_DIR, JOB_RETENTION_SECONDS, snapshots.store,
+    )
+
+def reject_upload(directory, path, status_code, error):
+    """Fail an upload's job, delete what was written of its export and raise"""
+    if os.path.exists(path):
+        os.remove(path)
+    jobs.update_job(directory, status="failed", error=error, finished_at=time.time())
+    raise HTTPException(status_code=status_code, detail=error)
+
+@app.post("/api/datasets", status_code=202)
+async def upload_dataset(
+    request: Request,
+    filename: str = None,
+    dataset: str = jobs.DEFAULT_DATASET,
+    x_admin_token: Annotated[str, Header()] = None,
+):
+    """
+    Upload an ATS export as the raw request body (text/csv, no multipart).
+    The body is streamed to disk chunk by chunk, then scored on the process
+    pool; poll /api/jobs/{id}. When the job is done its export is what
+    `?dataset=<dataset>` serves on every other endpoint. Admin only; bodies
+    over HIREIQ_MAX_UPLOAD_MB are refused with 413.
+    """
+    require_admin(x_admin_token, "uploading a dataset")
+    if not jobs.valid_dataset(dataset):
+        raise HTTPException(status_code=400, detail="dataset must be letters, digits, '-' or '_'")
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"upload exceeds {MAX_UPLOAD_BYTES} bytes")
+    os.makedirs(DATASETS_DIR, exist_ok=True)
+    job = jobs.create_job(DATASETS_DIR, filename, dataset)
+    directory = jobs.job_dir(DATASETS_DIR, job["id"])
+    path = jobs.export_path(DATASETS_DIR, job["id"])
+
+    size = 0
+    async with await anyio.open_file(path, "wb") as f:
+        async for chunk in request.stream():
+            if chunk:
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    break
+                await f.write(chunk)
+    if size > MAX_UPLOAD_BYTES:
+        reject_upload(directory, path, 413, f"upload exceeds {MAX_UPLOAD_BYTES} bytes")
+    if size == 0:
+        reject_upload(directory, path, 400, "Request body is empty")
+    jobs.update_job(directory, bytes=size)
+
+    future = asyncio.get_running_loop().run_in_executor(
+        snapshots.executor, jobs.run_scoring_job, directory, snapshots.store,
+    )
+    task = asyncio.ensure_future(finish_job(job["id"], dataset, future))
+    _job_tasks.add(task)
+    task.add_done_callback(_job_tasks.discard)
+
+    return {"job_id": job["id"], "status": "queued", "bytes": size, "status_url": f"/api/jobs/{job['id']}"}
+
+@app.get("/api/datasets")
+async def list_datasets():
+    """Known datasets and the export each one currently serves"""
+    exports = dataset_exports()
+    cached = {entry["path"] for entry in snapshots.stats()["entries"]}
+    return {
+        "datasets": [
+            {"dataset": name, "uploaded": path.startswith(DATASETS_DIR), "cached": path in cached}
+            for name, path in sorted(exports.items())
+        ]
+    }
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Progress of an upload's scoring job"""
+    state = jobs.read_job(DATASETS_DIR, job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"job {job_id} not found")
+    return state
+
+# ── Snapshot cache stats ───────────────────────────────────────────────────────
+@app.get("/api/cache")
+async def get_cache_stats():
+    """Hit / miss / eviction / rehydration counters and per-dataset sizes (this worker)"""
+    datasets = {path: name for name, path in dataset_exports().items()}
+    stats = snapshots.stats()
+    for entry in stats["entries"]:
+        entry["dataset"] = datasets.get(entry.pop("path"))
+    return stats
+
+# ── Prometheus metrics ─────────────────────────────────────────────────────────
+@app.get("/api/metrics")
+async def get_metrics():
+    """Stage / request / serialization histograms in Prometheus text format (this worker)"""
+    stats = snapshots.stats()
+    for event in ("hits", "misses", "evictions", "rehydrations"):
+        CACHE_EVENTS.set(stats[event], event=event)
+    CACHE_BYTES.set(stats["nbytes"])
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+# ── Admin: profile a scoring run ───────────────────────────────────────────────
+@app.get("/api/admin/profile")
+async def profile_dataset(dataset: str = None, x_admin_token: Annotated[str, Header()] = None):
+    """
+    Scores a dataset's export once with profiling on (cProfile + tracemalloc
+    peak per engine stage) on the scoring pool and returns the zip artifact
+    from profiling.profile_export(). The served snapshot is not touched.
+    """
+    require_admin(x_admin_token, "profiling")
+    path = dataset_export(dataset)
+    artifact = await asyncio.get_running_loop().run_in_executor(
+        snapshots.executor, profiling.profile_export, path,
+    )
+    filename = f"profile-{dataset or jobs.DEFAULT_DATASET}-{time.strftime('%Y%m%d-%H%M%S')}.zip"
+    return Response(
+        artifact,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+# ── Live updates (Server-Sent Events) ──────────────────────────────────────────
+@app.get("/api/stream")
+async def stream_updates(request: Request, dataset: str = None):
+    """
+    text/event-stream of snapshot changes for one dataset. Sends `ready`
+    with the current version, then a `snapshot` event per new export
+    version: score_changes (name, role_type, previous, current, delta) and
+    new_high_severity violations, and an `sla_breach` event whenever open
+    interviews or stages pass an SLA deadline. Clients refetch only what
+    changed; on `resync` (they fell behind) they refetch everything.
+    """
+    dataset = dataset or jobs.DEFAULT_DATASET
+    queue, version = await watcher.subscribe(dataset)
+
+    async def events():
+        try:
+            yield format_event("ready", {"dataset": dataset, "version": version}, version)
+            while not await request.is_disconnected():
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield format_event(event, data, data["version"])
+        finally:
+            watcher.unsubscribe(dataset, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# ── Per-person building blocks (shared by the single and composite endpoints) ─
+SCORE_TABLES = {"recruiter": "recruiter_scores", "hm": "hm_scores"}
+
+def ranked_records(data, role_type, positions=None):
+    """
+    Score records best-first with their org-wide `rank` attached, from the
+    snapshot's rank index. positions: restrict to these rows (any order).
+    """
+    ranking = data["indexes"]["rankings"][role_type]
+    if positions is None:
+        positions = ranking["order"]
+    else:
+        positions = np.asarray(positions, dtype=np.intp)
+        positions = positions[np.argsort(ranking["rank"][positions], kind="stable")]
+    records = frame_to_records(data[SCORE_TABLES[role_type]].iloc[positions])
+    for record, rank in zip(records, ranking["rank"][positions].tolist()):
+        record["rank"] = rank
+    return records
+
+def ranked_scores(data):
+    """Recruiter and HM score records sorted by final_score with `rank` attached"""
+    return ranked_records(data, "recruiter"), ranked_records(data, "hm")
+
+def window_scores(data, names, date_from, date_to):
+    """/api/scores over a date window: ranked score records, team averages and org summary"""
+    with timed("windows"):
+        window = data["indexes"]["windows"].window(date_from, date_to)
+
+    def ranked(scores):
+        scores = scores.sort_values("final_score", ascending=False, kind="stable")
+        records = frame_to_records(scores)
+        for rank, record in enumerate(records, 1):
+            record["rank"] = rank
+        return records
+
+    recruiters = ranked(window["recruiters"])
+    hms = ranked(window["hiring_managers"])
+    body = {"window": {"from": date_from, "to": date_to}}
+    if names is not None:
+        wanted = {n.strip() for n in names.split(",") if n.strip()}
+        recruiters = [r for r in recruiters if r["name"] in wanted]
+        hms = [h for h in hms if h["name"] in wanted]
+        body["not_found"] = sorted(wanted - {r["name"] for r in recruiters} - {h["name"] for h in hms})
+    else:
+        body["teams"] = frame_to_records(window["teams"])
+    return FastJSONResponse({
+        "recruiters": recruiters,
+        "hiring_managers": hms,
+        "org_summary": window["org"],
+        **body,
+    })
+
+def person_score(data, name, role_type):
+    """Score record for one person, or 404"""
+    role_type = "recruiter" if role_type == "recruiter" else "hm"
+    scores_df = data[SCORE_TABLES[role_type]]
+    pos = data["indexes"]["rankings"][role_type]["position"].get(name)
+    if pos is None:
+        raise HTTPException(status_code=404, detail=f"{name} not found")
+    return frame_to_records(scores_df.iloc[[pos]])[0]
+
+def person_roles(data, name, role_type):
+    """Requisitions a person owns, with the counterpart's name"""
+    if role_type == "recruiter":
+        return person_role_rows(data, name, "recruiter")[
+            ["requisition_id", "job_title", "team", "hiring_manager_name", "current_status"]
+        ]
+    return person_role_rows(data, name, "hm")[
+        ["requisition_id", "job_title", "team", "recruiter_name", "current_status"]
+    ]
+
 # ── All scores (latest snapshot) ──────────────────────────────────────────────
 @app.get("/api/scores")
-def get_all_scores():
+def get_all_scores(
+    names: str = None,
+    dataset: str = None,
+    date_from: Annotated[str, Query(alias="from")] = None,
+    date_to: Annotated[str, Query(alias="to")] = None,
+):
     """
     Returns recruiter and HM scores calculated live from your scoring engine.
     React dashboard calls this on load and when time filter changes.
+    names: optional comma-separated list — batch form for team views.
+    from / to: score only the violations dated in that window (days,
+    inclusive; either end may be open), from the snapshot's prefix sums.
+    Ranks are always org-wide (within the window, if one is given).
     """
-    data = load_ats_data()
-
-    recruiters = data["recruiter_scores"].to_dict(orient="records")
-    hms = data["hm_scores"].to_dict(orient="records")
+    data = load_ats_data(dataset)
 
-    # Add rank
-    recruiters_sorted = sorted(recruiters, key=lambda x: -x["final_score"])
-    for i, r in enumerate(recruiters_sorted):
-        r["rank"] = i + 1
+    if date_from is not None or date_to is not None:
+        return window_scores(data, names, parse_day(date_from), parse_day(date_to))
 
-    hms_sorted = sorted(hms, key=lambda x: -x["final_score"])
-    for i, h in enumerate(hms_sorted):
-        h["rank"] = i + 1
+    if names is None:
+        recruiters, hms = ranked_scores(data)
+        return FastJSONResponse({
+            "recruiters": recruiters,
+            "hiring_managers": hms,
+            "org_summary": data["org_summary"],
+        })
 
-    return {
-        "recruiters": recruiters_sorted,
-        "hiring_managers": hms_sorted,
-        "org_summary": data["org_summary"],
+    wanted = {n.strip() for n in names.split(",") if n.strip()}
+    rankings = data["indexes"]["rankings"]
+    matches = {
+        role_type: [rankings[role_type]["position"][n] for n in wanted if n in rankings[role_type]["position"]]
+        for role_type in SCORE_TABLES
     }
+    recruiters = ranked_records(data, "recruiter", matches["recruiter"])
+    hms = ranked_records(data, "hm", matches["hm"])
+    found = {r["name"] for r in recruiters} | {h["name"] for h in hms}
+
+    return FastJSONResponse({
+        "recruiters": recruiters,
+        "hiring_managers": hms,
+        "not_found": sorted(wanted - found),
+    })
 
 # ── Single person's scores ─────────────────────────────────────────────────────
 @app.get("/api/scores/{name}")
-def get_person_score(name: str, role_type: str = "recruiter"):
+def get_person_score(name: str, role_type: str = "recruiter", dataset: str = None):
     """
     Returns score breakdown for a specific person.
     role_type: 'recruiter' or 'hm'
     """
-    data = load_ats_data()
+    data = load_ats_data(dataset)
 
-    if role_type == "recruiter":
-        scores_df = data["recruiter_scores"]
-    else:
-        scores_df = data["hm_scores"]
-
-    person = scores_df[scores_df["name"] == name]
-    if person.empty:
-        raise HTTPException(status_code=404, detail=f"{name} not found")
-
-    score_data = person.iloc[0].to_dict()
+    score_data = person_score(data, name, role_type)
 
     # Add their violations
     violations = data["violations"]
-    person_violations = violations[
-        (violations["recruiter_name"] == name) |
-        (violations["hiring_manager_name"] == name)
-    ]
-
-    score_data["violations"] = person_violations.to_dict(orient="records")
+    score_data["violations"] = frame_to_records(violations.iloc[query_violations(data, name=name)])
 
     # Add their roles
-    raw = data["raw"]
+    score_data["roles"] = frame_to_records(person_roles(data, name, role_type))
+
+    return FastJSONResponse(score_data)
+
+# ── Composite dashboard ────────────────────────────────────────────────────────
+@app.get("/api/dashboard/{name}")
+def get_dashboard(name: str, role_type: str = "recruiter", dataset: str = None):
+    """
+    Everything the recruiter / HM dashboard renders, from one snapshot:
+    scores, violations (+ severity summary), roles, historical trend and
+    the scores of the people they work with (HMs for a recruiter,
+    recruiters for an HM).
+    role_type: 'recruiter' or 'hm'
+    """
+    data = load_ats_data(dataset)
+
+    scores = person_score(data, name, role_type)
+
+    violations = data["violations"]
+    positions = query_violations(data, name=name)
+    severities = violations["severity"].to_numpy()[positions]
+
+    roles = person_roles(data, name, role_type)
     if role_type == "recruiter":
-        roles = raw[raw["recruiter_name"] == name][
-            ["requisition_id", "job_title", "team", "hiring_manager_name", "current_status"]
-        ].drop_duplicates("requisition_id").to_dict(orient="records")
+        counterpart_df = data["hm_scores"]
+        counterpart_names = roles["hiring_manager_name"].unique()
     else:
-        roles = raw[raw["hiring_manager_name"] == name][
-            ["requisition_id", "job_title", "team", "recruiter_name", "current_status"]
-        ].drop_duplicates("requisition_id").to_dict(orient="records")
-
-    score_data["roles"] = roles
+        counterpart_df = data["recruiter_scores"]
+        counterpart_names = roles["recruiter_name"].unique()
+    counterparts = counterpart_df[counterpart_df["name"].isin(counterpart_names)]
 
-    return score_data
+    return FastJSONResponse({
+        "name": name,
+        "role_type": role_type,
+        "scores": scores,
+        "violations": frame_to_records(violations.iloc[positions], fill=""),
+        "violation_summary": {
+            "high": int((severities == "high").sum()),
+            "medium": int((severities == "medium").sum()),
+            "low": int((severities == "low").sum()),
+        },
+        "roles": frame_to_records(roles),
+        "historical": history.person(name),
+        "counterparts": frame_to_records(counterparts),
+    })
 
 # ── Historical snapshots ───────────────────────────────────────────────────────
 @app.get("/api/historical")
-def get_historical():
+def get_historical(
+    date_from: Annotated[str, Query(alias="from")] = None,
+    date_to: Annotated[str, Query(alias="to")] = None,
+):
     """
-    Returns all 6 biweekly snapshots from historical_performance_data.json.
+    Returns the snapshots dated from..to (inclusive; default all) from the
+    history store, in the historical_performance_data.json schema.
     Used by the trend charts and time filter.
     """
-    return load_historical()
+    with timed("history"):
+        return FastJSONResponse(history.snapshots(parse_day(date_from), parse_day(date_to)))
 
 # ── Historical for a specific person ──────────────────────────────────────────
 @app.get("/api/historical/{name}")
-def get_person_historical(name: str):
+def get_person_historical(
+    name: str,
+    date_from: Annotated[str, Query(alias="from")] = None,
+    date_to: Annotated[str, Query(alias="to")] = None,
+):
     """
-    Returns score trend for a single person across all snapshots.
+    Returns score trend for a single person across all snapshots (or from..to).
     Powers the individual trend sparklines.
     """
-    historical = load_historical()
-    snapshots = historical["snapshots"]
-
-    trend = []
-    for snap in snapshots:
-        # Check recruiters
-        for r in snap.get("recruiters", []):
-            if r["name"] == name:
-                trend.append({
-                    "date": snap["snapshot_date"],
-                    "final_score": r["final_score"],
-                    "feedback_score": r["feedback_score"],
-                    "velocity_score": r["velocity_score"],
-                    "engagement_score": r["engagement_score"],
-                    "role_type": "recruiter",
-                })
-        # Check HMs
-        for h in snap.get("hiring_managers", []):
-            if h["name"] == name:
-                trend.append({
-                    "date": snap["snapshot_date"],
-                    "final_score": h["final_score"],
-                    "feedback_score": h["feedback_score"],
-                    "velocity_score": h["velocity_score"],
-                    "engagement_score": h["engagement_score"],
-                    "role_type": "hm",
-                })
+    with timed("history"):
+        trend = history.person(name, parse_day(date_from), parse_day(date_to))
 
     if not trend:
         raise HTTPException(status_code=404, detail=f"No historical data for {name}")
@@ -189,121 +674,358 @@ def get_person_historical(name: str):
 
 # ── All open roles ─────────────────────────────────────────────────────────────
 @app.get("/api/roles")
-def get_roles(team: str = None):
+def get_roles(
+    team: str = None,
+    status: str = None,
+    date_from: Annotated[str, Query(alias="from")] = None,
+    date_to: Annotated[str, Query(alias="to")] = None,
+    cursor: str = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    fields: str = None,
+    dataset: str = None,
+):
     """
-    Returns all open roles from sample_ats_export.csv.
-    Optionally filter by team/department.
+    Returns open roles from sample_ats_export.csv, one per requisition
+    (latest stage first).
+    Filters: team, status (current_status), from/to (role_opened_date).
+    Paging: pass `limit`, then `cursor=<next_cursor>` for the following page.
+    Projection: `fields=requisition_id,job_title` returns only those columns.
     """
-    data = load_ats_data()
-    raw = data["raw"]
-
-    # Get one row per requisition (latest stage)
-    roles = raw.sort_values("stage_entered_date", ascending=False)
-    roles = roles.drop_duplicates("requisition_id")
+    data = load_ats_data(dataset)
+    columns = project(fields, ROLE_COLUMNS)
 
-    if team:
-        roles = roles[roles["team"] == team]
+    positions = query_roles(
+        data, team=team, status=status,
+        date_from=parse_date(date_from), date_to=parse_date(date_to, end=True),
+    )
+    page, next_cursor = paginate(positions, data["version"], cursor, limit)
 
-    result = roles[[
-        "requisition_id", "job_title", "team",
-        "recruiter_name", "hiring_manager_name",
-        "role_opened_date", "current_status", "stage"
-    ]].to_dict(orient="records")
+    result = frame_to_records(data["roles"].iloc[page], columns)
 
-    return {"roles": result, "total": len(result)}
+    return FastJSONResponse({"roles": result, "total": len(positions), "next_cursor": next_cursor})
 
 # ── Violations for a person ────────────────────────────────────────────────────
 @app.get("/api/violations/{name}")
-def get_violations(name: str):
+def get_violations(
+    name: str,
+    team: str = None,
+    severity: str = None,
+    metric: str = None,
+    status: str = None,
+    date_from: Annotated[str, Query(alias="from")] = None,
+    date_to: Annotated[str, Query(alias="to")] = None,
+    cursor: str = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    fields: str = None,
+    dataset: str = None,
+):
     """
-    Returns all SLA violations associated with a person.
+    Returns SLA violations associated with a person.
     Used for the alerts panel in each dashboard.
+    Filters: team, severity, metric, status (requisition current_status),
+    from/to (event_date). Paging and `fields` work as on /api/roles.
     """
-    data = load_ats_data()
+    data = load_ats_data(dataset)
     violations = data["violations"]
+    columns = project(fields, violations.columns)
 
-    person_v = violations[
-        (violations.get("recruiter_name", pd.Series()) == name) |
-        (violations.get("hiring_manager_name", pd.Series()) == name)
-    ] if not violations.empty else pd.DataFrame()
+    positions = query_violations(
+        data, name=name, team=team, severity=severity, metric=metric, status=status,
+        date_from=parse_date(date_from), date_to=parse_date(date_to, end=True),
+    )
 
-    if violations.empty or person_v.empty:
-        return {"name": name, "violations": [], "total": 0}
+    if len(positions) == 0:
+        return FastJSONResponse({"name": name, "violations": [], "total": 0, "next_cursor": None})
 
-    v_list = person_v.fillna("").to_dict(orient="records")
+    page, next_cursor = paginate(positions, data["version"], cursor, limit)
+    v_list = frame_to_records(violations.iloc[page], columns, fill="")
 
+    severities = violations["severity"].to_numpy()[positions]
     summary = {
-        "high": int((person_v["severity"] == "high").sum()),
-        "medium": int((person_v["severity"] == "medium").sum()),
-        "low": int((person_v["severity"] == "low").sum()),
+        "high": int((severities == "high").sum()),
+        "medium": int((severities == "medium").sum()),
+        "low": int((severities == "low").sum()),
     }
 
-    return {
+    return FastJSONResponse({
         "name": name,
         "violations": v_list,
-        "total": len(v_list),
+        "total": len(positions),
         "summary": summary,
-    }
+        "next_cursor": next_cursor,
+    })
 
 # ── Org summary ────────────────────────────────────────────────────────────────
 @app.get("/api/org")
-def get_org_summary():
+async def get_org_summary(dataset: str = None):
     """
     Returns org-level aggregates.
     Used by the Talent Intelligence dashboard KPI strip.
     """
-    data = load_ats_data()
+    data = await current_snapshot(dataset)
     return data["org_summary"]
 
 # ── Department breakdown ───────────────────────────────────────────────────────
 @app.get("/api/departments")
-def get_departments():
+async def get_departments(dataset: str = None):
     """
     Returns scores broken down by department/team.
     Used by the dept filter in Talent Intelligence.
+    Precomputed once per snapshot (see snapshot.build_departments).
     """
-    data = load_ats_data()
-    raw = data["raw"]
-    recruiter_scores = data["recruiter_scores"]
-    hm_scores = data["hm_scores"]
-
-    teams = raw["team"].unique()
-    result = []
+    data = await current_snapshot(dataset)
+    return FastJSONResponse({"departments": frame_to_records(data["departments"])})
 
-    for team in teams:
-        team_data = raw[raw["team"] == team]
-
-        team_recruiters = team_data["recruiter_name"].unique()
-        team_hms = team_data["hiring_manager_name"].unique()
+# ── Leaderboard and percentiles ────────────────────────────────────────────────
+@app.get("/api/leaderboard")
+async def get_leaderboard(
+    role_type: str = "recruiter",
+    team: str = None,
+    k: int = 10,
+    bottom: bool = False,
+    dataset: str = None,
+):
+    """
+    Top k (or bottom k with bottom=true) recruiters or HMs, org-wide or
+    within one team. Sliced from the snapshot's rank index, so the cost
+    depends on k, not on the population.
+    role_type: 'recruiter' or 'hm'
+    """
+    if role_type not in SCORE_TABLES:
+        raise HTTPException(status_code=400, detail="role_type must be 'recruiter' or 'hm'")
+    k = max(1, min(k, MAX_PAGE_SIZE))
+    data = await current_snapshot(dataset)
+    ranking = data["indexes"]["rankings"][role_type]
 
-        rec_scores = recruiter_scores[recruiter_scores["name"].isin(team_recruiters)]
-        hm_scores_team = hm_scores[hm_scores["name"].isin(team_hms)]
+    if team is None:
+        order = ranking["order"]
+    elif team in ranking["teams"]:
+        order = ranking["teams"][team]["order"]
+    else:
+        raise HTTPException(status_code=404, detail=f"team {team} not found")
 
-        rec_avg = round(rec_scores["final_score"].mean(), 1) if len(rec_scores) > 0 else None
-        hm_avg  = round(hm_scores_team["final_score"].mean(), 1) if len(hm_scores_team) > 0 else None
+    if bottom:
+        positions = order[::-1][:k]
+        ranks = range(len(order), len(order) - len(positions), -1)
+    else:
+        positions = order[:k]
+        ranks = range(1, len(positions) + 1)
 
-        dept_avg = None
-        if rec_avg is not None and hm_avg is not None:
-            dept_avg = round((rec_avg + hm_avg) / 2, 1)
-        elif rec_avg is not None:
-            dept_avg = rec_avg
-        elif hm_avg is not None:
-            dept_avg = hm_avg
+    records = frame_to_records(data[SCORE_TABLES[role_type]].iloc[positions])
+    for record, rank, org_rank in zip(records, ranks, ranking["rank"][positions].tolist()):
+        record["rank"] = rank
+        record["org_rank"] = org_rank
+    return FastJSONResponse({
+        "role_type": role_type,
+        "team": team,
+        "population": len(order),
+        "leaders": records,
+    })
 
-        open_roles = len(team_data["requisition_id"].unique())
+@app.get("/api/percentile/{name}")
+async def get_percentile(name: str, role_type: str = "recruiter", dataset: str = None):
+    """
+    A person's rank and percentile (share of peers scoring at or below
+    them), org-wide and in each team they hire for.
+    role_type: 'recruiter' or 'hm'
+    """
+    if role_type not in SCORE_TABLES:
+        raise HTTPException(status_code=400, detail="role_type must be 'recruiter' or 'hm'")
+    data = await current_snapshot(dataset)
+    ranking = data["indexes"]["rankings"][role_type]
+    pos = ranking["position"].get(name)
+    if pos is None:
+        raise HTTPException(status_code=404, detail=f"{name} not found")
 
-        result.append({
+    score = float(data[SCORE_TABLES[role_type]]["final_score"].iloc[pos])
+    teams = []
+    for team in ranking["person_teams"].get(pos, []):
+        team_ranking = ranking["teams"][team]
+        teams.append({
             "team": team,
-            "avg_score": dept_avg,
-            "recruiter_avg": rec_avg,
-            "hm_avg": hm_avg,
-            "open_roles": open_roles,
-            "recruiters": list(team_recruiters),
-            "hiring_managers": list(team_hms),
+            "rank": team_ranking["rank"][pos],
+            "population": len(team_ranking["order"]),
+            "percentile": percentile_rank(team_ranking["ascending"], score),
         })
 
-    result.sort(key=lambda x: -(x["avg_score"] or 0))
-    return {"departments": result}
+    return FastJSONResponse({
+        "name": name,
+        "role_type": role_type,
+        "final_score": score,
+        "rank": int(ranking["rank"][pos]),
+        "population": len(ranking["order"]),
+        "percentile": percentile_rank(ranking["ascending"], score),
+        "teams": teams,
+    })
+
+# ── Streaming exports ──────────────────────────────────────────────────────────
+def export_response(df, positions, fmt, fields, filename):
+    """StreamingResponse over the selected snapshot rows in NDJSON or CSV"""
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+    columns = project(fields, df.columns)
+    return StreamingResponse(
+        export_chunks(df, positions, fmt, columns),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+@app.get("/api/export/violations")
+async def export_violations(
+    name: str = None,
+    team: str = None,
+    severity: str = None,
+    metric: str = None,
+    status: str = None,
+    date_from: Annotated[str, Query(alias="from")] = None,
+    date_to: Annotated[str, Query(alias="to")] = None,
+    fields: str = None,
+    format: str = "ndjson",
+    dataset: str = None,
+):
+    """
+    Streams every violation matching the filters (same filters as
+    /api/violations/{name}, with `name` optional) in chunks, straight from
+    the snapshot, so memory stays flat however large the export is.
+    format: 'ndjson' (default) or 'csv'
+    """
+    data = await current_snapshot(dataset)
+    positions = query_violations(
+        data, name=name, team=team, severity=severity, metric=metric, status=status,
+        date_from=parse_date(date_from), date_to=parse_date(date_to, end=True),
+    )
+    return export_response(data["violations"], positions, format, fields, "violations")
+
+@app.get("/api/export/scores")
+async def export_scores(
+    role_type: str = "recruiter",
+    team: str = None,
+    fields: str = None,
+    format: str = "ndjson",
+    dataset: str = None,
+):
+    """
+    Streams a score table best-first, optionally limited to one team.
+    role_type: 'recruiter' or 'hm'; format: 'ndjson' (default) or 'csv'
+    """
+    if role_type not in SCORE_TABLES:
+        raise HTTPException(status_code=400, detail="role_type must be 'recruiter' or 'hm'")
+    data = await current_snapshot(dataset)
+    ranking = data["indexes"]["rankings"][role_type]
+    if team is None:
+        positions = ranking["order"]
+    else:
+        positions = ranking["teams"][team]["order"] if team in ranking["teams"] else np.array([], dtype=np.intp)
+    return export_response(data[SCORE_TABLES[role_type]], positions, format, fields, f"{role_type}_scores")
+
+# ── Drill-down cube ────────────────────────────────────────────────────────────
+CUBE_ROLES = {"recruiter": "Recruiter", "hm": "Hiring Manager"}
+SEVERITIES = ("high", "medium", "low")
+
+@app.get("/api/cube")
+async def get_cube(
+    team: str = None,
+    role_type: str = None,
+    person: str = None,
+    requisition_id: str = None,
+    metric: str = None,
+    severity: str = None,
+    dataset: str = None,
+):
+    """
+    Violation count and penalty total for one node of
+    org -> team -> role type (recruiter/hm) -> person -> requisition,
+    sliced by metric/severity, with the node's children one level down.
+    Every figure is a lookup into the snapshot's precomputed cube.
+    """
+    data = await current_snapshot(dataset)
+    cube = data["indexes"]["cube"]
+    if role_type is not None and role_type not in CUBE_ROLES:
+        raise HTTPException(status_code=400, detail="role_type must be 'recruiter' or 'hm'")
+    node = {
+        "team": team, "role_type": CUBE_ROLES.get(role_type), "person": person,
+        "requisition_id": requisition_id,
+    }
+    try:
+        cell = cube.lookup(**node, metric=metric, severity=severity)
+        child_dim, children = cube.drill_down(**node, metric=metric, severity=severity)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    metrics = list(data["indexes"]["violations"].get("metric", {}))
+    return FastJSONResponse({
+        "node": {k: v for k, v in {**node, "metric": metric, "severity": severity}.items() if v is not None},
+        **cell,
+        "by_severity": {sev: cube.lookup(**node, metric=metric, severity=sev)["violations"] for sev in SEVERITIES},
+        "by_metric": {m: cube.lookup(**node, metric=m, severity=severity)["violations"] for m in metrics},
+        "child_dimension": child_dim,
+        "children": [{child_dim: value, **child} for value, child in children],
+    })
+
+# ── Upcoming SLA breaches ─────────────────────────────────────────────────────
+@app.get("/api/sla/upcoming")
+async def get_sla_upcoming(hours: float = 24, owner: str = None, now: str = None, dataset: str = None):
+    """
+    Open interviews (completed, no feedback) and open stages that will
+    breach an SLA within `hours`, soonest first: due time, the severity
+    reached and who owns it (owner: only theirs). From the snapshot's
+    deadline index (sla.py); the export is not rescanned.
+    now: look ahead from this time instead of the current time. A read
+    only: the forecaster's clock, which the /api/stream watcher advances,
+    is not moved, and a time before that clock counts from the clock
+    (`as_of` in the response is the time actually used). For a historical
+    export every deadline is before the current time, so pass `now` to
+    look inside its period.
+    """
+    if hours < 0:
+        raise HTTPException(status_code=400, detail="hours must be >= 0")
+    data = await current_snapshot(dataset)
+    forecaster = data["indexes"]["sla"]
+    as_of = forecaster.clock(pd.Timestamp.now() if now is None else pd.Timestamp(parse_date(now)))
+    return FastJSONResponse({
+        "as_of": None if as_of is None else as_of.isoformat(),
+        "hours": hours,
+        "upcoming": forecaster.upcoming(hours, owner, as_of),
+        "pending": len(forecaster),
+    })
+
+# ── Delta alerts ──────────────────────────────────────────────────────────────
+@app.get("/api/alerts")
+async def get_alerts(
+    alert_type: Annotated[str, Query(alias="type")] = None,
+    person: str = None,
+    dataset: str = None,
+):
+    """
+    Violations that are new, escalated (worse severity) or resolved in the
+    dataset's current export compared with the previous one, keyed by
+    (requisition_id, stage, metric, responsible_party). Each export version
+    is diffed once, when its snapshot is built or an upload is activated,
+    and its alerts appended to the outbox file (alerts.py); the first
+    export seen only sets the baseline. This only reads the stored diff.
+    type: only 'new', 'escalated' or 'resolved'
+    person: only alerts they are the responsible party for
+    """
+    if alert_type is not None and alert_type not in ALERT_TYPES:
+        raise HTTPException(status_code=400, detail=f"type must be one of {', '.join(ALERT_TYPES)}")
+    name = dataset or jobs.DEFAULT_DATASET
+    data = await current_snapshot(dataset)
+    with timed("alerts"):
+        pending = _alert_updates.get((name, data["version"]))
+        diff = await pending if pending is not None else alert_log.last(name)
+    if diff is None:
+        raise HTTPException(status_code=404, detail=f"no alerts recorded for dataset {name} yet")
+
+    alerts = {}
+    for alert in ALERT_TYPES:
+        if alert_type is not None and alert != alert_type:
+            continue
+        alerts[alert] = [a for a in diff[alert] if person is None or a["responsible_party"] == person]
+    return FastJSONResponse({
+        **{k: diff[k] for k in ("dataset", "version", "previous_version", "baseline", "created_at")},
+        **alerts,
+        "counts": {alert: len(records) for alert, records in alerts.items()},
+    })
 
 
 # ── Run locally ────────────────────────────────────────────────────────────────
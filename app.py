@@ -5,9 +5,10 @@ Talent Score Platform - Clean Design
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from scoring_engine import ScorecardEngine
+from history import build_history
+from history_store import open_store
+from snapshot import DELTA_DAYS, build_snapshot, export_version, person_role_rows
 from datetime import datetime
-import json
 import os
 
 st.set_page_config(
@@ -16,61 +17,53 @@ st.set_page_config(
     layout="wide"
 )
 
+ATS_EXPORT_PATH = 'sample_ats_export.csv'
+HISTORICAL_PATH = 'historical_performance_data.json'
+HISTORY_STORE_PATH = os.environ.get('HIREIQ_HISTORY_STORE', '.history.sqlite')
+
+# Leadership trend chart ranges, in days back from the latest snapshot
+TREND_RANGES = {"Last 3 months": 90, "Last 6 months": 180, "Last year": 365, "All": None}
+
+# Streamlit reruns this script on every widget interaction. The scored
+# export is cached across reruns and sessions, keyed on the file's version
+# stamp (mtime + size), so only a changed file is re-read and re-scored.
+# Historical snapshots are range-queried from the history store.
+
+@st.cache_resource(max_entries=2, show_spinner="Scoring ATS export...")
+def score_export(path, version):
+    """
+    Score an export once per version (snapshot.build_snapshot). cache_resource
+    hands every session the same objects without copying them, so callers
+    must not mutate them.
+    """
+    return build_snapshot(pd.read_csv(path), version)
+
 def load_data():
     try:
-        df = pd.read_csv('sample_ats_export.csv')
-        engine = ScorecardEngine(df)
-        violations = engine.calculate_scores()
-        recruiter_scores = engine.score_by_recruiter(violations)
-        hm_scores = engine.score_by_hiring_manager(violations)
-        org_summary = engine.get_org_summary(recruiter_scores, hm_scores)
-        
-        return {
-            'raw_data': df,
-            'violations': violations,
-            'recruiter_scores': recruiter_scores,
-            'hm_scores': hm_scores,
-            'org_summary': org_summary,
-            'engine': engine
-        }
+        return score_export(ATS_EXPORT_PATH, export_version(ATS_EXPORT_PATH))
     except FileNotFoundError:
         st.error("Data file not found")
         return None
 
-def load_historical_data():
-    try:
-        if os.path.exists('historical_performance_data.json'):
-            with open('historical_performance_data.json', 'r') as f:
-                return json.load(f)
-        else:
-            return generate_sample_historical_data()
-    except:
-        return generate_sample_historical_data()
+@st.cache_resource(show_spinner="Building score history...")
+def history_store(path):
+    """
+    The history store; a new one is seeded from historical_performance_data.json,
+    else from snapshots built from the ATS export itself
+    """
+    store = open_store(path, seed_json=HISTORICAL_PATH)
+    if store.is_empty() and os.path.exists(ATS_EXPORT_PATH):
+        store.import_json(build_history(pd.read_csv(ATS_EXPORT_PATH)))
+    return store
 
-def generate_sample_historical_data():
-    dates = ['2024-11-01', '2024-11-15', '2024-11-29', '2024-12-13', '2024-12-27', '2025-01-10']
-    org_scores = [58.2, 60.5, 62.8, 64.3, 65.7, 66.9]
-    rec_scores = [55.4, 58.1, 60.8, 62.5, 64.0, 65.3]
-    hm_scores = [61.0, 62.9, 64.8, 66.1, 67.4, 68.5]
-    
-    sample_data = {
-        'snapshots': [],
-        'metadata': {'start_date': dates[0], 'end_date': dates[-1], 'num_snapshots': 6, 'cadence': 'biweekly'}
-    }
-    
-    for i in range(6):
-        snapshot = {
-            'snapshot_num': i,
-            'snapshot_date': dates[i],
-            'org_summary': {
-                'org_average_score': org_scores[i],
-                'recruiter_average': rec_scores[i],
-                'hm_average': hm_scores[i]
-            }
-        }
-        sample_data['snapshots'].append(snapshot)
-    
-    return sample_data
+def load_org_trend(days=None):
+    """[(snapshot_date, org summary)] for the last `days` days of history (None = all)"""
+    store = history_store(HISTORY_STORE_PATH)
+    first, last = store.date_range()
+    if last is None:
+        return []
+    since = None if days is None else (pd.Timestamp(last) - pd.Timedelta(days=days)).strftime('%Y-%m-%d')
+    return store.org_series(since, last)
 
 def get_score_color(score):
     if score >= 80:
@@ -80,6 +73,26 @@ def get_score_color(score):
     else:
         return "#ef4444"
 
+def delta_label(delta):
+    """st.metric delta text for a score change over the snapshot's delta window"""
+    return None if pd.isna(delta) else f"{delta:+.1f} vs last {DELTA_DAYS} days"
+
+def format_trend(delta):
+    return "" if pd.isna(delta) else f"{delta:+.0f}"
+
+def role_display(my_roles):
+    """Dashboard table rows for a slice of the snapshot's role table"""
+    return pd.DataFrame({
+        'Role': my_roles['job_title'],
+        'Department': my_roles['team'],
+        'Recruiter': my_roles['recruiter_name'],
+        'Rec. Score': my_roles['recruiter_score'].fillna(0).astype(int),
+        'Hiring Manager': my_roles['hiring_manager_name'],
+        'Mgr. Score': my_roles['hm_score'].fillna(0).astype(int),
+        'Trend': my_roles['trend'].map(format_trend),
+        'req_id': my_roles['requisition_id'],
+    }).reset_index(drop=True)
+
 def login_screen():
     st.title("📊 Hiring Process Health - MVP")
     st.markdown("---")
@@ -126,24 +139,25 @@ def render_recruiter_view(data, user_name):
     st.title("Hiring Process Health - MVP")
     st.caption(f"Logged in as: {user_name}")
     
-    raw_data = data['raw_data']
     violations = data['violations']
     recruiter_scores = data['recruiter_scores']
     hm_scores = data['hm_scores']
     
     my_score_data = recruiter_scores[recruiter_scores['name'] == user_name].iloc[0]
     my_score = my_score_data['final_score']
-    my_roles = raw_data[raw_data['recruiter_name'] == user_name]['requisition_id'].unique()
+    my_roles = person_role_rows(data, user_name, 'recruiter')
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Avg Recruiter Score", int(my_score), delta="+3 vs last 14 days")
+        st.metric("Avg Recruiter Score", int(my_score), delta=delta_label(my_score_data['score_delta']))
     
     with col2:
-        my_hms = raw_data[raw_data['recruiter_name'] == user_name]['hiring_manager_name'].unique()
-        avg_hm_score = hm_scores[hm_scores['name'].isin(my_hms)]['final_score'].mean()
-        st.metric("Avg Hiring Manager", int(avg_hm_score), delta="-2 vs last 14 days")
+        my_hms = my_roles['hiring_manager_name'].unique()
+        my_hm_scores = hm_scores[hm_scores['name'].isin(my_hms)]
+        avg_hm_score = my_hm_scores['final_score'].mean()
+        st.metric("Avg Hiring Manager", int(avg_hm_score),
+                  delta=delta_label(avg_hm_score - my_hm_scores['prior_score'].mean()))
     
     with col3:
         st.metric("Open Roles", len(my_roles))
@@ -155,28 +169,7 @@ def render_recruiter_view(data, user_name):
     with col_main:
         st.subheader("Role Performance - Last 14 Days")
         
-        table_data = []
-        for req_id in my_roles:
-            req_data = raw_data[raw_data['requisition_id'] == req_id].iloc[0]
-            hm = req_data['hiring_manager_name']
-            
-            hm_score_data = hm_scores[hm_scores['name'] == hm]
-            hm_score = hm_score_data['final_score'].iloc[0] if len(hm_score_data) > 0 else 0
-            
-            trend = ["+6", "-5", "+3", "+3", "-7"][len(table_data) % 5]
-            
-            table_data.append({
-                'Role': req_data['job_title'],
-                'Department': req_data['team'],
-                'Recruiter': user_name,
-                'Rec. Score': int(my_score),
-                'Hiring Manager': hm,
-                'Mgr. Score': int(hm_score),
-                'Trend': trend,
-                'req_id': req_id
-            })
-        
-        df_display = pd.DataFrame(table_data)
+        df_display = role_display(my_roles)
         
         st.dataframe(
             df_display[['Role', 'Department', 'Recruiter', 'Rec. Score', 'Hiring Manager', 'Mgr. Score', 'Trend']],
@@ -236,24 +229,24 @@ def render_hiring_manager_view(data, user_name):
     st.title("Hiring Process Health - MVP")
     st.caption(f"Logged in as: {user_name}")
     
-    raw_data = data['raw_data']
-    violations = data['violations']
     recruiter_scores = data['recruiter_scores']
     hm_scores = data['hm_scores']
     
     my_score_data = hm_scores[hm_scores['name'] == user_name].iloc[0]
     my_score = my_score_data['final_score']
-    my_roles = raw_data[raw_data['hiring_manager_name'] == user_name]['requisition_id'].unique()
+    my_roles = person_role_rows(data, user_name, 'hm')
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        my_recruiters = raw_data[raw_data['hiring_manager_name'] == user_name]['recruiter_name'].unique()
-        avg_rec_score = recruiter_scores[recruiter_scores['name'].isin(my_recruiters)]['final_score'].mean()
-        st.metric("Avg Recruiter Score", int(avg_rec_score), delta="+3 vs last 14 days")
+        my_recruiters = my_roles['recruiter_name'].unique()
+        my_recruiter_scores = recruiter_scores[recruiter_scores['name'].isin(my_recruiters)]
+        avg_rec_score = my_recruiter_scores['final_score'].mean()
+        st.metric("Avg Recruiter Score", int(avg_rec_score),
+                  delta=delta_label(avg_rec_score - my_recruiter_scores['prior_score'].mean()))
     
     with col2:
-        st.metric("Avg Hiring Manager", int(my_score), delta="-2 vs last 14 days")
+        st.metric("Avg Hiring Manager", int(my_score), delta=delta_label(my_score_data['score_delta']))
     
     with col3:
         st.metric("Open Roles", len(my_roles))
@@ -265,28 +258,7 @@ def render_hiring_manager_view(data, user_name):
     with col_main:
         st.subheader("Role Performance - Last 14 Days")
         
-        table_data = []
-        for req_id in my_roles:
-            req_data = raw_data[raw_data['requisition_id'] == req_id].iloc[0]
-            recruiter = req_data['recruiter_name']
-            
-            rec_score_data = recruiter_scores[recruiter_scores['name'] == recruiter]
-            rec_score = rec_score_data['final_score'].iloc[0] if len(rec_score_data) > 0 else 0
-            
-            trend = ["+6", "-5", "+3", "+3", "-7"][len(table_data) % 5]
-            
-            table_data.append({
-                'Role': req_data['job_title'],
-                'Department': req_data['team'],
-                'Recruiter': recruiter,
-                'Rec. Score': int(rec_score),
-                'Hiring Manager': user_name,
-                'Mgr. Score': int(my_score),
-                'Trend': trend,
-                'req_id': req_id
-            })
-        
-        df_display = pd.DataFrame(table_data)
+        df_display = role_display(my_roles)
         
         st.dataframe(
             df_display[['Role', 'Department', 'Recruiter', 'Rec. Score', 'Hiring Manager', 'Mgr. Score', 'Trend']],
@@ -331,23 +303,26 @@ def render_leadership_view(data):
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Avg Recruiter Score", int(org_summary['recruiter_average']), delta="+3 vs last 14 days")
+        st.metric("Avg Recruiter Score", int(org_summary['recruiter_average']),
+                  delta=delta_label(org_summary['deltas']['recruiter_average']))
     
     with col2:
-        st.metric("Avg Hiring Manager", int(org_summary['hm_average']), delta="-2 vs last 14 days")
+        st.metric("Avg Hiring Manager", int(org_summary['hm_average']),
+                  delta=delta_label(org_summary['deltas']['hm_average']))
     
     with col3:
-        st.metric("Open Roles", len(data['raw_data']['requisition_id'].unique()))
+        st.metric("Open Roles", len(data['role_table']))
     
     st.markdown("---")
     st.subheader("📈 Organization Score Trend")
     
-    historical_data = load_historical_data()
-    if historical_data and 'snapshots' in historical_data:
-        dates = [s['snapshot_date'] for s in historical_data['snapshots']]
-        org_scores = [s['org_summary']['org_average_score'] for s in historical_data['snapshots']]
-        rec_scores = [s['org_summary']['recruiter_average'] for s in historical_data['snapshots']]
-        hm_scores_hist = [s['org_summary']['hm_average'] for s in historical_data['snapshots']]
+    trend_range = st.selectbox("Period", list(TREND_RANGES), index=len(TREND_RANGES) - 1, key="trend_range")
+    org_trend = load_org_trend(TREND_RANGES[trend_range])
+    if org_trend:
+        dates = [date for date, _ in org_trend]
+        org_scores = [summary['org_average_score'] for _, summary in org_trend]
+        rec_scores = [summary['recruiter_average'] for _, summary in org_trend]
+        hm_scores_hist = [summary['hm_average'] for _, summary in org_trend]
         
         fig = go.Figure()
         
@@ -0,0 +1,231 @@
+"""
+Scoring engine benchmark
+
+Times every calculate_* and score_by_* method of both ScorecardEngine
+implementations (scoring_engine and advanced_scoring_engine) on synthetic
+exports from synthetic_data.py, at several sizes and shapes. Each
+(engine, shape, size) case runs in a fresh process so its peak RSS is its
+own; a case that runs past --timeout is killed and larger sizes of that
+engine/shape are skipped.
+
+Results are written as JSON (one record per method) and can be compared
+against a stored baseline; the exit status is 1 when any method got
+slower than --max-slowdown.
+
+Usage:
+    python bench_engines.py
+    python bench_engines.py --sizes 1e3,1e4,1e5,1e6,1e7 --shapes balanced,few_reqs
+    python bench_engines.py --out bench.json --baseline bench_baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import SHAPES, generate_export, to_advanced_schema
+
+ENGINES = {
+    # engine -> timed methods, in call order
+    'scoring_engine': [
+        'calculate_feedback_timeliness', 'calculate_stage_velocity', 'calculate_hm_engagement',
+        'score_by_recruiter', 'score_by_hiring_manager',
+    ],
+    'advanced_scoring_engine': ['calculate_scores', 'score_by_recruiter', 'score_by_hiring_manager'],
+}
+
+# Methods faster than this (seconds) are reported but never flagged as regressions
+NOISE_FLOOR = 0.01
+
+
+def peak_rss_mb():
+    """High-water RSS of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def run_case(engine_name, shape, rows, seed):
+    """Score one synthetic export with one engine; returns per-method records"""
+    export = generate_export(rows, shape, seed)
+    if engine_name == 'advanced_scoring_engine':
+        from advanced_scoring_engine import ScorecardEngine
+        export = to_advanced_schema(export)
+        np.random.seed(seed)  # hm_engagement is simulated
+    else:
+        from scoring_engine import ScorecardEngine
+    rss_before = peak_rss_mb()
+
+    seconds = {}
+    start = time.perf_counter()
+    engine = ScorecardEngine(export)
+    if engine_name == 'scoring_engine':
+        seconds['__init__'] = time.perf_counter() - start  # parses the date columns
+        frames = []
+        for method in ENGINES[engine_name][:3]:
+            start = time.perf_counter()
+            frames.append(getattr(engine, method)())
+            seconds[method] = time.perf_counter() - start
+        violations = pd.concat(frames, ignore_index=True)
+    else:
+        start = time.perf_counter()
+        violations = engine.calculate_scores()
+        seconds['calculate_scores'] = time.perf_counter() - start
+
+    for method in ('score_by_recruiter', 'score_by_hiring_manager'):
+        start = time.perf_counter()
+        getattr(engine, method)(violations)
+        seconds[method] = time.perf_counter() - start
+
+    peak = peak_rss_mb()
+    return [
+        {
+            'engine': engine_name,
+            'shape': shape,
+            'rows': rows,
+            'method': method,
+            'seconds': round(elapsed, 6),
+            'rows_per_second': round(rows / elapsed) if elapsed > 0 else None,
+            'violations': len(violations),
+            'rss_before_mb': round(rss_before, 1),
+            'peak_rss_mb': round(peak, 1),
+            'status': 'ok',
+        }
+        for method, elapsed in seconds.items()
+    ]
+
+
+def _case_entry(conn, *case):
+    try:
+        conn.send(('ok', run_case(*case)))
+    except Exception as exc:  # reported in the results, not raised
+        conn.send(('error', f'{type(exc).__name__}: {exc}'))
+    finally:
+        conn.close()
+
+
+def run_isolated(engine_name, shape, rows, seed, timeout):
+    """run_case() in a fresh process; (status, records or message)"""
+    ctx = multiprocessing.get_context('spawn')
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_case_entry, args=(child, engine_name, shape, rows, seed))
+    proc.start()
+    child.close()
+    try:
+        if not parent.poll(timeout):
+            return 'timeout', f'no result after {timeout:g}s'
+        return parent.recv()
+    except EOFError:
+        return 'error', f'worker exited with code {proc.exitcode}'
+    finally:
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=False).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': multiprocessing.cpu_count(),
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def compare(results, baseline, max_slowdown):
+    """Print per-method time ratios against a baseline; returns the regressions"""
+    key = lambda r: (r['engine'], r['shape'], r['rows'], r['method'])
+    before = {key(r): r for r in baseline['results'] if r['status'] == 'ok'}
+    regressions = []
+    print(f"\nvs baseline {baseline['environment'].get('commit') or '?'} "
+          f"({baseline['environment'].get('timestamp', '?')})")
+    for r in results:
+        old = before.get(key(r))
+        if r['status'] != 'ok' or old is None or not old['seconds']:
+            continue
+        ratio = r['seconds'] / old['seconds']
+        flag = ''
+        if ratio > max_slowdown and r['seconds'] >= NOISE_FLOOR:
+            flag = '  REGRESSION'
+            regressions.append(r)
+        print(f"  {r['engine']:<24}{r['shape']:<17}{r['rows']:>10}  {r['method']:<30}"
+              f"{old['seconds']:>10.4f}s -> {r['seconds']:>10.4f}s  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def parse_sizes(text):
+    return [int(float(s)) for s in text.split(',') if s]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1e3,1e4,1e5', type=parse_sizes,
+                        help='comma-separated row counts (default 1e3,1e4,1e5; up to 1e7)')
+    parser.add_argument('--shapes', default=','.join(SHAPES), help='comma-separated synthetic_data shapes')
+    parser.add_argument('--engines', default=','.join(ENGINES), help='comma-separated engines')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=300, help='seconds per case before it is killed')
+    parser.add_argument('--out', default='bench_output.json', help='results file')
+    parser.add_argument('--baseline', help='results file from an earlier run to compare against')
+    parser.add_argument('--max-slowdown', type=float, default=1.25,
+                        help='time ratio vs baseline that counts as a regression')
+    args = parser.parse_args()
+
+    shapes = args.shapes.split(',')
+    engines = args.engines.split(',')
+    unknown = [s for s in shapes if s not in SHAPES] + [e for e in engines if e not in ENGINES]
+    if unknown:
+        parser.error(f'unknown shape/engine: {", ".join(unknown)}')
+
+    results = []
+    for engine_name in engines:
+        for shape in shapes:
+            given_up = None
+            for rows in sorted(args.sizes):
+                if given_up:
+                    results.append({'engine': engine_name, 'shape': shape, 'rows': rows,
+                                    'method': None, 'status': 'skipped', 'reason': given_up})
+                    continue
+                status, payload = run_isolated(engine_name, shape, rows, args.seed, args.timeout)
+                if status != 'ok':
+                    given_up = f'{status} at {rows} rows'
+                    results.append({'engine': engine_name, 'shape': shape, 'rows': rows,
+                                    'method': None, 'status': status, 'reason': payload})
+                    print(f"{engine_name:<24}{shape:<17}{rows:>10}  {status}: {payload}")
+                    continue
+                results.extend(payload)
+                for r in payload:
+                    print(f"{engine_name:<24}{shape:<17}{rows:>10}  {r['method']:<30}"
+                          f"{r['seconds']:>10.4f}s {r['rows_per_second'] or 0:>12,} rows/s "
+                          f"peak {r['peak_rss_mb']:>8.1f} MiB")
+
+    report = {'environment': environment(), 'results': results}
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_slowdown)
+        if regressions:
+            print(f"\n✗ {len(regressions)} method(s) slower than x{args.max_slowdown} of baseline")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
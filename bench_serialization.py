@@ -0,0 +1,140 @@
+"""
+Serialization benchmark for api.py
+
+Compares, per endpoint, the old response path (`to_dict(orient="records")`
++ FastAPI's `jsonable_encoder` + JSONResponse) with the current one
+(`frame_to_records` + FastJSONResponse), and reports body size with
+identity / gzip / brotli encoding.
+
+Scoring is done once up front so only payload building and encoding are
+timed.
+
+Usage:
+    python bench_serialization.py
+    python bench_serialization.py --export big_export.csv --repeat 20
+"""
+
+import argparse
+import time
+
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+import api
+import serialization
+from snapshot import build_snapshot
+
+
+def score_export(path):
+    """Score an export once, in the same shape load_ats_data() returns"""
+    return build_snapshot(pd.read_csv(path), version="bench")
+
+
+# ── Legacy payload builders (pre-optimization handler bodies) ──────────────────
+def legacy_scores(data):
+    recruiters = sorted(data["recruiter_scores"].to_dict(orient="records"), key=lambda x: -x["final_score"])
+    hms = sorted(data["hm_scores"].to_dict(orient="records"), key=lambda x: -x["final_score"])
+    for i, r in enumerate(recruiters):
+        r["rank"] = i + 1
+    for i, h in enumerate(hms):
+        h["rank"] = i + 1
+    return {"recruiters": recruiters, "hiring_managers": hms, "org_summary": data["org_summary"]}
+
+
+def legacy_person(data, name):
+    scores_df = data["recruiter_scores"]
+    score_data = scores_df[scores_df["name"] == name].iloc[0].to_dict()
+    v = data["violations"]
+    score_data["violations"] = v[(v["recruiter_name"] == name) | (v["hiring_manager_name"] == name)].to_dict(orient="records")
+    raw = data["raw"]
+    score_data["roles"] = raw[raw["recruiter_name"] == name][
+        ["requisition_id", "job_title", "team", "hiring_manager_name", "current_status"]
+    ].drop_duplicates("requisition_id").to_dict(orient="records")
+    return score_data
+
+
+def legacy_violations(data, name):
+    v = data["violations"]
+    person_v = v[(v["recruiter_name"] == name) | (v["hiring_manager_name"] == name)]
+    summary = {sev: int((person_v["severity"] == sev).sum()) for sev in ("high", "medium", "low")}
+    return {
+        "name": name,
+        "violations": person_v.fillna("").to_dict(orient="records"),
+        "total": len(person_v),
+        "summary": summary,
+    }
+
+
+def legacy_roles(data):
+    roles = data["raw"].sort_values("stage_entered_date", ascending=False).drop_duplicates("requisition_id")
+    result = roles[[
+        "requisition_id", "job_title", "team", "recruiter_name", "hiring_manager_name",
+        "role_opened_date", "current_status", "stage",
+    ]].to_dict(orient="records")
+    return {"roles": result, "total": len(result)}
+
+
+def legacy_render(content):
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def timed(fn, repeat):
+    """Best-of-N wall time in ms, plus the last result"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except ValueError as exc:  # NaN in the legacy path -> HTTP 500
+            return None, exc
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def encoded_sizes(body):
+    sizes = {"identity": len(body), "gzip": len(serialization.compress(body, "gzip"))}
+    if serialization.brotli is not None:
+        sizes["br"] = len(serialization.compress(body, "br"))
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--export", default="sample_ats_export.csv", help="ATS export CSV to score")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    data = score_export(args.export)
+    api.load_ats_data = lambda dataset=None: data  # serve the pre-scored tables
+
+    person = data["recruiter_scores"]["name"].iloc[0]
+
+    cases = [
+        ("/api/scores", lambda: legacy_scores(data), api.get_all_scores),
+        ("/api/scores/{name}", lambda: legacy_person(data, person), lambda: api.get_person_score(person)),
+        ("/api/violations/{name}", lambda: legacy_violations(data, person), lambda: api.get_violations(person)),
+        ("/api/roles", lambda: legacy_roles(data), api.get_roles),
+        ("/api/historical", api.history.snapshots, api.get_historical),
+    ]
+
+    print(f"Export: {args.export}  ({len(data['raw'])} rows, {len(data['violations'])} violations)")
+    header = f"{'endpoint':<26}{'before ms':>11}{'after ms':>10}{'before B':>11}{'after B':>10}{'gzip B':>9}{'br B':>9}"
+    print(header)
+    print("-" * len(header))
+
+    for endpoint, legacy_build, handler in cases:
+        before_ms, before = timed(lambda: legacy_render(legacy_build()), args.repeat)
+        after_ms, after = timed(lambda: handler().body, args.repeat)
+        sizes = encoded_sizes(after)
+        before_cell = f"{before_ms:>11.2f}" if before_ms is not None else f"{'500 NaN':>11}"
+        before_bytes = f"{len(before):>11}" if before_ms is not None else f"{'-':>11}"
+        print(
+            f"{endpoint:<26}{before_cell}{after_ms:>10.2f}{before_bytes}{sizes['identity']:>10}"
+            f"{sizes['gzip']:>9}{sizes.get('br', '-'):>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
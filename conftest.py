@@ -0,0 +1,30 @@
+"""
+Shared pytest fixtures
+"""
+
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+ADMIN_TOKEN = "test-admin-token"
+
+
+@pytest.fixture(scope="session")
+def api(tmp_path_factory):
+    """api.py imported with its state (store, history, alerts, uploads) in a temp directory"""
+    state = tmp_path_factory.mktemp("api")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("HIREIQ_SNAPSHOT_STORE", str(state / "snapshots"))
+        mp.setenv("HIREIQ_HISTORY_STORE", str(state / "history.sqlite"))
+        mp.setenv("HIREIQ_ALERTS_DIR", str(state / "alerts"))
+        mp.setenv("HIREIQ_DATASETS_DIR", str(state / "datasets"))
+        mp.setenv("HIREIQ_ADMIN_TOKEN", ADMIN_TOKEN)
+        mp.setenv("HIREIQ_MAX_UPLOAD_MB", "1")
+        yield importlib.import_module("api")
+
+
+@pytest.fixture(scope="session")
+def client(api):
+    with TestClient(api.app) as client:
+        yield client
@@ -0,0 +1,174 @@
+"""
+events.py — server-sent snapshot updates for api.py
+
+Dashboards subscribe to /api/stream instead of polling. A background
+SnapshotWatcher stats the export of every dataset somebody is subscribed
+to; when a new version appears it loads the new snapshot (through the
+shared SnapshotCache, so the build is the same one requests would use),
+diffs it against the previous one and pushes the diff to every subscriber:
+
+  score_changes      — people whose final_score changed (or who appeared /
+                       disappeared), with the delta
+  new_high_severity  — high-severity violations not present before, keyed
+                       by (requisition_id, stage, metric, responsible_party)
+
+Every tick it also advances the snapshot's SLA forecaster (sla.py) to the
+current time and pushes an `sla_breach` event with the open interviews and
+stages whose deadline passed since the last tick. Deadlines that passed
+before a snapshot was first watched (between its export and now) are not
+announced. For a historical export that is all of them: it never sends
+`sla_breach`, and /api/sla/upcoming needs ?now= to look inside its period.
+
+Only a compact digest of each announced snapshot is kept, not the tables.
+"""
+
+import asyncio
+
+from serialization import dumps, frame_to_records
+from snapshot import export_version
+
+HIGH_SEVERITY_KEY = ["requisition_id", "stage", "metric", "responsible_party"]
+
+
+# ── Digests and diffs ──────────────────────────────────────────────────────────
+def snapshot_digest(snapshot):
+    """What a diff needs from a snapshot: scores by person and high-severity violations"""
+    scores = {}
+    for role_type, key in (("recruiter", "recruiter_scores"), ("hm", "hm_scores")):
+        table = snapshot[key]
+        for name, score in zip(table["name"].tolist(), table["final_score"].tolist()):
+            scores[(role_type, name)] = score
+
+    violations = snapshot["violations"]
+    high = {}
+    if not violations.empty:
+        rows = violations[violations["severity"] == "high"]
+        for record in frame_to_records(rows, HIGH_SEVERITY_KEY + ["penalty", "event_date"]):
+            high[tuple(record[c] for c in HIGH_SEVERITY_KEY)] = record
+
+    return {"version": snapshot["version"], "scores": scores, "high": high}
+
+
+def diff_digests(old, new):
+    """Score changes and new high-severity violations between two digests"""
+    changes = []
+    for key in sorted(old["scores"].keys() | new["scores"].keys(), key=lambda k: (k[0], k[1])):
+        before = old["scores"].get(key)
+        after = new["scores"].get(key)
+        if before == after:
+            continue
+        delta = round(after - before, 1) if before is not None and after is not None else None
+        changes.append({"role_type": key[0], "name": key[1], "previous": before, "current": after, "delta": delta})
+
+    new_high = [new["high"][key] for key in new["high"].keys() - old["high"].keys()]
+    new_high.sort(key=lambda v: (v["event_date"] or "", v["requisition_id"]))
+
+    return {
+        "version": new["version"],
+        "previous_version": old["version"],
+        "score_changes": changes,
+        "new_high_severity": new_high,
+    }
+
+
+def format_event(event, data, event_id=None):
+    """One SSE frame"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    return ("\n".join(lines) + "\ndata: ").encode("utf-8") + dumps(data) + b"\n\n"
+
+
+# ── Watcher ────────────────────────────────────────────────────────────────────
+class SnapshotWatcher:
+    """
+    Polls the exports of subscribed datasets every `interval` seconds and
+    fans snapshot diffs out to subscriber queues.
+
+    resolve: dataset -> export path (raises for unknown datasets)
+    A subscriber that falls `queue_size` events behind is sent a single
+    'resync' event instead of the backlog.
+    """
+
+    def __init__(self, cache, resolve, interval=2.0, queue_size=16):
+        self.cache = cache
+        self.resolve = resolve
+        self.interval = interval
+        self.queue_size = queue_size
+        self._subscribers = {}   # dataset -> set of asyncio.Queue
+        self._digests = {}       # dataset -> (export path, digest)
+        self._breaches = {}      # dataset -> (forecaster, last breach seq published)
+
+    async def subscribe(self, dataset):
+        """Register a subscriber; returns (queue, current version)"""
+        path = self.resolve(dataset)
+        if dataset not in self._digests:
+            snapshot = await self.cache.get(path)
+            digest = await asyncio.get_running_loop().run_in_executor(None, snapshot_digest, snapshot)
+            self._digests.setdefault(dataset, (path, digest))
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(dataset, set()).add(queue)
+        return queue, self._digests[dataset][1]["version"]
+
+    def unsubscribe(self, dataset, queue):
+        queues = self._subscribers.get(dataset)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[dataset]
+            self._digests.pop(dataset, None)
+            self._breaches.pop(dataset, None)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            for dataset in list(self._subscribers):
+                try:
+                    await self.check(dataset)
+                    self.check_deadlines(dataset)
+                except Exception:
+                    continue   # export mid-write or dataset removed; retry next tick
+
+    async def check(self, dataset):
+        """Publish a diff if the dataset's export changed since the last one"""
+        path = self.resolve(dataset)
+        previous_path, previous = self._digests[dataset]
+        if path == previous_path and export_version(path) == previous["version"]:
+            return
+
+        snapshot = await self.cache.get(path)
+        loop = asyncio.get_running_loop()
+        digest = await loop.run_in_executor(None, snapshot_digest, snapshot)
+        diff = await loop.run_in_executor(None, diff_digests, previous, digest)
+        if dataset not in self._subscribers:
+            return
+        self._digests[dataset] = (path, digest)
+        self.publish(dataset, {"dataset": dataset, **diff})
+
+    def check_deadlines(self, dataset):
+        """Publish the SLA breaches that came due since the last tick"""
+        snapshot = self.cache.current(self.resolve(dataset))
+        if snapshot is None or dataset not in self._subscribers:
+            return
+        forecaster = snapshot["indexes"]["sla"]
+        previous, seen = self._breaches.get(dataset, (None, None))
+        forecaster.advance()
+        if forecaster is not previous:
+            # New snapshot: catch its clock up from the export's as_of without
+            # announcing that backlog; only deadlines passing while watched are live
+            seen = forecaster.breached
+        breaches = forecaster.since(seen)
+        self._breaches[dataset] = (forecaster, forecaster.breached)
+        if breaches:
+            self.publish(dataset, {"dataset": dataset, "version": snapshot["version"], "breaches": breaches},
+                         event="sla_breach")
+
+    def publish(self, dataset, diff, event="snapshot"):
+        for queue in self._subscribers.get(dataset, ()):
+            if queue.full():
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(("resync", {"dataset": dataset, "version": diff["version"]}))
+            else:
+                queue.put_nowait((event, diff))
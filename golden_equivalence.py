@@ -0,0 +1,245 @@
+"""
+Golden equivalence check for optimized scoring engines
+
+Runs the reference scoring_engine.ScorecardEngine and a candidate engine
+(any class with the same interface, given as module:Class) over many
+seeded random exports and diffs their output table by table:
+
+  calculate_feedback_timeliness, calculate_stage_velocity,
+  calculate_hm_engagement, calculate_scores,
+  score_by_recruiter, score_by_hiring_manager   (both fed the reference
+                                                 violations, so score drift
+                                                 is isolated from metric drift)
+  get_org_summary
+
+Comparison is exact: same columns, dtypes, values (NaN == NaN) and row
+order. --ignore-order compares rows as a multiset instead. If the reference
+raises, the candidate must raise the same exception type.
+
+Exports are synthetic_data.py exports at random sizes and shapes, perturbed
+with the edge cases that break vectorized rewrites: NaT dates in every date
+column, single-stage and single-row requisitions, duplicate stage
+timestamps, HM-only interviews, no interviews at all. A failing export is
+saved as CSV (--save-failures) so it can be replayed.
+
+Usage:
+    python golden_equivalence.py --candidate fast_engine:ScorecardEngine
+    python golden_equivalence.py --candidate fast_engine:ScorecardEngine --cases 500 --max-rows 400
+    python golden_equivalence.py --replay golden_failures/case-0042.csv --candidate fast_engine:ScorecardEngine
+
+Without --candidate the reference is checked against itself, which
+catches nondeterminism in the reference and in the harness.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from scoring_engine import ScorecardEngine
+from synthetic_data import SHAPES, generate_export
+
+METRIC_METHODS = ['calculate_feedback_timeliness', 'calculate_stage_velocity', 'calculate_hm_engagement',
+                  'calculate_scores']
+SCORE_METHODS = ['score_by_recruiter', 'score_by_hiring_manager']
+DATE_COLUMNS = ['stage_entered_date', 'interview_completed_date', 'feedback_submitted_date']
+
+
+def load_engine(spec):
+    """'module:Class' -> the class"""
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name or 'ScorecardEngine')
+
+
+# ── Random exports with edge cases ────────────────────────────────────────────
+def random_export(seed, max_rows=200):
+    """A small seeded export from synthetic_data, perturbed with edge cases"""
+    rng = np.random.default_rng(seed)
+    rows = int(rng.integers(1, max_rows + 1))
+    shape = list(SHAPES)[int(rng.integers(0, len(SHAPES)))]
+    df = generate_export(rows, shape, seed)
+
+    def pick(rate):
+        return rng.random(len(df)) < rate
+
+    # NaT in any date column (stage_entered_date too: the reference must cope or raise alike)
+    for column in DATE_COLUMNS:
+        df.loc[pick(rng.choice([0, 0.05, 0.3])), column] = pd.NaT
+
+    reqs = df['requisition_id'].unique()
+    chosen = lambda rate: df['requisition_id'].isin(reqs[rng.random(len(reqs)) < rate])
+
+    # Single-stage requisitions
+    single = chosen(0.15)
+    df.loc[single, 'stage'] = df.loc[single, 'stage'].groupby(df.loc[single, 'requisition_id']).transform('first')
+
+    # Duplicate stage timestamps within a requisition
+    dup = chosen(0.15)
+    df.loc[dup, 'stage_entered_date'] = (
+        df.loc[dup, 'stage_entered_date'].groupby(df.loc[dup, 'requisition_id']).transform('min')
+    )
+
+    # HM-only interviews, and requisitions with no interviews at all
+    hm_only = chosen(0.1)
+    df.loc[hm_only, 'is_hiring_manager_interview'] = True
+    none = chosen(0.1)
+    df.loc[none, ['interview_completed_date', 'feedback_submitted_date']] = pd.NaT
+
+    # Feedback before the interview, and feedback exactly on a severity boundary
+    early = pick(0.03) & df['interview_completed_date'].notna()
+    df.loc[early, 'feedback_submitted_date'] = df.loc[early, 'interview_completed_date'] - pd.Timedelta(hours=5)
+    boundary = pick(0.05) & df['interview_completed_date'].notna()
+    df.loc[boundary, 'feedback_submitted_date'] = (
+        df.loc[boundary, 'interview_completed_date']
+        + pd.to_timedelta(rng.choice([48, 72], int(boundary.sum())), unit='h')
+    )
+
+    # Rows out of order, as an ATS export can be
+    if rng.random() < 0.5:
+        df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+    # The engines read exports as CSV strings; match that
+    for column in DATE_COLUMNS + ['role_opened_date']:
+        df[column] = df[column].dt.strftime('%Y-%m-%d %H:%M:%S')
+    return df
+
+
+# ── Running and diffing ───────────────────────────────────────────────────────
+def run(engine_cls, df, reference_violations=None):
+    """method -> ('ok', result) or ('raised', exception type name)"""
+    outputs = {}
+
+    def call(name, fn):
+        try:
+            outputs[name] = ('ok', fn())
+        except Exception as exc:  # compared, not raised
+            outputs[name] = ('raised', type(exc).__name__)
+
+    try:
+        engine = engine_cls(df.copy())
+    except Exception as exc:
+        return {'__init__': ('raised', type(exc).__name__)}
+
+    for method in METRIC_METHODS:
+        call(method, getattr(engine, method))
+
+    violations = reference_violations
+    if violations is None:
+        status, violations = outputs['calculate_scores']
+        if status != 'ok':
+            return outputs
+    for method in SCORE_METHODS:
+        call(method, lambda: getattr(engine, method)(violations))
+
+    if all(outputs.get(m, ('raised',))[0] == 'ok' for m in SCORE_METHODS):
+        call('get_org_summary', lambda: engine.get_org_summary(outputs['score_by_recruiter'][1],
+                                                               outputs['score_by_hiring_manager'][1]))
+    return outputs
+
+
+def diff_frames(expected, actual, ignore_order=False):
+    """None if equal, else a short description of the first difference"""
+    if list(expected.columns) != list(actual.columns):
+        return f'columns differ: {list(expected.columns)} vs {list(actual.columns)}'
+    if len(expected) != len(actual):
+        return f'{len(expected)} rows vs {len(actual)} rows'
+    if ignore_order and len(expected.columns):
+        by = list(expected.columns)
+        expected = expected.sort_values(by, kind='mergesort', na_position='first').reset_index(drop=True)
+        actual = actual.sort_values(by, kind='mergesort', na_position='first').reset_index(drop=True)
+    dtypes = [(c, e, a) for c, e, a in zip(expected.columns, expected.dtypes, actual.dtypes) if e != a]
+    if dtypes:
+        return 'dtypes differ: ' + ', '.join(f'{c} {e} vs {a}' for c, e, a in dtypes)
+
+    differs = np.zeros(len(expected), dtype=bool)
+    for column in expected.columns:
+        left, right = expected[column].to_numpy(), actual[column].to_numpy()
+        differs |= ~((left == right) | (pd.isna(left) & pd.isna(right)))
+    if not differs.any():
+        return None
+    row = int(np.argmax(differs))
+    cells = ', '.join(
+        f'{c}={expected[c].iloc[row]!r} vs {actual[c].iloc[row]!r}'
+        for c in expected.columns
+        if not (expected[c].iloc[row] == actual[c].iloc[row]
+                or (pd.isna(expected[c].iloc[row]) and pd.isna(actual[c].iloc[row])))
+    )
+    return f'{int(differs.sum())} of {len(expected)} rows differ; first at row {row}: {cells}'
+
+
+def diff_outputs(expected, actual, ignore_order=False):
+    """[(method, description)] for every method whose output differs"""
+    problems = []
+    for method, (status, value) in expected.items():
+        if method not in actual:
+            problems.append((method, 'not run by the candidate'))
+            continue
+        other_status, other = actual[method]
+        if status != other_status or (status == 'raised' and value != other):
+            problems.append((method, f'reference {status} {value if status == "raised" else ""}'
+                                     f'vs candidate {other_status} {other if other_status == "raised" else ""}'))
+        elif status == 'ok' and isinstance(value, pd.DataFrame):
+            problem = diff_frames(value, other, ignore_order)
+            if problem:
+                problems.append((method, problem))
+        elif status == 'ok' and value != other:
+            problems.append((method, f'{value} vs {other}'))
+    return problems
+
+
+def check(candidate_cls, df, ignore_order=False):
+    expected = run(ScorecardEngine, df)
+    reference_violations = expected.get('calculate_scores', ('raised', None))
+    actual = run(candidate_cls, df, reference_violations[1] if reference_violations[0] == 'ok' else None)
+    return diff_outputs(expected, actual, ignore_order)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidate', default='scoring_engine:ScorecardEngine',
+                        help='engine under test as module:Class (default: the reference itself)')
+    parser.add_argument('--cases', type=int, default=200, help='random exports to check')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first case')
+    parser.add_argument('--max-rows', type=int, default=200, help='largest random export')
+    parser.add_argument('--ignore-order', action='store_true', help='compare rows as a multiset')
+    parser.add_argument('--save-failures', default='golden_failures', help='directory for failing exports')
+    parser.add_argument('--replay', help='check one saved export instead of random ones')
+    parser.add_argument('--fail-fast', action='store_true', help='stop at the first failing case')
+    args = parser.parse_args()
+
+    candidate = load_engine(args.candidate)
+
+    if args.replay:
+        cases = [(args.replay, pd.read_csv(args.replay))]
+    else:
+        cases = ((f'case-{seed:04d}', random_export(seed, args.max_rows))
+                 for seed in range(args.seed, args.seed + args.cases))
+
+    failures = 0
+    checked = 0
+    for label, df in cases:
+        checked += 1
+        problems = check(candidate, df, args.ignore_order)
+        if not problems:
+            continue
+        failures += 1
+        print(f"✗ {label} ({len(df)} rows, {df['requisition_id'].nunique()} requisitions)")
+        for method, problem in problems:
+            print(f"    {method}: {problem}")
+        if not args.replay and args.save_failures:
+            os.makedirs(args.save_failures, exist_ok=True)
+            path = os.path.join(args.save_failures, f'{label}.csv')
+            df.to_csv(path, index=False)
+            print(f"    saved to {path}")
+        if args.fail_fast:
+            break
+
+    print(f"\n{checked - failures}/{checked} exports identical ({args.candidate} vs scoring_engine:ScorecardEngine)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+history.py — historical score snapshots built from a real ATS export
+
+Scores the export once, then walks its violations in event-date order
+(ScorecardEngine.score_history) and emits recruiter, HM and org snapshots
+at a fixed cadence in the historical_performance_data.json schema:
+
+  {"snapshots": [{"snapshot_num", "snapshot_date", "recruiters",
+                  "hiring_managers", "org_summary"}, ...],
+   "metadata": {"start_date", "end_date", "num_snapshots", "cadence", ...}}
+
+A snapshot dated D scores what was a violation by the end of D, for
+everyone who owned a requisition opened by then. Most violations count
+from their event date (the same cut ScorecardEngine.score_deltas uses).
+Missing feedback counts as medium once it is 48h late and high at 72h,
+not from the interview. HM engagement accrues issue by issue. See
+ScorecardEngine._history_steps. A year of weekly snapshots costs about
+one scoring pass: the metrics run once and each violation is accumulated
+once.
+
+Usage:
+    python history.py --export sample_ats_export.csv --out historical_performance_data.json
+    python history.py --cadence weekly --start 2024-11-01
+    python history.py --cadence daily --store .history.sqlite   (append to history_store)
+"""
+
+import argparse
+import json
+
+import pandas as pd
+
+from scoring_engine import ScorecardEngine
+from serialization import frame_to_records
+
+CADENCES = {"daily": 1, "weekly": 7, "biweekly": 14, "monthly": 30}
+
+
+def cadence_days(cadence):
+    """'weekly' / 'biweekly' / ... or a number of days"""
+    if isinstance(cadence, str) and cadence in CADENCES:
+        return CADENCES[cadence]
+    days = int(cadence)
+    if days < 1:
+        raise ValueError(f"cadence must be at least one day, got {cadence!r}")
+    return days
+
+
+def snapshot_dates(engine, violations, days, start=None, end=None):
+    """Every `days` days from `start` (first requisition opened) through `end` (latest violation)"""
+    if start is None:
+        start = engine.df["role_opened_date"].min()
+    if end is None:
+        end = violations["event_date"].max() if not violations.empty else engine.df["role_opened_date"].max()
+    if pd.isna(start) or pd.isna(end):
+        return pd.DatetimeIndex([])
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    dates = pd.date_range(start, end, freq=f"{days}D")
+    if len(dates) == 0 or dates[-1] < end:
+        dates = dates.append(pd.DatetimeIndex([end]))  # always end on the latest data
+    return dates
+
+
+def build_history(df, cadence="biweekly", start=None, end=None):
+    """Historical snapshots of an export, as the historical JSON document"""
+    days = cadence_days(cadence)
+    engine = ScorecardEngine(df)
+    violations = engine.calculate_scores()
+    dates = snapshot_dates(engine, violations, days, start, end)
+
+    # A snapshot covers its whole day
+    cutoffs = dates + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+
+    snapshots = []
+    for date, (_, recruiter_scores, hm_scores) in zip(dates, engine.score_history(violations, cutoffs)):
+        if recruiter_scores.empty and hm_scores.empty:
+            continue  # nobody owns a requisition yet
+        summary = engine.get_org_summary(recruiter_scores, hm_scores)
+        snapshots.append({
+            "snapshot_num": len(snapshots),
+            "snapshot_date": date.strftime("%Y-%m-%d"),
+            "recruiters": frame_to_records(recruiter_scores),
+            "hiring_managers": frame_to_records(hm_scores),
+            "org_summary": {k: None if pd.isna(v) else v for k, v in summary.items()},
+        })
+
+    return {
+        "snapshots": snapshots,
+        "metadata": {
+            "start_date": snapshots[0]["snapshot_date"] if snapshots else None,
+            "end_date": snapshots[-1]["snapshot_date"] if snapshots else None,
+            "num_snapshots": len(snapshots),
+            "cadence": cadence if isinstance(cadence, str) and cadence in CADENCES else f"{days}d",
+            "source": "ats_export",
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build historical score snapshots from an ATS export")
+    parser.add_argument("--export", default="sample_ats_export.csv", help="ATS export CSV")
+    parser.add_argument("--out", default="historical_performance_data.json", help="JSON file to write")
+    parser.add_argument("--cadence", default="biweekly",
+                        help=f"{' / '.join(CADENCES)} or a number of days (default biweekly)")
+    parser.add_argument("--start", help="first snapshot date (default: first requisition opened)")
+    parser.add_argument("--end", help="last snapshot date (default: latest violation)")
+    parser.add_argument("--store", help="append to this history_store database instead of writing --out")
+    args = parser.parse_args()
+
+    history = build_history(pd.read_csv(args.export), args.cadence, args.start, args.end)
+    if args.store:
+        from history_store import HistoryStore
+        HistoryStore(args.store).import_json(history)
+        target = args.store
+    else:
+        with open(args.out, "w") as f:
+            json.dump(history, f, indent=2)
+        target = args.out
+    meta = history["metadata"]
+    print(f"✓ {meta['num_snapshots']} {meta['cadence']} snapshots "
+          f"({meta['start_date']} → {meta['end_date']}) written to {target}")
@@ -0,0 +1,270 @@
+"""
+history_store.py — append-only store for historical score snapshots
+
+Replaces the ever-growing historical_performance_data.json with a SQLite
+database (stdlib only) holding one row per person per snapshot and one
+org summary row per snapshot:
+
+  person_scores  — (name, snapshot_date, role_type) primary key, stored
+                   WITHOUT ROWID so a person's history is one contiguous
+                   range scan; plus a snapshot_date index for date ranges.
+                   position keeps each snapshot's list order
+  org_snapshots  — snapshot_date primary key, org summary columns
+
+Snapshots are appended (a date already present is replaced). After each
+append the store is compacted relative to its newest snapshot:
+
+  newer than daily_days    — every snapshot kept
+  newer than weekly_days   — last snapshot of each ISO week kept
+  older                    — last snapshot of each month kept
+  older than retention_days (if set) — dropped
+
+Scores are "as of" their date, so the last snapshot of a bucket stands for
+the whole bucket; nothing is averaged.
+
+Reads are range queries that return the historical JSON schema, so the
+API and dashboard consume them unchanged. Fill or extend a store with:
+
+    python history.py --export sample_ats_export.csv --store .history.sqlite
+    python history_store.py --store .history.sqlite --import historical_performance_data.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+
+import pandas as pd
+
+SCORE_COLUMNS = [
+    "final_score", "feedback_score", "velocity_score", "engagement_score",
+    "total_violations", "high_severity", "medium_severity", "low_severity",
+]
+ORG_COLUMNS = [
+    "org_average_score", "recruiter_average", "hm_average",
+    "total_violations", "high_severity_total", "people_count",
+]
+ROLE_KEYS = {"recruiters": "Recruiter", "hiring_managers": "Hiring Manager"}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS person_scores (
+    name TEXT NOT NULL,
+    snapshot_date TEXT NOT NULL,
+    role_type TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    {", ".join(f"{c} REAL" for c in SCORE_COLUMNS)},
+    PRIMARY KEY (name, snapshot_date, role_type)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS person_scores_date ON person_scores (snapshot_date);
+CREATE TABLE IF NOT EXISTS org_snapshots (
+    snapshot_date TEXT PRIMARY KEY,
+    {", ".join(f"{c} REAL" for c in ORG_COLUMNS)}
+);
+"""
+
+
+def _number(value):
+    """REAL column value back to the int the JSON schema had, where it was one"""
+    if value is None:
+        return None
+    return int(value) if float(value).is_integer() else value
+
+
+class HistoryStore:
+    """Historical snapshots in SQLite, with retention and downsampling"""
+
+    def __init__(self, path, daily_days=30, weekly_days=180, retention_days=None):
+        self.path = path
+        self.daily_days = daily_days
+        self.weekly_days = weekly_days
+        self.retention_days = retention_days
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # One short-lived connection per call: handlers run on many threads
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    # ── Writing ────────────────────────────────────────────────────────────────
+    def append(self, snapshot, compact=True):
+        """Add one snapshot in the historical JSON schema (replacing its date)"""
+        self.append_many([snapshot], compact)
+
+    def append_many(self, snapshots, compact=True):
+        with self._connect() as db:
+            for snapshot in snapshots:
+                date = snapshot["snapshot_date"]
+                db.execute("DELETE FROM person_scores WHERE snapshot_date = ?", (date,))
+                rows = [
+                    (p["name"], date, p.get("role_type", role), position, *(p.get(c) for c in SCORE_COLUMNS))
+                    for key, role in ROLE_KEYS.items()
+                    for position, p in enumerate(snapshot.get(key, []))
+                ]
+                db.executemany(
+                    f"INSERT OR REPLACE INTO person_scores VALUES ({', '.join('?' * (4 + len(SCORE_COLUMNS)))})",
+                    rows,
+                )
+                summary = snapshot.get("org_summary", {})
+                db.execute(
+                    f"INSERT OR REPLACE INTO org_snapshots VALUES ({', '.join('?' * (1 + len(ORG_COLUMNS)))})",
+                    (date, *(summary.get(c) for c in ORG_COLUMNS)),
+                )
+            if compact:
+                self._compact(db)
+
+    def import_json(self, document):
+        """Load a whole historical JSON document"""
+        self.append_many(document.get("snapshots", []))
+
+    def compact(self):
+        """Apply downsampling and retention; returns the number of snapshots dropped"""
+        with self._connect() as db:
+            return self._compact(db)
+
+    def _compact(self, db):
+        dates = pd.to_datetime([d for (d,) in db.execute("SELECT snapshot_date FROM org_snapshots")])
+        if len(dates) == 0:
+            return 0
+        age = (dates.max() - dates).days
+        keep = pd.Series(age < self.daily_days, index=dates)
+
+        # Last snapshot per ISO week / per month within each older tier
+        weekly = (age >= self.daily_days) & (age < self.weekly_days)
+        monthly = age >= self.weekly_days
+        for tier, bucket in ((weekly, dates.to_period("W")), (monthly, dates.to_period("M"))):
+            tier_dates = pd.Series(dates[tier], index=bucket[tier])
+            keep.loc[tier_dates.groupby(level=0).max().to_numpy()] = True
+
+        if self.retention_days is not None:
+            keep &= age < self.retention_days
+
+        dropped = [d.strftime("%Y-%m-%d") for d in keep.index[~keep.to_numpy()]]
+        db.executemany("DELETE FROM org_snapshots WHERE snapshot_date = ?", [(d,) for d in dropped])
+        db.executemany("DELETE FROM person_scores WHERE snapshot_date = ?", [(d,) for d in dropped])
+        return len(dropped)
+
+    # ── Reading ────────────────────────────────────────────────────────────────
+    @staticmethod
+    def _range(date_from, date_to, column="snapshot_date"):
+        clauses, params = [], []
+        if date_from is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(str(date_from)[:10])
+        if date_to is not None:
+            clauses.append(f"{column} <= ?")
+            params.append(str(date_to)[:10])
+        return (" AND ".join(clauses) or "1"), params
+
+    def is_empty(self):
+        with self._connect() as db:
+            return db.execute("SELECT 1 FROM org_snapshots LIMIT 1").fetchone() is None
+
+    def date_range(self):
+        """(first, last) snapshot date, or (None, None) for an empty store"""
+        with self._connect() as db:
+            return db.execute("SELECT MIN(snapshot_date), MAX(snapshot_date) FROM org_snapshots").fetchone()
+
+    def org_series(self, date_from=None, date_to=None):
+        """[(snapshot_date, org summary dict)] in date order"""
+        where, params = self._range(date_from, date_to)
+        with self._connect() as db:
+            rows = db.execute(
+                f"SELECT snapshot_date, {', '.join(ORG_COLUMNS)} FROM org_snapshots "
+                f"WHERE {where} ORDER BY snapshot_date", params,
+            ).fetchall()
+        return [(row[0], {c: _number(v) for c, v in zip(ORG_COLUMNS, row[1:])}) for row in rows]
+
+    def snapshots(self, date_from=None, date_to=None):
+        """Snapshots in the range, as the historical JSON document"""
+        org = self.org_series(date_from, date_to)
+        where, params = self._range(date_from, date_to)
+        with self._connect() as db:
+            rows = db.execute(
+                f"SELECT snapshot_date, role_type, name, {', '.join(SCORE_COLUMNS)} FROM person_scores "
+                f"WHERE {where} ORDER BY snapshot_date, position", params,
+            ).fetchall()
+
+        people = {}
+        for date, role, name, *scores in rows:
+            key = "hiring_managers" if role == "Hiring Manager" else "recruiters"
+            record = {"name": name, "role_type": role, **{c: _number(v) for c, v in zip(SCORE_COLUMNS, scores)}}
+            people.setdefault(date, {"recruiters": [], "hiring_managers": []})[key].append(record)
+
+        snapshots = [
+            {
+                "snapshot_num": i,
+                "snapshot_date": date,
+                **people.get(date, {"recruiters": [], "hiring_managers": []}),
+                "org_summary": summary,
+            }
+            for i, (date, summary) in enumerate(org)
+        ]
+        return {
+            "snapshots": snapshots,
+            "metadata": {
+                "start_date": snapshots[0]["snapshot_date"] if snapshots else None,
+                "end_date": snapshots[-1]["snapshot_date"] if snapshots else None,
+                "num_snapshots": len(snapshots),
+                "source": "history_store",
+            },
+        }
+
+    def person(self, name, date_from=None, date_to=None):
+        """A person's scores over time (recruiter rows before HM rows on the same date)"""
+        where, params = self._range(date_from, date_to)
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT snapshot_date, role_type, final_score, feedback_score, velocity_score, engagement_score "
+                f"FROM person_scores WHERE name = ? AND {where} "
+                "ORDER BY snapshot_date, role_type = 'Hiring Manager'",
+                [name, *params],
+            ).fetchall()
+        return [
+            {
+                "date": date,
+                "final_score": _number(final),
+                "feedback_score": _number(feedback),
+                "velocity_score": _number(velocity),
+                "engagement_score": _number(engagement),
+                "role_type": "hm" if role == "Hiring Manager" else "recruiter",
+            }
+            for date, role, final, feedback, velocity, engagement in rows
+        ]
+
+
+def open_store(path, seed_json=None, **tiers):
+    """A HistoryStore at `path`; an empty store is seeded from `seed_json` if it exists"""
+    store = HistoryStore(path, **tiers)
+    if seed_json is not None and os.path.exists(seed_json) and store.is_empty():
+        with open(seed_json) as f:
+            store.import_json(json.load(f))
+    return store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the historical snapshot store")
+    parser.add_argument("--store", default=".history.sqlite", help="SQLite store")
+    parser.add_argument("--import", dest="import_json", help="historical JSON document to append")
+    parser.add_argument("--export", dest="export_json", help="write the store back out as historical JSON")
+    parser.add_argument("--daily-days", type=int, default=30)
+    parser.add_argument("--weekly-days", type=int, default=180)
+    parser.add_argument("--retention-days", type=int)
+    args = parser.parse_args()
+
+    store = HistoryStore(args.store, args.daily_days, args.weekly_days, args.retention_days)
+    if args.import_json:
+        with open(args.import_json) as f:
+            store.import_json(json.load(f))
+    else:
+        store.compact()
+    if args.export_json:
+        with open(args.export_json, "w") as f:
+            json.dump(store.snapshots(), f, indent=2)
+    print(f"✓ {len(store.org_series())} snapshots in {args.store}")
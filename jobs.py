@@ -0,0 +1,228 @@
+"""
+jobs.py — scoring jobs for uploaded ATS exports
+
+POST /api/datasets streams an upload into its own directory under the
+datasets dir and queues run_scoring_job() on the scoring process pool:
+
+  <datasets>/<job id>/export.csv   — the uploaded export
+  <datasets>/<job id>/job.json     — job state, rewritten as the job advances
+  <datasets>/active.json           — dataset id -> the upload it currently serves
+
+Finished jobs whose export no dataset serves any more (superseded or
+failed uploads) are removed by prune_jobs() once they are older than the
+retention period, together with their entries in the shared store.
+
+Job state lives on disk (not in the API process) so every uvicorn worker
+can answer /api/jobs/{id}, and the pool process can report progress
+without a channel back to the parent:
+
+  status         queued -> running -> done | failed
+  stage          parsing -> scoring -> storing
+  rows_parsed    rows read from the CSV so far
+  metrics_done   scoring metrics finished (of metrics_total)
+  elapsed        seconds since the job started (computed on read)
+"""
+
+import fcntl
+import json
+import os
+import shutil
+import time
+import uuid
+
+from snapshot import build_snapshot, export_version, materialize_snapshot, pa, read_export, store_path
+
+EXPORT_NAME = "export.csv"
+DEFAULT_DATASET = "default"
+
+
+def _write_json(path, content):
+    """Atomically replace a small JSON file"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(content, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+# ── Job state ──────────────────────────────────────────────────────────────────
+def create_job(datasets_dir, filename=None, dataset=DEFAULT_DATASET):
+    """Create a queued job and its directory; returns the job state"""
+    job_id = uuid.uuid4().hex[:12]
+    job_dir = os.path.join(datasets_dir, job_id)
+    os.makedirs(job_dir)
+    state = {
+        "id": job_id,
+        "dataset": dataset,
+        "status": "queued",
+        "stage": None,
+        "filename": filename,
+        "bytes": 0,
+        "rows_parsed": 0,
+        "metrics_done": 0,
+        "metrics_total": None,
+        "version": None,
+        "error": None,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+    }
+    _write_json(os.path.join(job_dir, "job.json"), state)
+    return state
+
+
+def job_dir(datasets_dir, job_id):
+    return os.path.join(datasets_dir, job_id)
+
+
+def export_path(datasets_dir, job_id):
+    return os.path.join(datasets_dir, job_id, EXPORT_NAME)
+
+
+def update_job(directory, **fields):
+    """Merge `fields` into a job's state file"""
+    path = os.path.join(directory, "job.json")
+    state = _read_json(path) or {}
+    state.update(fields)
+    _write_json(path, state)
+    return state
+
+
+def read_job(datasets_dir, job_id):
+    """Job state with `elapsed` filled in, or None for an unknown id"""
+    if not job_id.isalnum():
+        return None
+    state = _read_json(os.path.join(datasets_dir, job_id, "job.json"))
+    if state is None:
+        return None
+    if state["started_at"] is not None:
+        end = state["finished_at"] or time.time()
+        state["elapsed"] = round(end - state["started_at"], 3)
+    else:
+        state["elapsed"] = None
+    return state
+
+
+# ── Pool entry point ───────────────────────────────────────────────────────────
+def run_scoring_job(directory, store=None):
+    """
+    Parse and score an uploaded export, reporting progress to job.json.
+
+    With a shared Arrow store the snapshot is written there and its
+    directory returned (the API maps it); without one the snapshot itself
+    is returned to the API process. The job is marked done by the caller
+    once the snapshot is live.
+    """
+    path = os.path.join(directory, EXPORT_NAME)
+    version = export_version(path)
+    update_job(directory, status="running", stage="parsing", started_at=time.time(), version=version)
+
+    try:
+        start = time.perf_counter()
+        df = read_export(path, on_rows=lambda rows: update_job(directory, rows_parsed=rows))
+        read_seconds = time.perf_counter() - start
+
+        def on_metric(metric, done, total):
+            update_job(directory, metrics_done=done, metrics_total=total)
+
+        def build():
+            snapshot = build_snapshot(df, version, progress=on_metric)
+            snapshot["timings"]["read_csv"] = read_seconds
+            update_job(directory, stage="storing")
+            return snapshot
+
+        update_job(directory, stage="scoring", rows_parsed=len(df))
+        if store is None or pa is None:
+            return build()
+
+        return materialize_snapshot(path, version, store, build=build)
+    except Exception as exc:
+        update_job(directory, status="failed", error=f"{type(exc).__name__}: {exc}", finished_at=time.time())
+        raise
+
+
+# ── Active datasets ────────────────────────────────────────────────────────────
+_active_cache = {"mtime": None, "paths": {}}
+
+
+def valid_dataset(name):
+    """Dataset ids are short names: letters, digits, '-' and '_'"""
+    return bool(name) and len(name) <= 64 and name.replace("-", "").replace("_", "").isalnum()
+
+
+def activate(datasets_dir, job_id, dataset=DEFAULT_DATASET):
+    """Point `dataset` at a finished job's export"""
+    path = os.path.join(datasets_dir, "active.json")
+    with open(f"{path}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        active = _read_json(path) or {}
+        active[dataset] = {
+            "id": job_id,
+            "path": export_path(datasets_dir, job_id),
+            "activated_at": time.time(),
+        }
+        _write_json(path, active)
+
+
+def active_exports(datasets_dir):
+    """dataset -> export path of its activated upload"""
+    active = os.path.join(datasets_dir, "active.json")
+    try:
+        mtime = os.stat(active).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if _active_cache["mtime"] != mtime:
+        state = _read_json(active) or {}
+        _active_cache["paths"] = {
+            name: entry["path"] for name, entry in state.items() if os.path.exists(entry["path"])
+        }
+        _active_cache["mtime"] = mtime
+    return _active_cache["paths"]
+
+
+def active_export(datasets_dir, dataset=DEFAULT_DATASET, default=None):
+    """Export path of the upload activated for `dataset`, else `default`"""
+    return active_exports(datasets_dir).get(dataset, default)
+
+
+# ── Retention ──────────────────────────────────────────────────────────────────
+def prune_jobs(datasets_dir, max_age, store=None, now=None):
+    """
+    Remove finished jobs older than `max_age` seconds whose export is not
+    active for any dataset, and their shared store entries. Queued and
+    running jobs are kept. Returns the removed job ids.
+    """
+    now = time.time() if now is None else now
+    active = _read_json(os.path.join(datasets_dir, "active.json")) or {}
+    serving = {entry["id"] for entry in active.values()}
+    removed = []
+    try:
+        names = os.listdir(datasets_dir)
+    except FileNotFoundError:
+        return removed
+    for job_id in names:
+        directory = os.path.join(datasets_dir, job_id)
+        if job_id in serving or not job_id.isalnum() or not os.path.isdir(directory):
+            continue
+        state = _read_json(os.path.join(directory, "job.json"))
+        if state is not None and state.get("status") not in ("done", "failed"):
+            continue
+        finished = (state or {}).get("finished_at") or os.stat(directory).st_mtime
+        if now - finished < max_age:
+            continue
+        if store is not None:
+            # Every version of this export lives under one store directory (plus its lock)
+            stored = os.path.dirname(store_path(store, export_path(datasets_dir, job_id), "-"))
+            shutil.rmtree(stored, ignore_errors=True)
+            if os.path.exists(f"{stored}.lock"):
+                os.remove(f"{stored}.lock")
+        shutil.rmtree(directory, ignore_errors=True)
+        removed.append(job_id)
+    return removed
@@ -0,0 +1,189 @@
+"""
+Load test: /api/health latency while the API is busy scoring
+
+Starts api.py under a local uvicorn against an enlarged copy of
+sample_ats_export.csv, then measures /api/health latency twice:
+
+  1. idle     — nothing else running
+  2. loaded   — dashboard clients hammering the API while the export is
+                touched every few seconds, forcing fresh snapshot builds
+
+Scoring runs on the process pool and concurrent requests for the same
+export version share one build, so the health check should stay flat.
+
+Usage:
+    python load_test.py
+    python load_test.py --copies 80 --clients 32 --duration 20
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_export(path, copies):
+    """Write `copies` replicas of the sample export with distinct requisition ids"""
+    sample = pd.read_csv(os.path.join(BASE_DIR, "sample_ats_export.csv"))
+    frames = []
+    for i in range(copies):
+        frame = sample.copy()
+        frame["requisition_id"] = frame["requisition_id"] + f"-{i}"
+        frames.append(frame)
+    export = pd.concat(frames, ignore_index=True)
+    export.to_csv(path, index=False)
+    return export
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(export_path, port, workers=1):
+    env = dict(os.environ, HIREIQ_ATS_EXPORT=export_path)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=BASE_DIR, env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/health")
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("API did not start")
+
+
+def percentile(values, pct):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def get(conn, path):
+    """GET `path` on a keep-alive connection; returns (status, seconds)"""
+    start = time.perf_counter()
+    conn.request("GET", urllib.parse.quote(path, safe="/?=&,"))
+    response = conn.getresponse()
+    response.read()
+    return response.status, time.perf_counter() - start
+
+
+def probe_health(port, stop, interval=0.02):
+    """Hit /api/health until `stop` is set; returns latencies in ms"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies = []
+    while not stop.is_set():
+        _, seconds = get(conn, "/api/health")
+        latencies.append(seconds * 1000)
+        time.sleep(interval)
+    return latencies
+
+
+def dashboard_client(port, paths, stop, counts):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    i = 0
+    while not stop.is_set():
+        status, _ = get(conn, paths[i % len(paths)])
+        counts[status] = counts.get(status, 0) + 1
+        i += 1
+
+
+def toucher(path, stop, every):
+    """Bump the export's mtime so the API has to rescore it"""
+    while not stop.wait(every):
+        os.utime(path)
+
+
+def run_phase(port, duration, clients=0, paths=(), export_path=None, touch_every=None):
+    stop = threading.Event()
+    result = {}
+    counts = {}
+
+    probe = threading.Thread(target=lambda: result.setdefault("health", probe_health(port, stop)))
+    workers = [threading.Thread(target=dashboard_client, args=(port, paths, stop, counts)) for _ in range(clients)]
+    if touch_every:
+        workers.append(threading.Thread(target=toucher, args=(export_path, stop, touch_every)))
+
+    for thread in [probe, *workers]:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in [probe, *workers]:
+        thread.join()
+
+    return result["health"], counts
+
+
+def report(label, latencies):
+    print(
+        f"{label:<8} n={len(latencies):<5} p50={percentile(latencies, 50):7.2f}ms "
+        f"p95={percentile(latencies, 95):7.2f}ms p99={percentile(latencies, 99):7.2f}ms "
+        f"max={max(latencies):7.2f}ms mean={statistics.mean(latencies):7.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=40, help="replicas of the sample export to score")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent dashboard clients")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per phase")
+    parser.add_argument("--touch-every", type=float, default=2, help="seconds between forced rescoring")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export_path = os.path.join(tmp, "ats_export.csv")
+        export = make_export(export_path, args.copies)
+        print(f"Export: {len(export)} rows, {export['requisition_id'].nunique()} requisitions")
+
+        recruiters = export["recruiter_name"].unique()
+        hms = export["hiring_manager_name"].unique()
+        paths = (
+            [f"/api/dashboard/{name}" for name in recruiters]
+            + [f"/api/dashboard/{name}?role_type=hm" for name in hms]
+            + ["/api/scores", "/api/departments", "/api/roles?limit=50"]
+        )
+
+        port = free_port()
+        server = start_server(export_path, port)
+        try:
+            # Warm the first snapshot so the idle phase measures the steady state
+            get(http.client.HTTPConnection("127.0.0.1", port, timeout=120), "/api/org")
+
+            idle, _ = run_phase(port, args.duration)
+            loaded, counts = run_phase(
+                port, args.duration, args.clients, paths, export_path, args.touch_every,
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"\n/api/health latency ({args.clients} dashboard clients, rescoring every {args.touch_every}s)")
+    report("idle", idle)
+    report("loaded", loaded)
+    total = sum(counts.values())
+    print(f"\nDashboard requests: {total} ({total / args.duration:.0f} req/s), status counts {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Load test: per-endpoint latency SLOs and the saturation point of api.py
+
+Serves a generated export (synthetic_data.py, fully offline) with api.py,
+either under a local uvicorn or in this process, and replays a dashboard
+traffic mix at increasing concurrency:
+
+  /api/scores                30%
+  /api/scores/{name}         25%
+  /api/violations/{name}     25%
+  /api/historical/{name}     10%   (names from historical_performance_data.json)
+  /api/departments           10%
+
+Each level runs for --duration seconds with N closed-loop clients (one
+keep-alive connection each, no think time). Per level it reports
+throughput and, per endpoint, p50 / p95 / p99 and errors against the SLO.
+
+The saturation point is the last level whose throughput still grew by at
+least --min-gain over the previous one; past it, added clients only queue.
+With --gate-concurrency C the exit status is 1 unless every endpoint
+meets its SLO with no errors at concurrency C, so releases can be gated
+on it. Results are also written as JSON (--out).
+
+--in-process serves the app from a thread of this process: no subprocess,
+but clients and server share one GIL, so absolute numbers are lower.
+
+Usage:
+    python load_test_slo.py
+    python load_test_slo.py --rows 5000 --levels 1,4,16,64 --duration 15 --workers 2
+    python load_test_slo.py --gate-concurrency 16 --slo-p95 250 --slo-p99 800
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from load_test import BASE_DIR, free_port, get, percentile, start_server
+from synthetic_data import SHAPES, generate_export
+
+MIX = [
+    # (endpoint template, weight)
+    ("/api/scores", 30),
+    ("/api/scores/{name}", 25),
+    ("/api/violations/{name}", 25),
+    ("/api/historical/{name}", 10),
+    ("/api/departments", 10),
+]
+
+
+def historical_names():
+    with open(os.path.join(BASE_DIR, "historical_performance_data.json")) as f:
+        snapshots = json.load(f)["snapshots"]
+    latest = snapshots[-1]
+    return [p["name"] for p in latest.get("recruiters", []) + latest.get("hiring_managers", [])]
+
+
+def request_plan(export, seed, count=5000):
+    """A fixed, seeded sequence of (endpoint template, path) for one client"""
+    rng = random.Random(seed)
+    recruiters = list(export["recruiter_name"].unique())
+    hms = list(export["hiring_manager_name"].unique())
+    historical = historical_names()
+    templates = [t for t, _ in MIX]
+    weights = [w for _, w in MIX]
+
+    plan = []
+    for template in rng.choices(templates, weights, k=count):
+        if template == "/api/scores/{name}":
+            path = f"/api/scores/{rng.choice(recruiters)}"
+        elif template == "/api/violations/{name}":
+            if rng.random() < 0.5:
+                path = f"/api/violations/{rng.choice(recruiters)}"
+            else:
+                path = f"/api/violations/{rng.choice(hms)}?role_type=hm"
+        elif template == "/api/historical/{name}":
+            path = f"/api/historical/{rng.choice(historical)}"
+        else:
+            path = template
+        plan.append((template, path))
+    return plan
+
+
+def client(port, plan, stop, samples):
+    """Closed-loop client: next request as soon as the last one returns"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    i = 0
+    while not stop.is_set():
+        template, path = plan[i % len(plan)]
+        try:
+            status, seconds = get(conn, path)
+        except OSError:
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            status, seconds = 0, 0.0
+        if not stop.is_set():
+            samples.append((template, status, seconds * 1000))
+        i += 1
+    conn.close()
+
+
+def run_level(port, plans, concurrency, duration):
+    stop = threading.Event()
+    samples = []  # list.append is atomic; one list shared by all clients
+    threads = [
+        threading.Thread(target=client, args=(port, plans[i % len(plans)], stop, samples))
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def summarize(samples, concurrency, duration, slo_p95, slo_p99):
+    endpoints = {}
+    for template, _ in MIX:
+        latencies = [ms for t, status, ms in samples if t == template and 200 <= status < 300]
+        errors = sum(1 for t, status, _ in samples if t == template and not 200 <= status < 300)
+        p95, p99 = percentile(latencies, 95), percentile(latencies, 99)
+        endpoints[template] = {
+            "requests": len(latencies) + errors,
+            "errors": errors,
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(p95, 2),
+            "p99_ms": round(p99, 2),
+            "slo_ok": bool(latencies) and errors == 0 and p95 <= slo_p95 and p99 <= slo_p99,
+        }
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / duration, 1),
+        "errors": sum(e["errors"] for e in endpoints.values()),
+        "slo_ok": all(e["slo_ok"] for e in endpoints.values()),
+        "endpoints": endpoints,
+    }
+
+
+def saturation_point(levels, min_gain):
+    """The last level whose throughput grew by at least min_gain over the previous one"""
+    best = levels[0]
+    for previous, level in zip(levels, levels[1:]):
+        if level["throughput_rps"] < previous["throughput_rps"] * (1 + min_gain):
+            break
+        best = level
+    return best
+
+
+def report(level):
+    flag = "ok" if level["slo_ok"] else "SLO MISS"
+    print(f"\nconcurrency {level['concurrency']:>4}: {level['throughput_rps']:>8.1f} req/s, "
+          f"{level['requests']} requests, {level['errors']} errors  [{flag}]")
+    for template, e in level["endpoints"].items():
+        print(f"  {template:<26} n={e['requests']:<6} p50={e['p50_ms']:8.2f}ms p95={e['p95_ms']:8.2f}ms "
+              f"p99={e['p99_ms']:8.2f}ms errors={e['errors']}{'' if e['slo_ok'] else '  <- SLO'}")
+
+
+def serve_in_process(export_path, port):
+    """Run api.py's app with uvicorn on a thread of this process"""
+    os.environ["HIREIQ_ATS_EXPORT"] = export_path
+    import uvicorn
+    import api  # reads HIREIQ_ATS_EXPORT at import
+
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 30
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("API did not start")
+        time.sleep(0.05)
+
+    def shutdown():
+        server.should_exit = True
+        thread.join()
+    return shutdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=3000, help="rows in the generated export")
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="balanced", help="synthetic_data shape")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per level")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--in-process", action="store_true", help="serve from this process instead of uvicorn")
+    parser.add_argument("--slo-p95", type=float, default=200, help="p95 latency SLO per endpoint (ms)")
+    parser.add_argument("--slo-p99", type=float, default=500, help="p99 latency SLO per endpoint (ms)")
+    parser.add_argument("--min-gain", type=float, default=0.10,
+                        help="throughput gain per level below which the API counts as saturated")
+    parser.add_argument("--gate-concurrency", type=int, help="exit 1 unless every SLO holds at this level")
+    parser.add_argument("--out", default="load_test_slo.json", help="results file")
+    args = parser.parse_args()
+
+    levels = sorted({int(c) for c in args.levels.split(",") if c})
+    if args.gate_concurrency and args.gate_concurrency not in levels:
+        levels = sorted({*levels, args.gate_concurrency})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export_path = os.path.join(tmp, "ats_export.csv")
+        export = generate_export(args.rows, args.shape, args.seed)
+        export.to_csv(export_path, index=False)
+        print(f"Export: {len(export)} rows ({args.shape}), {export['requisition_id'].nunique()} requisitions")
+        plans = [request_plan(export, args.seed + i) for i in range(8)]
+
+        port = free_port()
+        if args.in_process:
+            shutdown = serve_in_process(export_path, port)
+        else:
+            server = start_server(export_path, port, args.workers)
+            shutdown = lambda: (server.terminate(), server.wait())
+        try:
+            # Score the export before measuring, on every worker as far as we can tell
+            warm = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+            for _ in range(args.workers * 4):
+                get(warm, "/api/org")
+            results = []
+            for concurrency in levels:
+                samples = run_level(port, plans, concurrency, args.duration)
+                results.append(summarize(samples, concurrency, args.duration, args.slo_p95, args.slo_p99))
+                report(results[-1])
+        finally:
+            shutdown()
+
+    saturated = saturation_point(results, args.min_gain)
+    within_slo = [r["concurrency"] for r in results if r["slo_ok"]]
+    print(f"\nSaturation: ~{saturated['throughput_rps']:.0f} req/s at {saturated['concurrency']} clients")
+    print(f"Highest concurrency meeting SLO (p95 ≤ {args.slo_p95:g}ms, p99 ≤ {args.slo_p99:g}ms): "
+          f"{max(within_slo) if within_slo else 'none'}")
+
+    with open(args.out, "w") as f:
+        json.dump({
+            "export": {"rows": args.rows, "shape": args.shape, "seed": args.seed},
+            "server": {"mode": "in-process" if args.in_process else "uvicorn", "workers": args.workers},
+            "slo": {"p95_ms": args.slo_p95, "p99_ms": args.slo_p99},
+            "levels": results,
+            "saturation": {"concurrency": saturated["concurrency"], "throughput_rps": saturated["throughput_rps"]},
+            "max_concurrency_within_slo": max(within_slo) if within_slo else None,
+        }, f, indent=2)
+    print(f"✓ Results written to {args.out}")
+
+    if args.gate_concurrency:
+        gate = next(r for r in results if r["concurrency"] == args.gate_concurrency)
+        if not gate["slo_ok"]:
+            print(f"✗ SLO not met at {args.gate_concurrency} clients")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+metrics.py — in-process instrumentation for api.py
+
+Histograms and gauges rendered in the Prometheus text format at
+/api/metrics, plus per-request stage timings reported to clients in a
+`Server-Timing` header:
+
+  hireiq_scoring_stage_seconds{stage}      — read_csv, prepare_data, each metric,
+                                             per-person scoring, indexes, map_snapshot
+  hireiq_request_seconds{method,route,status}
+  hireiq_serialize_seconds{step}           — records (frame_to_records) / encode (JSON)
+  hireiq_snapshot_rows{dataset,table}      — rows and violations in the served snapshot
+  hireiq_snapshot_cache_events_total{event}, hireiq_snapshot_cache_bytes
+
+Scoring runs in pool processes, so build timings travel back inside the
+snapshot (snapshot["timings"]) and are observed here, in the API process.
+Each uvicorn worker keeps its own registry; scrape them per worker.
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+
+from starlette.datastructures import MutableHeaders
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# ── Metric types ───────────────────────────────────────────────────────────────
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}   # label values -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {k: (list(v[0]), v[1], v[2]) for k, v in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, ('le', _number(bound)))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total!r}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Gauge:
+    """Last-set values; kind='counter' for monotonic totals mirrored from elsewhere"""
+
+    def __init__(self, name, help, labelnames=(), kind="gauge"):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+        self._values = {}
+
+    def set(self, value, **labels):
+        self._values[tuple(str(labels.get(n, "")) for n in self.labelnames)] = value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {_number(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, help, labelnames=(), kind="gauge"):
+        metric = Gauge(name, help, labelnames, kind)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "hireiq_scoring_stage_seconds", "Wall time of each snapshot build stage", ["stage"],
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "hireiq_request_seconds", "API request latency to the first response byte", ["method", "route", "status"],
+)
+SERIALIZE_SECONDS = REGISTRY.histogram(
+    "hireiq_serialize_seconds", "Response serialization time", ["step"],
+)
+SNAPSHOT_ROWS = REGISTRY.gauge(
+    "hireiq_snapshot_rows", "Rows in the most recently built snapshot, per table", ["dataset", "table"],
+)
+CACHE_EVENTS = REGISTRY.gauge(
+    "hireiq_snapshot_cache_events_total", "Snapshot cache hits / misses / evictions / rehydrations", ["event"],
+    kind="counter",
+)
+CACHE_BYTES = REGISTRY.gauge(
+    "hireiq_snapshot_cache_bytes", "Bytes held by cached snapshots",
+)
+
+
+# ── Per-request timings (Server-Timing) ────────────────────────────────────────
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def record_timing(name, seconds):
+    """Add `seconds` to the current request's Server-Timing entry `name`"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+class timed:
+    """Context manager: time a block into a histogram and the Server-Timing header"""
+
+    def __init__(self, name, histogram=None, **labels):
+        self.name = name
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        record_timing(self.name, seconds)
+        if self.histogram is not None:
+            self.histogram.observe(seconds, **self.labels)
+        return False
+
+
+class TimingMiddleware:
+    """
+    Times every HTTP request: adds `Server-Timing` (total plus the stages
+    recorded while handling it) and observes hireiq_request_seconds under
+    the matched route template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = {}
+        token = _request_timings.set(timings)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                total = time.perf_counter() - start
+                entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items()]
+                entries.append(f"total;dur={total * 1000:.2f}")
+                MutableHeaders(raw=message["headers"])["Server-Timing"] = ", ".join(entries)
+                route = scope.get("route")
+                REQUEST_SECONDS.observe(
+                    total, method=scope["method"], route=getattr(route, "path", "unmatched"), status=message["status"],
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
@@ -0,0 +1,127 @@
+"""
+profiling.py — profile one ScorecardEngine run on an ATS export
+
+Scores an export with ScorecardEngine(df, profile=True) and packages the
+result as a zip artifact:
+
+  summary.json      — data shape, violation count, and per stage: wall time,
+                      tracemalloc peak and the top functions by cumulative time
+  report.txt        — pstats listing (top 25 by cumulative time) per stage
+  <stage>.pstats    — raw cProfile stats, loadable with `python -m pstats`
+                      or snakeviz
+
+Stages are the engine's timed stages: read_csv, prepare_data, each metric
+(feedback_timeliness, stage_velocity, hm_engagement) and the per-person
+scoring (score_by_recruiter, score_by_hiring_manager). The data shape lists
+the largest requisitions, which is usually where a pathological export
+(e.g. one requisition with 50k candidates) shows up.
+
+Usage:
+    python profiling.py --export big_export.csv --out profile.zip
+    python -m pstats <unzipped>/feedback_timeliness.pstats
+
+api.py serves the same artifact at GET /api/admin/profile.
+"""
+
+import argparse
+import io
+import json
+import marshal
+import pstats
+import time
+import tracemalloc
+import zipfile
+
+import pandas as pd
+
+from scoring_engine import ScorecardEngine
+
+TOP_FUNCTIONS = 10
+
+
+def data_shape(df):
+    """Size and skew of an export: the numbers that make scoring slow"""
+    per_req = df.groupby("requisition_id").size().sort_values(ascending=False)
+    return {
+        "rows": len(df),
+        "columns": len(df.columns),
+        "requisitions": int(per_req.size),
+        "recruiters": int(df["recruiter_name"].nunique()),
+        "hiring_managers": int(df["hiring_manager_name"].nunique()),
+        "rows_per_requisition_max": int(per_req.iloc[0]) if len(per_req) else 0,
+        "rows_per_requisition_median": float(per_req.median()) if len(per_req) else 0.0,
+        "largest_requisitions": {str(k): int(v) for k, v in per_req.head(5).items()},
+    }
+
+
+def _top_functions(stats, limit=TOP_FUNCTIONS):
+    rows = []
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        })
+    rows.sort(key=lambda r: -r["cumtime"])
+    return rows[:limit]
+
+
+def profile_export(path):
+    """Profile a full scoring run of the export at `path`; returns the zip artifact as bytes"""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        df = pd.read_csv(path)
+        read_seconds = time.perf_counter() - start
+        read_peak = tracemalloc.get_traced_memory()[1]
+
+        engine = ScorecardEngine(df, profile=True)
+        violations = engine.calculate_scores()
+        engine.score_by_recruiter(violations)
+        engine.score_by_hiring_manager(violations)
+    finally:
+        tracemalloc.stop()
+
+    stages = [{"stage": "read_csv", "seconds": round(read_seconds, 6), "peak_bytes": read_peak, "top": []}]
+    report = io.StringIO()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as artifact:
+        for stage, captured in engine.profiles.items():
+            stats = pstats.Stats(captured["profile"], stream=report)
+            report.write(f"\n{'=' * 78}\n{stage}: {engine.timings[stage]:.3f}s, "
+                         f"peak {captured['peak_bytes'] / 2**20:.1f} MiB\n{'=' * 78}\n")
+            stats.sort_stats("cumulative").print_stats(25)
+            artifact.writestr(f"{stage}.pstats", marshal.dumps(stats.stats))
+            stages.append({
+                "stage": stage,
+                "seconds": round(engine.timings[stage], 6),
+                "peak_bytes": captured["peak_bytes"],
+                "top": _top_functions(stats),
+            })
+
+        summary = {
+            "export": str(path),
+            "shape": data_shape(df),
+            "violations": len(violations),
+            "stages": stages,
+        }
+        artifact.writestr("summary.json", json.dumps(summary, indent=2))
+        artifact.writestr("report.txt", report.getvalue())
+    return buffer.getvalue()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile one ScorecardEngine run on an ATS export")
+    parser.add_argument("--export", default="sample_ats_export.csv", help="ATS export CSV")
+    parser.add_argument("--out", default="profile.zip", help="artifact to write")
+    args = parser.parse_args()
+
+    artifact = profile_export(args.export)
+    with open(args.out, "wb") as f:
+        f.write(artifact)
+    with zipfile.ZipFile(args.out) as z:
+        summary = json.loads(z.read("summary.json"))
+    for stage in summary["stages"]:
+        print(f"  {stage['stage']:<26}{stage['seconds']:>9.3f}s  peak {stage['peak_bytes'] / 2**20:>8.1f} MiB")
+    print(f"✓ Profile written to {args.out}")
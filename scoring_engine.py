@@ -3,10 +3,58 @@ Recruiter Scorecard Scoring Engine
 Implements the three-metric scoring system with severity-based penalties
 """
 
+import cProfile
+import functools
+import time
+import tracemalloc
+
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+
+def timed_stage(stage):
+    """
+    Method decorator: add the call's wall time (seconds) to self.timings[stage].
+    On a profiling engine, also capture a cProfile profile and the tracemalloc
+    peak for the call in self.profiles[stage].
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.profiles is not None:
+                return _profiled_call(self, stage, method, args, kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.timings[stage] = self.timings.get(stage, 0.0) + time.perf_counter() - start
+        return wrapper
+    return decorate
+
+
+def _profiled_call(engine, stage, method, args, kwargs):
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        return method(engine, *args, **kwargs)
+    finally:
+        profiler.disable()
+        engine.timings[stage] = engine.timings.get(stage, 0.0) + time.perf_counter() - start
+        engine.profiles[stage] = {
+            'profile': profiler,
+            'peak_bytes': tracemalloc.get_traced_memory()[1] - baseline,
+        }
+        if not tracing:
+            tracemalloc.stop()
+
+
 class ScorecardEngine:
     """
     Scoring engine for recruiter and hiring manager performance
@@ -31,11 +79,18 @@ class ScorecardEngine:
         'high': -25
     }
     
-    def __init__(self, df):
-        """Initialize with ATS export dataframe"""
+    def __init__(self, df, profile=False):
+        """
+        Initialize with ATS export dataframe
+        profile: capture cProfile + tracemalloc peak per stage in self.profiles
+                 (slow; for diagnosing pathological exports, see profiling.py)
+        """
         self.df = df.copy()
+        self.timings = {}   # stage -> seconds, filled by @timed_stage
+        self.profiles = {} if profile else None
         self._prepare_data()
     
+    @timed_stage('prepare_data')
     def _prepare_data(self):
         """Parse dates and prepare data for scoring"""
         date_columns = ['stage_entered_date', 'interview_completed_date', 'feedback_submitted_date']
@@ -45,6 +100,7 @@ class ScorecardEngine:
         
         self.df['role_opened_date'] = pd.to_datetime(self.df['role_opened_date'])
     
+    @timed_stage('feedback_timeliness')
     def calculate_feedback_timeliness(self):
         """
         Metric 1: Interview Feedback Timeliness
@@ -88,6 +144,7 @@ class ScorecardEngine:
                 'severity': severity,
                 'penalty': penalty,
                 'delay_hours': delay_hours,
+                'event_date': row['feedback_submitted_date'],
                 'recruiter_name': row['recruiter_name'],
                 'hiring_manager_name': row['hiring_manager_name'],
                 'is_hm_interview': row['is_hiring_manager_interview'],
@@ -108,6 +165,7 @@ class ScorecardEngine:
                 'severity': 'high',
                 'penalty': self.PENALTIES['high'],
                 'delay_hours': 999,  # Marker for missing
+                'event_date': row['interview_completed_date'],
                 'recruiter_name': row['recruiter_name'],
                 'hiring_manager_name': row['hiring_manager_name'],
                 'is_hm_interview': row['is_hiring_manager_interview'],
@@ -116,6 +174,7 @@ class ScorecardEngine:
         
         return pd.DataFrame(violations)
     
+    @timed_stage('stage_velocity')
     def calculate_stage_velocity(self):
         """
         Metric 2: Stage Progression Velocity
@@ -169,6 +228,7 @@ class ScorecardEngine:
                         'severity': severity,
                         'penalty': penalty,
                         'days_in_stage': days_in_stage,
+                        'event_date': next_stage_entered,
                         'recruiter_name': recruiter,
                         'hiring_manager_name': hm,
                         'responsible_party': recruiter  # Primary ownership with recruiter
@@ -176,6 +236,7 @@ class ScorecardEngine:
         
         return pd.DataFrame(violations)
     
+    @timed_stage('hm_engagement')
     def calculate_hm_engagement(self):
         """
         Metric 3: Hiring Manager Engagement
@@ -206,11 +267,16 @@ class ScorecardEngine:
             ])
             
             delayed_feedback = 0
+            issue_dates = list(hm_interviews[
+                (hm_interviews['interview_completed_date'].notna()) &
+                (hm_interviews['feedback_submitted_date'].isna())
+            ]['interview_completed_date'])
             for _, interview in hm_interviews.iterrows():
                 if pd.notna(interview['interview_completed_date']) and pd.notna(interview['feedback_submitted_date']):
                     delay_hours = (interview['feedback_submitted_date'] - interview['interview_completed_date']).total_seconds() / 3600
                     if delay_hours > 72:
                         delayed_feedback += 1
+                        issue_dates.append(interview['feedback_submitted_date'])
             
             total_issues = missing_feedback + delayed_feedback
             
@@ -234,6 +300,7 @@ class ScorecardEngine:
                     'penalty': penalty,
                     'missing_feedback_count': missing_feedback,
                     'delayed_feedback_count': delayed_feedback,
+                    'event_date': max(issue_dates),  # Latest issue on the req
                     'recruiter_name': recruiter,
                     'hiring_manager_name': hm,
                     'responsible_party': hm
@@ -241,23 +308,30 @@ class ScorecardEngine:
         
         return pd.DataFrame(violations)
     
-    def calculate_scores(self):
-        """Calculate all violations and compute scores"""
+    def calculate_scores(self, progress=None):
+        """
+        Calculate all violations and compute scores
+        progress: optional callable(metric, done, total), called as each metric finishes
+        """
         
         # Calculate all violations
-        feedback_violations = self.calculate_feedback_timeliness()
-        velocity_violations = self.calculate_stage_velocity()
-        engagement_violations = self.calculate_hm_engagement()
+        calculators = [
+            ('feedback_timeliness', self.calculate_feedback_timeliness),
+            ('stage_velocity', self.calculate_stage_velocity),
+            ('hm_engagement', self.calculate_hm_engagement),
+        ]
+        frames = []
+        for done, (metric, calculate) in enumerate(calculators, 1):
+            frames.append(calculate())
+            if progress is not None:
+                progress(metric, done, len(calculators))
         
         # Combine all violations
-        all_violations = pd.concat([
-            feedback_violations,
-            velocity_violations,
-            engagement_violations
-        ], ignore_index=True)
+        all_violations = pd.concat(frames, ignore_index=True)
         
         return all_violations
-    
+
+    @timed_stage('score_by_recruiter')
     def score_by_recruiter(self, violations_df):
         """Calculate recruiter scores"""
         scores = []
@@ -311,6 +385,7 @@ class ScorecardEngine:
         
         return pd.DataFrame(scores)
     
+    @timed_stage('score_by_hiring_manager')
     def score_by_hiring_manager(self, violations_df):
         """Calculate hiring manager scores"""
         scores = []
@@ -366,7 +441,275 @@ class ScorecardEngine:
         
         return pd.DataFrame(scores)
     
-    def get_org_summary(self, recruiter_scores, hm_scores):
+    def score_deltas(self, violations, recruiter_scores, hm_scores, days=14):
+        """
+        Period-over-period change of every score: now vs `days` before the
+        latest violation, where the prior scores count only the violations
+        dated on or before that cutoff.
+
+        The prior recruiter and HM scores come from one grouped pass over the
+        violations (same formulas as score_by_recruiter / score_by_hiring_manager,
+        without rerunning the metrics or the per-person loops); team and org
+        figures follow from them.
+
+        Returns {'as_of', 'since', 'days',
+                 'recruiters' / 'hiring_managers': DataFrame aligned with the
+                     score table (name, prior_score, score_delta),
+                 'teams': DataFrame (team, prior_avg_score, avg_score_delta),
+                 'org': {org summary key: change}}
+        """
+        if violations.empty:
+            as_of = since = None
+            prior_mask = np.zeros(0, dtype=bool)
+        else:
+            as_of = violations['event_date'].max()
+            since = as_of - pd.Timedelta(days=days)
+            prior_mask = (violations['event_date'] <= since).to_numpy()
+
+        recruiter_prior = self._prior_scores(violations, prior_mask, recruiter_scores, 'recruiter_name')
+        hm_prior = self._prior_scores(violations, prior_mask, hm_scores, 'hiring_manager_name')
+
+        def person_deltas(scores, prior):
+            return pd.DataFrame({
+                'name': scores['name'].to_numpy(),
+                'prior_score': prior['final_score'].to_numpy(),
+                'score_delta': (scores['final_score'] - prior['final_score']).round(1).to_numpy(),
+            })
+
+        current_teams = self._team_averages(recruiter_scores, hm_scores)
+        prior_teams = self._team_averages(recruiter_prior, hm_prior)
+        teams = pd.DataFrame({
+            'team': current_teams.index,
+            'prior_avg_score': prior_teams.to_numpy(),
+            'avg_score_delta': (current_teams - prior_teams).round(1).to_numpy(),
+        })
+
+        current_org = self.get_org_summary(recruiter_scores, hm_scores)
+        prior_org = self.get_org_summary(recruiter_prior, hm_prior)
+        org = {key: round(current_org[key] - prior_org[key], 1) for key in current_org}
+
+        return {
+            'as_of': as_of,
+            'since': since,
+            'days': days,
+            'recruiters': person_deltas(recruiter_scores, recruiter_prior),
+            'hiring_managers': person_deltas(hm_scores, hm_prior),
+            'teams': teams,
+            'org': org,
+        }
+
+    def _prior_scores(self, violations, prior_mask, scores, name_column):
+        """
+        Score table (same rows as `scores`) counting only the violations
+        selected by prior_mask, in one groupby
+        """
+        if violations.empty:
+            sums = pd.DataFrame(columns=self.SUM_COLUMNS, dtype=float)
+        else:
+            sums = self._penalty_facts(violations[prior_mask], name_column).groupby('name', sort=False).sum()
+        return self._scores_from_sums(scores['name'], sums, name_column)
+
+    # Per-person sums that determine a score_by_* row
+    SUM_COLUMNS = ['feedback', 'velocity', 'engagement', 'total_violations',
+                   'high_severity', 'medium_severity', 'low_severity']
+    COUNT_COLUMNS = SUM_COLUMNS[3:]
+
+    # Hours after an interview at which feedback is late (medium) and very late (high)
+    FEEDBACK_HOURS = {'medium': 48, 'high': 72}
+
+    @staticmethod
+    def _penalty_facts(violations, name_column):
+        """
+        Each violation's contribution to its recruiter's or HM's sums
+        (SUM_COLUMNS). Counts come from the severity, or from the rows' own
+        COUNT_COLUMNS when given (score_history's partial steps).
+        """
+        metric = violations['metric']
+        penalty = violations['penalty']
+        own_feedback = (metric == 'feedback_timeliness') & (violations['responsible_party'] == violations[name_column])
+        if 'total_violations' in violations:
+            counts = {column: violations[column] for column in ScorecardEngine.COUNT_COLUMNS}
+        else:
+            severity = violations['severity']
+            counts = {
+                'total_violations': 1,
+                'high_severity': (severity == 'high').astype(int),
+                'medium_severity': (severity == 'medium').astype(int),
+                'low_severity': (severity == 'low').astype(int),
+            }
+        return pd.DataFrame({
+            'name': violations[name_column],
+            'feedback': penalty.where(own_feedback, 0),
+            'velocity': penalty.where(metric == 'stage_velocity', 0),
+            'engagement': penalty.where(metric == 'hm_engagement', 0),
+            **counts,
+        })
+
+    @classmethod
+    def _scores_from_sums(cls, names, sums, name_column):
+        """
+        Score table rows for `names` from their SUM_COLUMNS (missing = no
+        violations), by the score_by_recruiter / score_by_hiring_manager formulas
+        """
+        is_hm = name_column == 'hiring_manager_name'
+        sums = sums.reindex(index=pd.Index(names), columns=cls.SUM_COLUMNS, fill_value=0).fillna(0)
+
+        base_score = 100
+        feedback_score = np.maximum(0, base_score + sums['feedback'].to_numpy())
+        if is_hm:
+            velocity_score = np.maximum(0, base_score + sums['velocity'].to_numpy() * 0.5)  # 50% responsibility
+            engagement_score = np.maximum(0, base_score + sums['engagement'].to_numpy())
+        else:
+            velocity_score = np.maximum(0, base_score + sums['velocity'].to_numpy())
+            engagement_score = np.full(len(sums), base_score)
+
+        final_score = (
+            feedback_score * cls.WEIGHTS['feedback_timeliness'] +
+            velocity_score * cls.WEIGHTS['stage_velocity'] +
+            engagement_score * cls.WEIGHTS['hm_engagement']
+        )
+        counts = {column: sums[column].to_numpy().astype(int) for column in cls.SUM_COLUMNS[3:]}
+        return pd.DataFrame({
+            'name': list(names),
+            'role_type': 'Hiring Manager' if is_hm else 'Recruiter',
+            'final_score': np.round(final_score, 1),
+            'feedback_score': np.round(feedback_score, 1),
+            'velocity_score': np.round(velocity_score, 1),
+            'engagement_score': np.round(engagement_score, 1),
+            **counts,
+        })
+
+    def score_history(self, violations, dates):
+        """
+        Recruiter and HM score tables as of each date (ascending), counting
+        what was a violation by then (see _history_steps); a person appears
+        once they own a requisition opened by that date. Past the last
+        step's date the tables equal score_by_* on all the violations.
+
+        One walk over the steps in date order: each one is added to its
+        recruiter's and HM's running sums once, and every snapshot is
+        scored from the sums, so N dates cost one pass plus N small tables.
+        Yields (date, recruiter_scores, hm_scores).
+        """
+        if violations.empty:
+            dated = None
+            event_dates = np.array([], dtype='datetime64[ns]')
+        else:
+            steps = self._history_steps(violations)
+            dated = steps[steps['event_date'].notna()].sort_values('event_date', kind='stable')
+            event_dates = dated['event_date'].to_numpy(dtype='datetime64[ns]')
+
+        roles = {}
+        for name_column in ('recruiter_name', 'hiring_manager_name'):
+            first_opened = self.df.groupby(name_column, sort=False)['role_opened_date'].min()
+            facts = None if dated is None else self._penalty_facts(dated, name_column)
+            # Integer sums, so the scores keep score_by_*'s int64 columns
+            running = pd.DataFrame(0, index=first_opened.index, columns=self.SUM_COLUMNS, dtype=np.int64)
+            roles[name_column] = (first_opened, facts, running)
+
+        start = 0
+        for date in dates:
+            end = int(np.searchsorted(event_dates, np.datetime64(pd.Timestamp(date), 'ns'), side='right'))
+            tables = []
+            for name_column, (first_opened, facts, running) in roles.items():
+                if end > start:
+                    chunk = facts.iloc[start:end].groupby('name', sort=False).sum()
+                    running.loc[chunk.index, self.SUM_COLUMNS] += chunk[self.SUM_COLUMNS].to_numpy()
+                active = first_opened.index[(first_opened <= pd.Timestamp(date)).to_numpy()]
+                tables.append(self._scores_from_sums(active, running, name_column))
+            start = max(start, end)  # dates are ascending; a repeated date adds nothing
+            yield (date, *tables)
+
+    def _history_steps(self, violations):
+        """
+        The violations as dated changes to the per-person sums, for
+        score_history. A violation's event_date is when the engine saw its
+        evidence; two kinds only become violations later:
+
+          missing feedback — none at the interview; medium once feedback is
+                             FEEDBACK_HOURS['medium'] late, high (the
+                             engine's penalty) once FEEDBACK_HOURS['high'] late
+          hm_engagement    — accrues issue by issue (feedback submitted over
+                             72h late, or missing past 72h), the tiered
+                             penalty applied as the count grows, instead of
+                             all at once on the latest issue's date
+
+        Every other violation is one step on its event_date. Each step
+        carries its penalty and COUNT_COLUMNS deltas; summed over all steps
+        they equal the violation itself.
+        """
+        metric = violations['metric']
+        delay = violations['delay_hours'] if 'delay_hours' in violations else pd.Series(np.nan, index=violations.index)
+        missing = ((metric == 'feedback_timeliness') & (delay == 999)).to_numpy()
+        engagement = (metric == 'hm_engagement').to_numpy()
+
+        def with_counts(rows, total, high, medium, low):
+            return rows.assign(total_violations=total, high_severity=high, medium_severity=medium, low_severity=low)
+
+        single = violations[~missing & ~engagement]
+        severity = single['severity']
+        steps = [with_counts(single, 1, (severity == 'high').astype(int), (severity == 'medium').astype(int),
+                             (severity == 'low').astype(int))]
+
+        late = violations[missing]
+        medium, high = self.PENALTIES['medium'], self.PENALTIES['high']
+        steps.append(with_counts(
+            late.assign(event_date=late['event_date'] + pd.Timedelta(hours=self.FEEDBACK_HOURS['medium']),
+                        penalty=medium),
+            1, 0, 1, 0))
+        steps.append(with_counts(
+            late.assign(event_date=late['event_date'] + pd.Timedelta(hours=self.FEEDBACK_HOURS['high']),
+                        penalty=high - medium),
+            0, 1, -1, 0))
+
+        owners = violations[engagement].drop_duplicates('requisition_id').set_index('requisition_id')
+        if len(owners):
+            hm = self.df[(self.df['is_hiring_manager_interview'] == True).to_numpy()]  # as calculate_hm_engagement
+            completed, submitted = hm['interview_completed_date'], hm['feedback_submitted_date']
+            overdue = completed + pd.Timedelta(hours=self.FEEDBACK_HOURS['high'])
+            delayed = completed.notna() & submitted.notna() & (submitted - completed > pd.Timedelta(hours=72))
+            absent = completed.notna() & submitted.isna()
+            issues = pd.concat([
+                pd.DataFrame({'requisition_id': hm['requisition_id'][absent], 'event_date': overdue[absent]}),
+                pd.DataFrame({'requisition_id': hm['requisition_id'][delayed], 'event_date': submitted[delayed]}),
+            ], ignore_index=True)
+            issues = issues[issues['requisition_id'].isin(owners.index)]
+            issues = issues.sort_values(['requisition_id', 'event_date'], kind='stable')
+            count = issues.groupby('requisition_id', sort=False).cumcount().to_numpy() + 1
+
+            def tier(n):
+                return np.where(n == 0, 0, np.where(n <= 2, medium, high * np.minimum(n, 3)))
+
+            first, third = (count == 1).astype(int), (count == 3).astype(int)
+            accrued = owners.loc[issues['requisition_id'], ['metric', 'severity', 'recruiter_name',
+                                                            'hiring_manager_name', 'responsible_party']]
+            accrued = accrued.reset_index().assign(
+                event_date=issues['event_date'].to_numpy(),
+                penalty=tier(count) - tier(count - 1),
+            )
+            accrued = with_counts(accrued, first, third, first - third, 0)
+            steps.append(accrued[(first | third).astype(bool)])
+
+        return pd.concat(steps, ignore_index=True)
+
+    def _team_averages(self, recruiter_scores, hm_scores):
+        """
+        team -> average score, as /api/departments computes it: the mean of the
+        team's recruiter average and HM average (whichever exists if only one)
+        """
+        return team_averages(self.df, recruiter_scores, hm_scores)
+
+    def score_windows(self, violations):
+        """Scores over any date window (see ScoreWindows)"""
+        return ScoreWindows(violations, self.df)
+
+    def aggregation_cube(self, violations):
+        """Precomputed drill-down / roll-up aggregates (see AggregationCube)"""
+        requisition_team = self.df.drop_duplicates('requisition_id').set_index('requisition_id')['team']
+        return AggregationCube(violations, requisition_team)
+    
+    @staticmethod
+    def get_org_summary(recruiter_scores, hm_scores):
         """Calculate organization-level summary"""
         all_scores = pd.concat([recruiter_scores, hm_scores])
         
@@ -381,6 +724,294 @@ class ScorecardEngine:
         
         return summary
 
+def team_averages(requisitions, recruiter_scores, hm_scores):
+    """
+    team -> average score over the teams in `requisitions` (any frame with
+    team, recruiter_name and hiring_manager_name columns): the mean of the
+    team's recruiter average and HM average (whichever exists if only one)
+    """
+    teams = pd.Index(requisitions['team'].unique(), name='team')
+
+    def average(column, scores):
+        pairs = requisitions[['team', column]].drop_duplicates()
+        finals = pairs[column].map(scores.set_index('name')['final_score'])
+        return finals.groupby(pairs['team'], sort=False).mean().round(1).reindex(teams)
+
+    rec_avg = average('recruiter_name', recruiter_scores)
+    hm_avg = average('hiring_manager_name', hm_scores)
+    return ((rec_avg + hm_avg) / 2).round(1).fillna(rec_avg).fillna(hm_avg)
+
+
+class AggregationCube:
+    """
+    Violation counts and penalty totals for drill-down views
+    (org -> team -> role type -> person -> requisition), sliceable by
+    metric and severity.
+
+    Every supported combination of dimensions is aggregated up front in
+    grouped passes over the violations table, so a lookup is one dict get.
+    Levels without a role type count each violation once; levels with a
+    role type count it against that role's person (every violation has
+    exactly one recruiter and one hiring manager).
+    """
+
+    DIMENSIONS = ('team', 'role_type', 'person', 'requisition_id', 'metric', 'severity')
+
+    # Drill path, plus the cross-team views by role / person / requisition
+    LEVELS = [
+        (),
+        ('team',),
+        ('team', 'role_type'),
+        ('team', 'role_type', 'person'),
+        ('team', 'role_type', 'person', 'requisition_id'),
+        ('role_type',),
+        ('role_type', 'person'),
+        ('requisition_id',),
+    ]
+    SLICERS = [(), ('metric',), ('severity',), ('metric', 'severity')]
+
+    ROLE_COLUMNS = {
+        'Recruiter': 'recruiter_name',
+        'Hiring Manager': 'hiring_manager_name',
+    }
+
+    def __init__(self, violations, requisition_team):
+        """
+        violations: output of ScorecardEngine.calculate_scores()
+        requisition_team: Series mapping requisition_id -> team
+        """
+        self.cells = {}
+        self.children = {}
+        self.requisition_team = requisition_team.to_dict()
+        self.requisition_people = {}
+
+        if violations.empty:
+            return
+
+        by_violation = violations[['requisition_id', 'metric', 'severity', 'penalty']].copy()
+        by_violation['team'] = violations['requisition_id'].map(requisition_team)
+
+        by_role = pd.concat([
+            by_violation.assign(role_type=role, person=violations[column].to_numpy())
+            for role, column in self.ROLE_COLUMNS.items()
+        ], ignore_index=True)
+
+        for req_id, recruiter, hm in zip(violations['requisition_id'], violations['recruiter_name'],
+                                         violations['hiring_manager_name']):
+            self.requisition_people[req_id] = {'Recruiter': recruiter, 'Hiring Manager': hm}
+
+        for level in self.LEVELS:
+            facts = by_role if 'role_type' in level else by_violation
+            for slicer in self.SLICERS:
+                self._aggregate(facts, level + slicer)
+
+        # Drill-down children along the hierarchy, plus the cross-team
+        # role -> person -> requisition path
+        for parent, child in zip(self.LEVELS[:4], self.LEVELS[1:5]):
+            self._link(parent, child)
+        self._link(('role_type',), ('role_type', 'person'))
+        self._link(('role_type', 'person'), self.LEVELS[4])
+
+    def _key(self, **dims):
+        return tuple(dims.get(d) for d in self.DIMENSIONS)
+
+    def _aggregate(self, facts, dims):
+        if not dims:
+            self.cells[self._key()] = (len(facts), int(facts['penalty'].sum()))
+            return
+        grouped = facts.groupby(list(dims), sort=False)['penalty'].agg(['size', 'sum'])
+        for values, count, penalty in zip(grouped.index.tolist(), grouped['size'].tolist(), grouped['sum'].tolist()):
+            if len(dims) == 1:
+                values = (values,)
+            self.cells[self._key(**dict(zip(dims, values)))] = (count, int(penalty))
+
+    def _link(self, parent, child):
+        dim = child[-1]
+        for key in self.cells:
+            present = {d for d, v in zip(self.DIMENSIONS, key) if v is not None}
+            if present == set(child):
+                parent_key = tuple(v if d in parent else None for d, v in zip(self.DIMENSIONS, key))
+                self.children.setdefault(parent_key, []).append(key[self.DIMENSIONS.index(dim)])
+
+    def _normalize(self, team, role_type, person, requisition_id):
+        """A requisition pins its team, and with a role type, its person"""
+        if person is not None and role_type is None:
+            raise ValueError('person requires role_type')
+        if requisition_id is not None:
+            team = self.requisition_team.get(requisition_id, team)
+            if role_type is not None:
+                person = self.requisition_people.get(requisition_id, {}).get(role_type, person)
+            elif team is not None:
+                team = None  # ('requisition_id',) level
+        return team, role_type, person, requisition_id
+
+    def lookup(self, team=None, role_type=None, person=None, requisition_id=None, metric=None, severity=None):
+        """{'violations': count, 'penalty': total} for one cell (zeros if empty)"""
+        team, role_type, person, requisition_id = self._normalize(team, role_type, person, requisition_id)
+        count, penalty = self.cells.get(
+            self._key(team=team, role_type=role_type, person=person,
+                      requisition_id=requisition_id, metric=metric, severity=severity),
+            (0, 0),
+        )
+        return {'violations': count, 'penalty': penalty}
+
+    def drill_down(self, team=None, role_type=None, person=None, requisition_id=None, metric=None, severity=None):
+        """(child dimension, [(value, cell), ...]) one level below the given node"""
+        team, role_type, person, requisition_id = self._normalize(team, role_type, person, requisition_id)
+        parent = self._key(team=team, role_type=role_type, person=person, requisition_id=requisition_id)
+        present = tuple(d for d, v in zip(self.DIMENSIONS, parent) if v is not None)
+        if present in self.LEVELS[:4]:
+            dim = self.LEVELS[self.LEVELS.index(present) + 1][-1]
+        elif present == ('role_type',):
+            dim = 'person'
+        elif present == ('role_type', 'person'):
+            dim = 'requisition_id'
+        else:
+            return None, []
+
+        dims = dict(zip(self.DIMENSIONS, parent))
+        children = []
+        for value in self.children.get(parent, []):
+            dims[dim] = value
+            children.append((value, self.lookup(**{**dims, 'metric': metric, 'severity': severity})))
+        return dim, children
+
+
+class ScoreWindows:
+    """
+    Recruiter, HM, team and org scores over any date window, from prefix sums.
+
+    Every violation's contribution to its recruiter's and HM's SUM_COLUMNS
+    is summed per person per event day. Those daily series are laid out
+    person by person in day order and cumulatively summed once, so the sums
+    of any window for any person are one subtraction of two prefix rows,
+    found by binary search on (person, day): no violation is revisited,
+    however long the window. Only days with violations are stored, so
+    memory grows with the violations, not with people x calendar days.
+
+    A window counts the violations dated on its days; people appear once
+    they own a requisition opened by its last day. Violations without an
+    event date fall in no window. Teams and the org are averaged from the
+    people's window scores exactly as score_deltas / get_org_summary do.
+    """
+
+    ROLE_COLUMNS = {'recruiter': 'recruiter_name', 'hm': 'hiring_manager_name'}
+
+    def __init__(self, violations, requisitions):
+        """
+        violations: output of ScorecardEngine.calculate_scores()
+        requisitions: the export, or any frame with one or more rows per
+                      requisition (team, recruiter_name, hiring_manager_name,
+                      role_opened_date)
+        """
+        self.requisitions = requisitions[['team', 'recruiter_name', 'hiring_manager_name']]
+        opened = pd.to_datetime(requisitions['role_opened_date'], errors='coerce')
+
+        if violations.empty:
+            event_days = np.array([], dtype='datetime64[D]')
+        else:
+            event_days = violations['event_date'].to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        dated = ~np.isnat(event_days)
+        day_numbers = event_days[dated].astype(np.int64)
+        if len(day_numbers):
+            self.first_day, self.last_day = day_numbers.min(), day_numbers.max()
+        else:
+            self.first_day = self.last_day = None
+
+        self.roles = {}
+        for role_type, column in self.ROLE_COLUMNS.items():
+            first_opened = opened.groupby(requisitions[column].to_numpy(), sort=False).min()
+            names = first_opened.index
+            days_span = np.int64(0 if self.first_day is None else self.last_day - self.first_day + 2)
+
+            if violations.empty:
+                keys, values = np.array([], dtype=np.int64), np.zeros((0, len(ScorecardEngine.SUM_COLUMNS)), dtype=np.int64)
+            else:
+                facts = ScorecardEngine._penalty_facts(violations[dated], column)
+                person = names.get_indexer(facts['name'])
+                known = person >= 0
+                # (person, day) key: people in index order, each one's days ascending
+                keys = person[known] * days_span + (day_numbers[known] - self.first_day)
+                # int64 when the penalties are, so scores keep score_by_*'s dtypes
+                values = facts.loc[known, ScorecardEngine.SUM_COLUMNS].to_numpy()
+            daily_keys, inverse = np.unique(keys, return_inverse=True)
+            daily = np.zeros((len(daily_keys), values.shape[1]), dtype=values.dtype)
+            np.add.at(daily, inverse, values)
+
+            prefix = np.zeros((len(daily_keys) + 1, values.shape[1]), dtype=values.dtype)
+            np.cumsum(daily, axis=0, out=prefix[1:])
+            self.roles[role_type] = {
+                'names': names,
+                'first_opened': first_opened.to_numpy(dtype='datetime64[ns]'),
+                'keys': daily_keys,
+                'prefix': prefix,
+                'span': days_span,
+            }
+
+    @staticmethod
+    def _day_number(value):
+        """Days since the epoch of a date-like value"""
+        return int(pd.Timestamp(value).to_datetime64().astype('datetime64[D]').astype(np.int64))
+
+    def _day_bounds(self, date_from, date_to):
+        """Window as inclusive day offsets from first_day (None = open end); hi < lo if empty"""
+        if self.first_day is None:
+            return 0, -1
+        last = int(self.last_day - self.first_day)
+        lo = 0 if date_from is None else min(max(self._day_number(date_from) - self.first_day, 0), last + 1)
+        hi = last if date_to is None else min(max(self._day_number(date_to) - self.first_day, -1), last)
+        return int(lo), int(hi)
+
+    def _sums(self, role_type, people, lo, hi):
+        """Window sums (people x SUM_COLUMNS) for the given person positions"""
+        role = self.roles[role_type]
+        base = people * role['span']
+        if hi < lo:
+            return np.zeros((len(people), role['prefix'].shape[1]), dtype=role['prefix'].dtype)
+        start = np.searchsorted(role['keys'], base + lo, side='left')
+        stop = np.searchsorted(role['keys'], base + hi, side='right')
+        return role['prefix'][stop] - role['prefix'][start]
+
+    def _scores(self, role_type, people, lo, hi):
+        role = self.roles[role_type]
+        sums = pd.DataFrame(self._sums(role_type, people, lo, hi),
+                            index=role['names'][people], columns=ScorecardEngine.SUM_COLUMNS)
+        return ScorecardEngine._scores_from_sums(sums.index, sums, self.ROLE_COLUMNS[role_type])
+
+    def _active(self, role_type, date_to):
+        """Positions of the people owning a requisition opened by the end of date_to"""
+        first_opened = self.roles[role_type]['first_opened']
+        if date_to is None:
+            return np.flatnonzero(~np.isnat(first_opened))
+        cutoff = (pd.Timestamp(date_to).normalize() + pd.Timedelta(days=1)).to_datetime64()
+        return np.flatnonzero(first_opened < cutoff)
+
+    def person(self, name, role_type, date_from=None, date_to=None):
+        """One person's score row over the window, or None if unknown"""
+        position = self.roles[role_type]['names'].get_indexer([name])
+        if position[0] < 0:
+            return None
+        lo, hi = self._day_bounds(date_from, date_to)
+        return self._scores(role_type, position, lo, hi).iloc[0].to_dict()
+
+    def window(self, date_from=None, date_to=None):
+        """
+        Scores over the days date_from..date_to (inclusive; None = open end).
+        Returns {'recruiters', 'hiring_managers': score tables,
+                 'teams': DataFrame (team, avg_score), 'org': org summary}
+        """
+        lo, hi = self._day_bounds(date_from, date_to)
+        recruiters = self._scores('recruiter', self._active('recruiter', date_to), lo, hi)
+        hms = self._scores('hm', self._active('hm', date_to), lo, hi)
+        teams = team_averages(self.requisitions, recruiters, hms)
+        return {
+            'recruiters': recruiters,
+            'hiring_managers': hms,
+            'teams': pd.DataFrame({'team': teams.index, 'avg_score': teams.to_numpy()}),
+            'org': ScorecardEngine.get_org_summary(recruiters, hms),
+        }
+
+
 if __name__ == "__main__":
     # Test the scoring engine
     df = pd.read_csv('sample_ats_export.csv')
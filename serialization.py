@@ -0,0 +1,247 @@
+"""
+serialization.py — fast JSON encoding and response compression for api.py
+
+The score tables and violations are pandas DataFrames. Converting them with
+`to_dict(orient="records")` and letting FastAPI run `jsonable_encoder` over
+the result walks every cell through a generic type dispatch. Instead we
+convert each column to native Python values once (NaN/NaT -> a fill value)
+and hand the finished structure straight to the JSON encoder.
+
+orjson and brotli are used when installed; without them we fall back to the
+stdlib json encoder and gzip-only compression.
+"""
+
+import gzip
+import json
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+from metrics import SERIALIZE_SECONDS, timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional speedup
+    brotli = None
+
+
+# ── Columnar → records ─────────────────────────────────────────────────────────
+def _column_values(series, fill):
+    """Return one column as a list of JSON-native values, NaN/NaT -> fill"""
+    dtype = series.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        out = np.datetime_as_string(series.to_numpy(dtype="datetime64[s]"), unit="s").tolist()
+    elif pd.api.types.is_float_dtype(dtype):
+        out = series.to_numpy(dtype=float, na_value=np.nan).tolist()
+    elif dtype == object:
+        out = [_native(v) for v in series.tolist()]
+    else:
+        out = series.tolist()
+
+    mask = series.isna().to_numpy()
+    for i in np.flatnonzero(mask):
+        out[i] = fill
+    return out
+
+
+def _native(value):
+    """Coerce a stray numpy/pandas scalar in an object column to a JSON type"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return value
+
+
+def frame_to_records(df, columns=None, fill=None):
+    """
+    Convert a DataFrame to a list of row dicts with JSON-native values.
+
+    Equivalent to `df.to_dict(orient="records")` followed by
+    `jsonable_encoder`, but works column-at-a-time. Missing values
+    (NaN, NaT, None) become `fill`.
+    """
+    if columns is not None:
+        df = df[list(columns)]
+    if df.empty:
+        return []
+    with timed("records", SERIALIZE_SECONDS, step="records"):
+        names = [str(c) for c in df.columns]
+        cols = [_column_values(df.iloc[:, i], fill) for i in range(df.shape[1])]
+        return [dict(zip(names, row)) for row in zip(*cols)]
+
+
+# ── JSON response ──────────────────────────────────────────────────────────────
+def _default(value):
+    """Fallback for values the encoder does not know natively"""
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content):
+    """Encode already-native content to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse for content built with `frame_to_records`.
+
+    Returning this from a handler skips FastAPI's `jsonable_encoder` pass.
+    """
+
+    def render(self, content):
+        with timed("encode", SERIALIZE_SECONDS, step="encode"):
+            return dumps(content)
+
+
+# ── Streaming exports ──────────────────────────────────────────────────────────
+EXPORT_CHUNK_ROWS = 5000
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_chunks(df, positions, fmt, columns=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Yield rows `positions` of `df` as NDJSON or CSV bytes, `chunk_rows` at
+    a time, so only one chunk is ever materialized. A CSV header is sent
+    first even when nothing matches.
+    """
+    if columns is not None:
+        df = df[list(columns)]
+    if fmt == "csv":
+        yield df.iloc[:0].to_csv(index=False).encode("utf-8")
+    for start in range(0, len(positions), chunk_rows):
+        chunk = df.iloc[positions[start:start + chunk_rows]]
+        if fmt == "csv":
+            yield chunk.to_csv(index=False, header=False).encode("utf-8")
+        else:
+            yield b"".join(dumps(row) + b"\n" for row in frame_to_records(chunk))
+
+
+# ── Compression ────────────────────────────────────────────────────────────────
+COMPRESSIBLE_TYPES = ("application/json", "text/csv", "application/x-ndjson", "text/plain")
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, or None"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+
+    def q_for(name):
+        return accepted.get(name, accepted.get("*", 0.0))
+
+    candidates = []
+    if brotli is not None and q_for("br") > 0:
+        candidates.append((q_for("br"), 1, "br"))
+    if q_for("gzip") > 0:
+        candidates.append((q_for("gzip"), 0, "gzip"))
+    if not candidates:
+        return None
+    return max(candidates)[2]
+
+
+def compress(body, encoding, level=5):
+    """Compress a response body with the negotiated encoding"""
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level)
+
+
+class CompressionMiddleware:
+    """
+    Compress single-chunk responses above `minimum_size` bytes.
+
+    Streaming responses (more than one body message) pass through untouched
+    so exports and event streams are never buffered.
+    """
+
+    def __init__(self, app, minimum_size=1024, level=5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        pending_start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal pending_start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                pending_start = message
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=pending_start["headers"])
+            content_type = headers.get("content-type", "")
+            compressible = (
+                not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+
+            if compressible:
+                body = compress(body, encoding, self.level)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                message = {**message, "body": body}
+
+            passthrough = True
+            await send(pending_start)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,195 @@
+"""
+sla.py — live SLA-breach forecasting for open interviews and open stages
+
+ScorecardEngine is retrospective: a violation exists once late feedback
+arrives or a stage transition happens. BreachForecaster looks forward from
+the moment the export was taken (its latest timestamp) at the work that is
+still open:
+
+  open interview — completed, no feedback yet; owned by the HM for HM
+                   interviews, else the recruiter. Breaches medium after
+                   48h and high after 72h without feedback.
+  open stage     — a requisition's latest stage while it is not closed;
+                   owned by the recruiter. Breaches medium once 8 whole
+                   days have passed in it and high at 15 (days_in_stage
+                   > 7 / > 14, as calculate_stage_velocity counts them).
+
+Every future breach is one entry in an array sorted by due time, built
+once per export version and never modified (a sorted array is a binary
+min-heap whose pops are a moving cursor). The forecaster keeps a clock
+that only moves forward: advance(now) moves the cursor past the entries
+that have come due and returns them as breach events (also kept in a
+numbered log, so several consumers can each read what they have not
+seen). Only the SSE watcher advances the clock. upcoming(hours, as_of)
+is a pure read: two binary searches find the entries due within the
+horizon, so answering "what breaches in the next N hours" costs
+O(log n + k) for k results, and one caller's as_of never changes what
+another sees. Nothing rescans the export after the build.
+
+A deadline exactly at the clock has passed: the build keeps only entries
+due after the export's as_of, and advance(now) / upcoming() treat entries
+due at `now` the same way.
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+FEEDBACK_SLA = {"medium": pd.Timedelta(hours=48), "high": pd.Timedelta(hours=72)}
+STAGE_SLA = {"medium": pd.Timedelta(days=8), "high": pd.Timedelta(days=15)}
+
+# A requisition in one of these has no open stage
+CLOSED = {"Hired", "Closed", "Cancelled", "Filled"}
+
+DATE_COLUMNS = ["stage_entered_date", "interview_completed_date", "feedback_submitted_date"]
+
+
+def export_as_of(df):
+    """The moment an export describes: its latest timestamp"""
+    latest = max((pd.to_datetime(df[c], errors="coerce").max() for c in DATE_COLUMNS), default=pd.NaT)
+    return None if pd.isna(latest) else latest
+
+
+def open_interviews(df):
+    """Interviews completed with no feedback yet, with their owner"""
+    completed = pd.to_datetime(df["interview_completed_date"], errors="coerce")
+    feedback = pd.to_datetime(df["feedback_submitted_date"], errors="coerce")
+    rows = df[(completed.notna() & feedback.isna()).to_numpy()]
+    is_hm = rows["is_hiring_manager_interview"].astype(bool).to_numpy()
+    return pd.DataFrame({
+        "kind": "feedback",
+        "metric": "feedback_timeliness",
+        "requisition_id": rows["requisition_id"].to_numpy(),
+        "stage": rows["stage"].to_numpy(),
+        "team": rows["team"].to_numpy(),
+        "owner": np.where(is_hm, rows["hiring_manager_name"].to_numpy(), rows["recruiter_name"].to_numpy()),
+        "recruiter_name": rows["recruiter_name"].to_numpy(),
+        "hiring_manager_name": rows["hiring_manager_name"].to_numpy(),
+        "since": completed[rows.index].to_numpy(),
+    })
+
+
+def open_stages(df):
+    """Each open requisition's latest stage and when it was entered"""
+    entered = pd.to_datetime(df["stage_entered_date"], errors="coerce")
+    dated = df.assign(stage_entered_date=entered)[entered.notna().to_numpy()]
+    latest = dated.sort_values("stage_entered_date", kind="stable").drop_duplicates("requisition_id", keep="last")
+    latest = latest[~latest["stage"].isin(CLOSED) & ~latest["current_status"].isin(CLOSED)]
+    # The stage was entered when its first row was
+    since = dated.groupby(["requisition_id", "stage"], sort=False)["stage_entered_date"].min()
+    return pd.DataFrame({
+        "kind": "stage",
+        "metric": "stage_velocity",
+        "requisition_id": latest["requisition_id"].to_numpy(),
+        "stage": latest["stage"].to_numpy(),
+        "team": latest["team"].to_numpy(),
+        "owner": latest["recruiter_name"].to_numpy(),
+        "recruiter_name": latest["recruiter_name"].to_numpy(),
+        "hiring_manager_name": latest["hiring_manager_name"].to_numpy(),
+        "since": since.reindex(pd.MultiIndex.from_arrays([latest["requisition_id"], latest["stage"]])).to_numpy(),
+    })
+
+
+class BreachForecaster:
+    """
+    Pending SLA breaches of one export, in due order (see module docstring).
+    advance() and upcoming() may be called from several threads.
+    """
+
+    def __init__(self, df, as_of=None, log_size=1000):
+        self.as_of = export_as_of(df) if as_of is None else pd.Timestamp(as_of)
+        self.now = self.as_of
+        self.breached = 0                    # events emitted so far; also the last event's seq
+        self.log = deque(maxlen=log_size)    # most recent events, oldest first
+        self._lock = threading.Lock()
+
+        items = pd.concat([open_interviews(df), open_stages(df)], ignore_index=True)
+        self.items = items.to_dict("records")
+
+        since = items["since"].to_numpy(dtype="datetime64[ns]")
+        due, positions, severities = [], [], []
+        for severity_rank, severity in enumerate(("medium", "high")):
+            for kind, sla in (("feedback", FEEDBACK_SLA), ("stage", STAGE_SLA)):
+                kind_positions = np.flatnonzero((items["kind"] == kind).to_numpy())
+                kind_due = since[kind_positions] + sla[severity].to_timedelta64()
+                pending = ~np.isnat(kind_due) if self.now is None else kind_due > self.now.to_datetime64()
+                due.append(kind_due[pending].astype(np.int64))
+                positions.append(kind_positions[pending])
+                severities.append(np.full(int(pending.sum()), severity_rank, dtype=np.int8))
+        due, positions, severities = (np.concatenate(parts) for parts in (due, positions, severities))
+        order = np.lexsort((severities, positions, due))
+        self._due = due[order]                 # due ns, ascending
+        self._positions = positions[order]     # item position
+        self._severities = severities[order]   # 0 = medium / 1 = high
+        self._next = 0                         # entries before this one have come due
+
+    def __getstate__(self):
+        # Snapshots built on a process pool are pickled back; locks are not picklable
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._due) - self._next
+
+    def _event(self, entry):
+        due = int(self._due[entry])
+        item = self.items[int(self._positions[entry])]
+        return {
+            **{k: v for k, v in item.items() if k != "since"},
+            "severity": "high" if self._severities[entry] else "medium",
+            "since": pd.Timestamp(item["since"]).isoformat(),
+            "due": pd.Timestamp(due).isoformat(),
+        }
+
+    def clock(self, as_of=None):
+        """The time upcoming(as_of=...) looks ahead from: as_of, but never before the clock"""
+        as_of = None if as_of is None else pd.Timestamp(as_of)
+        if self.now is None or (as_of is not None and as_of > self.now):
+            return as_of
+        return self.now
+
+    def advance(self, now=None):
+        """
+        Move the clock to `now` (default: the current time; never backwards)
+        and return the breaches that came due, in due order
+        """
+        now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+        with self._lock:
+            if self.now is not None and now <= self.now:
+                return []
+            self.now = now
+            start = self._next
+            self._next = max(start, int(np.searchsorted(self._due, now.value, side="right")))
+            events = [{"seq": self.breached + i, **self._event(entry)}
+                      for i, entry in enumerate(range(start, self._next), 1)]
+            self.breached += len(events)
+            self.log.extend(events)
+        return events
+
+    def since(self, seq):
+        """Logged events after `seq` (older ones may have been dropped from the log)"""
+        with self._lock:
+            return [e for e in self.log if e["seq"] > seq] if self.breached > seq else []
+
+    def upcoming(self, hours, owner=None, as_of=None):
+        """
+        Breaches due within `hours` after clock(as_of), in due order,
+        optionally only those `owner` is responsible for. Reads only; the
+        clock is not moved. Two binary searches: O(log n + k).
+        """
+        start = self.clock(as_of)
+        if start is None:
+            return []
+        lo = np.searchsorted(self._due, start.value, side="right")
+        hi = np.searchsorted(self._due, (start + pd.Timedelta(hours=hours)).value, side="right")
+        events = [self._event(entry) for entry in range(lo, hi)]
+        if owner is not None:
+            events = [e for e in events if e["owner"] == owner]
+        return events
@@ -0,0 +1,704 @@
+"""
+snapshot.py — scored, indexed view of one ATS export
+
+Runs ScorecardEngine once per export version and keeps the resulting
+tables together with the lookup indexes the API filters against:
+
+  raw               — the export as read from disk
+  violations        — ScorecardEngine.calculate_scores()
+  recruiter_scores  — ScorecardEngine.score_by_recruiter(), plus prior_score /
+                      score_delta over the last DELTA_DAYS (score_deltas())
+  hm_scores         — ScorecardEngine.score_by_hiring_manager(), same deltas
+  org_summary       — ScorecardEngine.get_org_summary(), plus "deltas"
+  roles             — one row per requisition (latest stage first)
+  role_table        — one row per requisition with its recruiter and HM
+                      scores and the combined score's 14-day trend, for
+                      the recruiter / HM dashboards
+  departments       — per-team rollup served by /api/departments (with deltas)
+  timings           — seconds per build stage (engine stages, read_csv, indexes)
+  indexes           — value -> sorted row positions, per filterable column,
+                      the drill-down AggregationCube ("cube"), the
+                      per-role / per-team rank arrays ("rankings"),
+                      person -> role_table rows ("role_table"), the
+                      prefix-summed ScoreWindows for date-range scores
+                      ("windows") and the live sla.BreachForecaster ("sla")
+
+A snapshot is rebuilt only when the export's mtime or size changes.
+load_snapshot() is the synchronous entry point (app.py, scripts);
+SnapshotCache is the asyncio one used by api.py, which runs builds on an
+executor and coalesces concurrent requests for the same export version.
+
+Shared store: with pyarrow installed, SnapshotCache can write each built
+snapshot once to a directory of Arrow IPC files. Every API worker process
+memory-maps those files read-only (zero copy), and an exclusive file lock
+makes sure only one process scores a given export version. The store can
+also be filled ahead of time by a sidecar:
+
+    python snapshot.py --export sample_ats_export.csv --store .snapshots
+"""
+
+import argparse
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+from scoring_engine import AggregationCube, ScorecardEngine, ScoreWindows
+from sla import BreachForecaster
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pragma: no cover - shared store disabled without pyarrow
+    pa = None
+
+ROLE_COLUMNS = [
+    "requisition_id", "job_title", "team",
+    "recruiter_name", "hiring_manager_name",
+    "role_opened_date", "current_status", "stage",
+]
+
+# Snapshot entries stored as Arrow tables; everything else except the
+# indexes (rebuilt on load) goes to meta.json
+TABLE_KEYS = ("raw", "violations", "recruiter_scores", "hm_scores", "roles", "departments", "role_table")
+
+# Role table columns taken from the export (first row of each requisition)
+ROLE_TABLE_COLUMNS = [
+    "requisition_id", "job_title", "team", "recruiter_name", "hiring_manager_name", "current_status",
+]
+
+# Score deltas (and the role table's trend): now vs DELTA_DAYS before the latest violation
+DELTA_DAYS = 14
+
+# Bumped whenever TABLE_KEYS or a table's columns change, so a store
+# written by an older build is never mapped by a newer one
+STORE_FORMAT = 3
+
+_EMPTY = np.array([], dtype=np.intp)
+
+
+def export_version(path):
+    """Cheap version stamp for an export file (mtime + size)"""
+    st = os.stat(path)
+    return f"{st.st_mtime_ns}-{st.st_size}"
+
+
+# ── Building ───────────────────────────────────────────────────────────────────
+def build_snapshot(df, version=None, progress=None):
+    """
+    Score an ATS export and return the snapshot dict
+    progress: passed to ScorecardEngine.calculate_scores()
+    """
+    engine = ScorecardEngine(df)
+    violations = engine.calculate_scores(progress)
+    recruiter_scores = engine.score_by_recruiter(violations)
+    hm_scores = engine.score_by_hiring_manager(violations)
+    org_summary = engine.get_org_summary(recruiter_scores, hm_scores)
+
+    deltas = engine.score_deltas(violations, recruiter_scores, hm_scores, days=DELTA_DAYS)
+    recruiter_scores = with_deltas(recruiter_scores, deltas["recruiters"])
+    hm_scores = with_deltas(hm_scores, deltas["hiring_managers"])
+    org_summary["deltas"] = deltas["org"]
+    org_summary["delta_days"] = DELTA_DAYS
+    org_summary["delta_since"] = None if deltas["since"] is None else deltas["since"].isoformat()
+
+    # One row per requisition (latest stage)
+    roles = df.sort_values("stage_entered_date", ascending=False)
+    roles = roles.drop_duplicates("requisition_id")[ROLE_COLUMNS].reset_index(drop=True)
+
+    snapshot = {
+        "version": version,
+        "raw": df,
+        "violations": violations,
+        "recruiter_scores": recruiter_scores,
+        "hm_scores": hm_scores,
+        "org_summary": org_summary,
+        "roles": roles,
+        "departments": build_departments(df, recruiter_scores, hm_scores, deltas["teams"]),
+        "role_table": build_role_table(df, recruiter_scores, hm_scores),
+    }
+    start = time.perf_counter()
+    snapshot["indexes"] = build_indexes(snapshot)
+    snapshot["timings"] = {**engine.timings, "indexes": time.perf_counter() - start}
+    snapshot["nbytes"] = snapshot_nbytes(snapshot)
+    return snapshot
+
+
+def snapshot_nbytes(snapshot):
+    """Approximate in-memory size of a snapshot's tables and indexes (deep), in bytes"""
+    tables = sum(snapshot[key].memory_usage(index=True, deep=True).sum() for key in TABLE_KEYS)
+    return int(tables + deep_nbytes(snapshot.get("indexes", {})))
+
+
+def deep_nbytes(value):
+    """
+    Approximate deep size of an index structure: frames and arrays by their
+    buffers, containers and objects (the cube, score windows, forecaster)
+    by walking their contents. Each object is counted once.
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        if isinstance(value, pd.DataFrame):
+            total += value.memory_usage(index=True, deep=True).sum()
+        elif isinstance(value, (pd.Series, pd.Index)):
+            total += value.memory_usage(deep=True)
+        elif isinstance(value, np.ndarray):
+            total += value.nbytes
+            if value.dtype == object:
+                stack.extend(value.ravel().tolist())
+        elif isinstance(value, dict):
+            total += sys.getsizeof(value)
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset, deque)):
+            total += sys.getsizeof(value)
+            stack.extend(value)
+        elif hasattr(value, "__dict__") and not isinstance(value, type):
+            total += sys.getsizeof(value)
+            stack.append(vars(value))
+        else:
+            total += sys.getsizeof(value)
+    return int(total)
+
+
+def build_departments(raw, recruiter_scores, hm_scores, team_deltas=None):
+    """
+    Per-team rollup: recruiter / HM / combined averages, open roles and
+    members, in one grouped pass. Teams and members keep first-appearance
+    order; the combined average falls back to whichever side exists.
+    team_deltas (ScorecardEngine.score_deltas()["teams"]) adds the combined
+    average's prior value and change. Sorted by combined average, best first.
+    """
+    teams = pd.Index(raw["team"].unique(), name="team")
+
+    def members(column, scores):
+        pairs = raw[["team", column]].drop_duplicates()
+        names = pairs.groupby("team", sort=False)[column].agg(list)
+        scored = pairs.merge(scores[["name", "final_score"]], left_on=column, right_on="name")
+        avg = scored.groupby("team", sort=False)["final_score"].mean().round(1)
+        return names.reindex(teams), avg.reindex(teams)
+
+    recruiters, rec_avg = members("recruiter_name", recruiter_scores)
+    hiring_managers, hm_avg = members("hiring_manager_name", hm_scores)
+
+    dept_avg = ((rec_avg + hm_avg) / 2).round(1).fillna(rec_avg).fillna(hm_avg)
+
+    departments = pd.DataFrame({
+        "team": teams,
+        "avg_score": dept_avg.to_numpy(),
+        "recruiter_avg": rec_avg.to_numpy(),
+        "hm_avg": hm_avg.to_numpy(),
+        "open_roles": raw.groupby("team", sort=False)["requisition_id"].nunique().reindex(teams).to_numpy(),
+        "recruiters": recruiters.to_numpy(),
+        "hiring_managers": hiring_managers.to_numpy(),
+    })
+    if team_deltas is not None:
+        by_team = team_deltas.set_index("team").reindex(teams)
+        departments["prior_avg_score"] = by_team["prior_avg_score"].to_numpy()
+        departments["avg_score_delta"] = by_team["avg_score_delta"].to_numpy()
+    order = np.argsort(-departments["avg_score"].fillna(0).to_numpy(), kind="stable")
+    return departments.iloc[order].reset_index(drop=True)
+
+
+def with_deltas(scores, person_deltas):
+    """Score table with prior_score / score_delta columns (rows are aligned)"""
+    return scores.assign(
+        prior_score=person_deltas["prior_score"].to_numpy(),
+        score_delta=person_deltas["score_delta"].to_numpy(),
+    )
+
+
+def build_role_table(raw, recruiter_scores, hm_scores):
+    """
+    One row per requisition (export order, first row's attributes) joined
+    with its recruiter's and HM's final scores, their mean (combined_score)
+    and the combined score's change over the delta window (trend).
+    """
+    roles = raw.drop_duplicates("requisition_id")[ROLE_TABLE_COLUMNS].reset_index(drop=True)
+
+    def lookup(scores, column, field):
+        return roles[column].map(scores.set_index("name")[field])
+
+    rec_score = lookup(recruiter_scores, "recruiter_name", "final_score")
+    hm_score = lookup(hm_scores, "hiring_manager_name", "final_score")
+    combined = (rec_score + hm_score) / 2
+    prior = (lookup(recruiter_scores, "recruiter_name", "prior_score")
+             + lookup(hm_scores, "hiring_manager_name", "prior_score")) / 2
+
+    roles["recruiter_score"] = rec_score
+    roles["hm_score"] = hm_score
+    roles["combined_score"] = combined.round(1)
+    roles["trend"] = (combined - prior).round(1)
+    return roles
+
+
+def read_export(path, on_rows=None, chunk_rows=50_000):
+    """
+    Read an export CSV. With `on_rows`, parse it in chunks and report the
+    running row count after each one.
+    """
+    if on_rows is None:
+        return pd.read_csv(path)
+    chunks = []
+    rows = 0
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            chunks.append(chunk)
+            rows += len(chunk)
+            on_rows(rows)
+    if not chunks:
+        return pd.read_csv(path)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def build_snapshot_from_csv(path, version):
+    """Read and score an export; module-level so a process pool can run it"""
+    start = time.perf_counter()
+    df = read_export(path)
+    read_seconds = time.perf_counter() - start
+    snapshot = build_snapshot(df, version)
+    snapshot["timings"]["read_csv"] = read_seconds
+    return snapshot
+
+
+def _value_index(series):
+    """value -> sorted positions of the rows holding it"""
+    return {key: np.asarray(pos, dtype=np.intp) for key, pos in series.groupby(series, sort=False).indices.items()}
+
+
+def _date_index(series):
+    """(sorted dates, positions in date order) for range lookups; NaT dropped"""
+    dates = pd.to_datetime(series, errors="coerce").to_numpy(dtype="datetime64[ns]")
+    order = np.argsort(dates, kind="stable")
+    order = order[~np.isnat(dates[order])]
+    return dates[order], order
+
+
+def build_indexes(snapshot):
+    """Prebuilt lookups for the roles and violations filters, the cube, score windows and SLA deadlines"""
+    roles = snapshot["roles"]
+    violations = snapshot["violations"]
+
+    indexes = {
+        "roles": {
+            "team": _value_index(roles["team"]),
+            "status": _value_index(roles["current_status"]),
+            "date": _date_index(roles["role_opened_date"]),
+        },
+        "violations": {},
+    }
+
+    req_team = roles.set_index("requisition_id")["team"]
+    indexes["cube"] = AggregationCube(violations, req_team)
+    indexes["windows"] = ScoreWindows(violations, roles)
+    indexes["sla"] = BreachForecaster(snapshot["raw"])
+    indexes["rankings"] = {
+        "recruiter": build_ranking(snapshot["recruiter_scores"], roles, "recruiter_name"),
+        "hm": build_ranking(snapshot["hm_scores"], roles, "hiring_manager_name"),
+    }
+    role_table = snapshot["role_table"]
+    indexes["role_table"] = {
+        "recruiter": _value_index(role_table["recruiter_name"]),
+        "hm": _value_index(role_table["hiring_manager_name"]),
+    }
+
+    if violations.empty:
+        return indexes
+
+    req_status = roles.set_index("requisition_id")["current_status"]
+
+    by_recruiter = _value_index(violations["recruiter_name"])
+    by_hm = _value_index(violations["hiring_manager_name"])
+    by_person = dict(by_recruiter)
+    for name, pos in by_hm.items():
+        by_person[name] = np.union1d(by_person[name], pos) if name in by_person else pos
+
+    indexes["violations"] = {
+        "person": by_person,
+        "team": _value_index(violations["requisition_id"].map(req_team)),
+        "status": _value_index(violations["requisition_id"].map(req_status)),
+        "severity": _value_index(violations["severity"]),
+        "metric": _value_index(violations["metric"]),
+        "date": _date_index(violations["event_date"]),
+    }
+    return indexes
+
+
+def _ranked(scores, positions):
+    """(positions best-first, their scores ascending) for one population"""
+    order = positions[np.argsort(-scores[positions], kind="stable")]
+    return order, scores[order][::-1]
+
+
+def build_ranking(scores_df, roles, name_column):
+    """
+    Rank arrays for one score table: org-wide and per team (a person is
+    ranked in every team they own a requisition in). Ties keep table
+    order, matching a stable sort on -final_score.
+    """
+    scores = scores_df["final_score"].to_numpy(dtype=float)
+    order, ascending = _ranked(scores, np.arange(len(scores), dtype=np.intp))
+    rank = np.empty(len(scores), dtype=np.intp)
+    rank[order] = np.arange(1, len(scores) + 1)
+
+    position = {name: i for i, name in enumerate(scores_df["name"].tolist())}
+    teams = {}
+    person_teams = {}
+    members = roles[["team", name_column]].drop_duplicates()
+    for team, names in members.groupby("team", sort=False)[name_column]:
+        pos = np.array(sorted({position[n] for n in names if n in position}), dtype=np.intp)
+        team_order, team_ascending = _ranked(scores, pos)
+        team_rank = {p: r for r, p in enumerate(team_order.tolist(), 1)}
+        teams[team] = {"order": team_order, "ascending": team_ascending, "rank": team_rank}
+        for p in team_rank:
+            person_teams.setdefault(p, []).append(team)
+
+    return {
+        "order": order, "rank": rank, "ascending": ascending,
+        "position": position, "teams": teams, "person_teams": person_teams,
+    }
+
+
+def percentile_rank(ascending, score):
+    """Share of the population (in %) scoring at or below `score`"""
+    if not len(ascending):
+        return None
+    return round(100 * float(np.searchsorted(ascending, score, side="right")) / len(ascending), 1)
+
+
+# ── Querying ───────────────────────────────────────────────────────────────────
+def _date_positions(date_index, date_from, date_to):
+    """Sorted positions with date_from <= date <= date_to"""
+    dates, order = date_index
+    lo = 0 if date_from is None else np.searchsorted(dates, np.datetime64(date_from, "ns"), side="left")
+    hi = len(dates) if date_to is None else np.searchsorted(dates, np.datetime64(date_to, "ns"), side="right")
+    return np.sort(order[lo:hi])
+
+
+def select(index, n_rows, filters, date_from=None, date_to=None):
+    """
+    Resolve equality filters and a date range to sorted row positions.
+
+    `filters` maps an index name to a value (None = not filtered). Each
+    filter is one dict lookup; results are intersected.
+    """
+    selected = None
+    for key, value in filters.items():
+        if value is None:
+            continue
+        positions = index.get(key, {}).get(value, _EMPTY)
+        selected = positions if selected is None else np.intersect1d(selected, positions, assume_unique=True)
+
+    if date_from is not None or date_to is not None:
+        positions = _date_positions(index["date"], date_from, date_to)
+        selected = positions if selected is None else np.intersect1d(selected, positions, assume_unique=True)
+
+    if selected is None:
+        return np.arange(n_rows, dtype=np.intp)
+    return selected
+
+
+def query_roles(snapshot, team=None, status=None, date_from=None, date_to=None):
+    """Row positions in snapshot['roles'] matching the filters"""
+    return select(
+        snapshot["indexes"]["roles"], len(snapshot["roles"]),
+        {"team": team, "status": status},
+        date_from, date_to,
+    )
+
+
+def query_violations(snapshot, name=None, team=None, severity=None, metric=None,
+                     status=None, date_from=None, date_to=None):
+    """Row positions in snapshot['violations'] matching the filters"""
+    if snapshot["violations"].empty:
+        return _EMPTY
+    return select(
+        snapshot["indexes"]["violations"], len(snapshot["violations"]),
+        {"person": name, "team": team, "severity": severity, "metric": metric, "status": status},
+        date_from, date_to,
+    )
+
+
+def person_role_rows(snapshot, name, role_type):
+    """Rows of snapshot['role_table'] owned by a person (role_type 'recruiter' or 'hm')"""
+    return snapshot["role_table"].iloc[snapshot["indexes"]["role_table"][role_type].get(name, _EMPTY)]
+
+
+# ── Shared Arrow store ─────────────────────────────────────────────────────────
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def store_path(store, path, version):
+    """Directory holding one export version in the shared store"""
+    key = hashlib.sha1(f"{STORE_FORMAT}:{os.path.abspath(path)}".encode()).hexdigest()[:16]
+    return os.path.join(store, key, version)
+
+
+def write_snapshot(snapshot, target):
+    """Write a snapshot as Arrow IPC files; the directory appears atomically"""
+    tmp = f"{target}.tmp-{os.getpid()}"
+    os.makedirs(tmp)
+    for key in TABLE_KEYS:
+        table = pa.Table.from_pandas(snapshot[key], preserve_index=False)
+        with pa.OSFile(os.path.join(tmp, f"{key}.arrow"), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    meta = {k: v for k, v in snapshot.items() if k not in TABLE_KEYS and k != "indexes"}
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta, f, default=_json_default)
+    os.rename(tmp, target)
+
+
+def _mapped_dtype(arrow_type):
+    """Keep numeric columns numpy-backed (same dtypes and rounding as a fresh build)"""
+    if pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def map_snapshot(target):
+    """
+    Load a stored snapshot by memory-mapping its Arrow files.
+
+    String, boolean and timestamp columns come back as Arrow-backed arrays
+    over the mapped pages, and null-free numeric columns as numpy views of
+    them, so N workers share one copy through the page cache.
+    """
+    with open(os.path.join(target, "meta.json")) as f:
+        snapshot = json.load(f)
+    for key in TABLE_KEYS:
+        source = pa.memory_map(os.path.join(target, f"{key}.arrow"), "r")
+        table = pa.ipc.open_file(source).read_all()
+        snapshot[key] = table.to_pandas(types_mapper=_mapped_dtype, split_blocks=True)
+    snapshot["indexes"] = build_indexes(snapshot)
+    snapshot["nbytes"] = snapshot_nbytes(snapshot)
+    return snapshot
+
+
+def materialize_snapshot(path, version, store, build=None):
+    """
+    Make sure `store` holds this export version and return its directory.
+
+    The first process to take the export's lock scores and writes it; any
+    other process waiting on the lock finds the result and returns at once.
+    `build` (no arguments -> snapshot) replaces the default CSV scoring run.
+    Older versions of the same export are removed afterwards (workers that
+    still map them keep their pages until they move on).
+    """
+    return _materialize(path, version, store, build)[0]
+
+
+def _materialize(path, version, store, build=None):
+    """materialize_snapshot(), also reporting whether this call did the build"""
+    target = store_path(store, path, version)
+    if os.path.isdir(target):
+        return target, False
+
+    export_dir = os.path.dirname(target)
+    os.makedirs(export_dir, exist_ok=True)
+    with open(f"{export_dir}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if os.path.isdir(target):
+            return target, False
+        snapshot = build() if build is not None else build_snapshot_from_csv(path, version)
+        write_snapshot(snapshot, target)
+        for name in os.listdir(export_dir):
+            if name != version:
+                shutil.rmtree(os.path.join(export_dir, name), ignore_errors=True)
+    return target, True
+
+
+# ── Cache ──────────────────────────────────────────────────────────────────────
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_snapshot(path):
+    """Return the snapshot for an export, rebuilding it if the file changed"""
+    version = export_version(path)
+    cached = _cache.get(path)
+    if cached is not None and cached["version"] == version:
+        return cached
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is None or cached["version"] != version:
+            cached = build_snapshot_from_csv(path, version)
+            _cache[path] = cached
+    return cached
+
+
+class SnapshotCache:
+    """
+    Async snapshot cache for the API, one entry per export (dataset).
+
+    Builds run on the executor (a process pool, so scoring never holds this
+    process's GIL). Concurrent callers asking for the same export version
+    await a single in-flight build instead of each starting one. Once built,
+    a snapshot is served straight from memory.
+
+    With a `store` directory (and pyarrow), the pool process writes the
+    snapshot to the shared Arrow store instead of returning it, and this
+    process memory-maps it — so every worker of a multi-worker deployment
+    shares one scoring run and one copy of the data.
+
+    Entries are kept in LRU order. With `max_bytes`, the least recently used
+    snapshots are dropped once their summed `nbytes` exceeds the budget (the
+    newest entry always stays); an evicted export whose version is still in
+    the store is rehydrated by mapping it again rather than rescoring.
+
+    current() is also called from sync endpoints on Starlette's threadpool,
+    so the LRU and the counters are only touched under a lock.
+    """
+
+    def __init__(self, executor_factory, store=None, max_bytes=None, on_build=None):
+        self._executor_factory = executor_factory
+        self.on_build = on_build   # callable(path, snapshot, timings) after each load
+        self._executor = None
+        self.store = store if pa is not None else None
+        self.max_bytes = max_bytes
+        self._snapshots = OrderedDict()   # path -> snapshot, least recently used first
+        self._inflight = {}               # (path, version) -> asyncio.Future
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "rehydrations": 0}
+        self._lock = threading.Lock()     # guards _snapshots and counters
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = self._executor_factory()
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _hit(self, path, version):
+        with self._lock:
+            cached = self._snapshots.get(path)
+            if cached is not None and cached["version"] == version:
+                self._snapshots.move_to_end(path)
+                self.counters["hits"] += 1
+                return cached
+            return None
+
+    def current(self, path):
+        """Snapshot for `path` if it is already built and up to date, else None"""
+        return self._hit(path, export_version(path))
+
+    async def get(self, path):
+        """Current snapshot for `path`, building it at most once per version"""
+        version = export_version(path)
+        cached = self._hit(path, version)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            self.counters["misses"] += 1
+        key = (path, version)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._build(path, version))
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._finish(key, f))
+
+        # shield: a cancelled request must not cancel the build other callers share
+        return await asyncio.shield(future)
+
+    def stats(self):
+        """Counters plus per-entry sizes, most recently used last"""
+        with self._lock:
+            entries = [
+                {"path": path, "version": snap["version"], "nbytes": snap.get("nbytes", 0)}
+                for path, snap in self._snapshots.items()
+            ]
+            counters = dict(self.counters)
+        return {
+            **counters,
+            "entries": entries,
+            "nbytes": sum(e["nbytes"] for e in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def put(self, path, snapshot):
+        """Install a snapshot (also one built elsewhere, e.g. by an upload job)"""
+        with self._lock:
+            current = self._snapshots.get(path)
+            if current is None or current["version"] != snapshot["version"]:
+                self._snapshots[path] = snapshot
+            self._snapshots.move_to_end(path)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries over the budget (caller holds the lock)"""
+        if self.max_bytes is None:
+            return
+        total = sum(snap.get("nbytes", 0) for snap in self._snapshots.values())
+        while total > self.max_bytes and len(self._snapshots) > 1:
+            _, evicted = self._snapshots.popitem(last=False)
+            total -= evicted.get("nbytes", 0)
+            self.counters["evictions"] += 1
+
+    async def _build(self, path, version):
+        loop = asyncio.get_running_loop()
+        if self.store is None:
+            snapshot = await loop.run_in_executor(self.executor, build_snapshot_from_csv, path, version)
+            self._built(path, snapshot, snapshot.get("timings", {}))
+            return snapshot
+
+        target = store_path(self.store, path, version)
+        built = False
+        if os.path.isdir(target):
+            # Already scored (by another worker, or evicted here): just map it
+            with self._lock:
+                self.counters["rehydrations"] += 1
+        else:
+            target, built = await loop.run_in_executor(self.executor, _materialize, path, version, self.store)
+        # Mapping is cheap but rebuilding the indexes is pandas work: keep it off the loop
+        start = time.perf_counter()
+        snapshot = await loop.run_in_executor(None, map_snapshot, target)
+        # Build timings come back through meta.json; report them only from
+        # the process whose request did the scoring
+        timings = dict(snapshot.get("timings", {})) if built else {}
+        timings["map_snapshot"] = time.perf_counter() - start
+        self._built(path, snapshot, timings)
+        return snapshot
+
+    def _built(self, path, snapshot, timings):
+        if self.on_build is not None:
+            self.on_build(path, snapshot, timings)
+
+    def _finish(self, key, future):
+        self._inflight.pop(key, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.put(key[0], future.result())
+
+
+# ── Sidecar ────────────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score an ATS export into the shared snapshot store")
+    parser.add_argument("--export", default="sample_ats_export.csv", help="ATS export CSV")
+    parser.add_argument("--store", default=".snapshots", help="shared store directory")
+    args = parser.parse_args()
+
+    target = materialize_snapshot(args.export, export_version(args.export), args.store)
+    print(f"✓ Snapshot ready: {target}")
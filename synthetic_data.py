@@ -0,0 +1,139 @@
+"""
+Synthetic ATS exports for benchmarks and load tests
+
+Generates exports in the sample_ats_export.csv schema at any size, fully
+vectorized so 10^7 rows take seconds rather than minutes. Every export is
+deterministic for a given (rows, shape, seed).
+
+Shapes:
+  balanced          ~6 candidate rows per requisition
+  many_reqs         ~2 rows per requisition (many reqs, few candidates)
+  few_reqs          ~500 rows per requisition (few reqs, many candidates)
+  missing_feedback  balanced, but 40% of interviews have no feedback
+
+to_advanced_schema() maps an export onto the column names
+advanced_scoring_engine.ScorecardEngine expects.
+
+Usage:
+    python synthetic_data.py --rows 100000 --shape few_reqs --out big_export.csv
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+STAGES = ['New', 'Phone Screen', 'Technical Interview', 'Final Interview', 'Offer', 'Hired']
+TEAMS = ['Engineering', 'Sales', 'Marketing', 'Product', 'Customer Success', 'Operations']
+TITLES = {
+    'Engineering': ['Backend Engineer', 'Senior Software Engineer', 'Data Engineer'],
+    'Sales': ['Account Executive', 'Sales Development Rep'],
+    'Marketing': ['Marketing Manager', 'Content Strategist'],
+    'Product': ['Product Manager', 'Product Designer'],
+    'Customer Success': ['Customer Success Manager', 'Support Engineer'],
+    'Operations': ['Operations Analyst', 'People Partner'],
+}
+
+# shape -> (rows per requisition, share of interviews missing feedback)
+SHAPES = {
+    'balanced': (6, 0.08),
+    'many_reqs': (2, 0.08),
+    'few_reqs': (500, 0.08),
+    'missing_feedback': (6, 0.40),
+}
+
+START_DATE = pd.Timestamp('2024-06-01')
+
+
+def _people(prefix, count):
+    return np.array([f'{prefix} {i:05d}' for i in range(count)], dtype=object)
+
+
+def generate_export(rows, shape='balanced', seed=0):
+    """A synthetic ATS export with `rows` candidate-stage rows"""
+    if shape not in SHAPES:
+        raise ValueError(f'unknown shape {shape!r} (expected one of {", ".join(SHAPES)})')
+    rows_per_req, missing_rate = SHAPES[shape]
+    rng = np.random.default_rng(seed)
+
+    n_reqs = max(1, rows // rows_per_req)
+    recruiters = _people('Recruiter', max(4, min(2000, n_reqs // 40)))
+    hms = _people('Manager', max(4, min(10000, n_reqs // 15)))
+
+    # Per-requisition attributes
+    req_team = rng.integers(0, len(TEAMS), n_reqs)
+    title_table = np.array([[TITLES[t][0], TITLES[t][-1]] for t in TEAMS], dtype=object)
+    req_title = title_table[req_team, rng.integers(0, 2, n_reqs)]
+    req_recruiter = rng.integers(0, len(recruiters), n_reqs)
+    req_hm = rng.integers(0, len(hms), n_reqs)
+    req_opened = START_DATE + pd.to_timedelta(rng.integers(0, 240, n_reqs), unit='D')
+
+    # Spread the rows over requisitions; every requisition gets at least one
+    req = np.sort(np.concatenate([np.arange(n_reqs), rng.integers(0, n_reqs, max(0, rows - n_reqs))]))[:rows]
+
+    stage_idx = rng.integers(0, len(STAGES), rows)
+    # Candidates move through stages; later stages are entered later
+    stage_entered = (
+        req_opened.values[req]
+        + pd.to_timedelta(stage_idx * 6 + rng.integers(0, 12, rows), unit='D').values
+    )
+    interviewed = (stage_idx > 0) & (stage_idx < 4) & (rng.random(rows) < 0.9)
+    interview_done = stage_entered + pd.to_timedelta(rng.integers(0, 72, rows), unit='h').values
+    feedback_hours = np.minimum(rng.exponential(30, rows), 24 * 30).astype(int)
+    feedback = interview_done + pd.to_timedelta(feedback_hours, unit='h').values
+    missing = rng.random(rows) < missing_rate
+
+    interview_done = np.where(interviewed, interview_done, np.datetime64('NaT'))
+    feedback = np.where(interviewed & ~missing, feedback, np.datetime64('NaT'))
+
+    is_hm = interviewed & (rng.random(rows) < 0.35)
+    recruiter_names = recruiters[req_recruiter[req]]
+    hm_names = hms[req_hm[req]]
+    stage_names = np.array(STAGES, dtype=object)[stage_idx]
+
+    return pd.DataFrame({
+        'requisition_id': pd.Series(req).map('REQ-{:07d}'.format).to_numpy(),
+        'job_title': req_title[req],
+        'team': np.array(TEAMS, dtype=object)[req_team[req]],
+        'recruiter_name': recruiter_names,
+        'hiring_manager_name': hm_names,
+        'role_opened_date': req_opened.values[req],
+        'current_status': stage_names,
+        'stage': stage_names,
+        'stage_entered_date': stage_entered,
+        'interview_completed_date': interview_done,
+        'feedback_submitted_date': feedback,
+        'interviewer_name': np.where(is_hm, hm_names, recruiter_names),
+        'is_hiring_manager_interview': is_hm,
+    })
+
+
+def to_advanced_schema(df):
+    """The same export under advanced_scoring_engine's column names"""
+    return pd.DataFrame({
+        'requisition_id': df['requisition_id'],
+        'candidate_id': [f'CAND-{i:08d}' for i in range(len(df))],
+        'recruiter_name': df['recruiter_name'],
+        'hiring_manager_name': df['hiring_manager_name'],
+        'current_stage': df['stage'],
+        'stage_start_date': df['stage_entered_date'],
+        'interview_date': df['interview_completed_date'],
+        'feedback_date': df['feedback_submitted_date'],
+        'team': df['team'],
+        'job_title': df['job_title'],
+        'role_opened_date': df['role_opened_date'],
+        'current_status': df['current_status'],
+    })
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a synthetic ATS export')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--shape', choices=sorted(SHAPES), default='balanced')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='synthetic_ats_export.csv')
+    args = parser.parse_args()
+
+    export = generate_export(args.rows, args.shape, args.seed)
+    export.to_csv(args.out, index=False)
+    print(f"✓ Wrote {len(export)} rows ({export['requisition_id'].nunique()} requisitions) to {args.out}")
@@ -0,0 +1,92 @@
+"""
+Delta alert checks (run with pytest)
+"""
+
+import io
+import json
+import os
+import time
+
+import pandas as pd
+
+from alerts import diff_fingerprints, fingerprint
+from conftest import ADMIN_TOKEN
+
+EXPORT = "sample_ats_export.csv"
+
+
+def violation(severity, penalty, stage="Onsite"):
+    return {
+        "requisition_id": "REQ-1", "stage": stage, "metric": "feedback_timeliness",
+        "responsible_party": "Hank Manager", "severity": severity, "penalty": penalty,
+    }
+
+
+def test_escalation_needs_a_worse_severity():
+    previous = fingerprint(pd.DataFrame([violation("medium", -10)]))
+
+    more = fingerprint(pd.DataFrame([violation("medium", -10), violation("medium", -10)]))
+    assert diff_fingerprints(previous, more) == {"new": [], "escalated": [], "resolved": []}
+
+    worse = fingerprint(pd.DataFrame([violation("medium", -10), violation("high", -25)]))
+    (escalated,) = diff_fingerprints(previous, worse)["escalated"]
+    assert (escalated["previous_severity"], escalated["severity"]) == ("medium", "high")
+
+
+def outbox_lines(api, dataset):
+    try:
+        with open(api.alert_log.outbox) as f:
+            return [line for line in map(json.loads, f) if line["dataset"] == dataset]
+    except FileNotFoundError:
+        return []
+
+
+def upload(client, dataset, body):
+    response = client.post(f"/api/datasets?dataset={dataset}", content=body, headers={"X-Admin-Token": ADMIN_TOKEN})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    deadline = time.time() + 120
+    while client.get(f"/api/jobs/{job_id}").json()["status"] not in ("done", "failed"):
+        assert time.time() < deadline
+        time.sleep(0.2)
+    assert client.get(f"/api/jobs/{job_id}").json()["status"] == "done"
+
+
+def wait_for_last(api, dataset, count):
+    """The dataset's stored diff once `count` runs have been recorded"""
+    deadline = time.time() + 60
+    while True:
+        last = api.alert_log.last(dataset)
+        if last is not None and (count == 1 or last["previous_version"] is not None):
+            return last
+        assert time.time() < deadline
+        time.sleep(0.1)
+
+
+def test_alerts_are_recorded_per_build_not_per_read(api, client):
+    dataset = "alerts"
+    full = pd.read_csv(EXPORT)
+    upload(client, dataset, full.to_csv(index=False).encode())
+    assert wait_for_last(api, dataset, 1)["baseline"]
+
+    # A later export without some requisitions: diffed when it is activated,
+    # with nobody reading /api/alerts in between
+    dropped = full["requisition_id"].unique()[:5]
+    smaller = io.StringIO()
+    full[~full["requisition_id"].isin(dropped)].to_csv(smaller, index=False)
+    upload(client, dataset, smaller.getvalue().encode())
+    last = wait_for_last(api, dataset, 2)
+    assert not last["baseline"]
+    assert last["resolved"]
+    assert {a["requisition_id"] for a in last["resolved"]} <= set(dropped)
+
+    lines = outbox_lines(api, dataset)
+    assert len(lines) == sum(last["counts"].values())
+
+    # Reading serves the stored diff and does not touch the outbox
+    for _ in range(2):
+        response = client.get(f"/api/alerts?dataset={dataset}").json()
+        assert response["version"] == last["version"]
+        assert response["counts"] == last["counts"]
+    assert len(outbox_lines(api, dataset)) == len(lines)
+    assert os.path.exists(api.alert_log.outbox)
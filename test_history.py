@@ -0,0 +1,151 @@
+"""
+History rebuild checks (run with pytest)
+
+score_history is checked against a row-by-row reference: the violations
+as they stood at each date (missing feedback medium after 48h and high
+after 72h, HM engagement tiered by the issues seen so far), scored by
+score_by_recruiter / score_by_hiring_manager and compared with the golden
+harness's diff_frames, which also compares dtypes.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from golden_equivalence import diff_frames, random_export
+from scoring_engine import ScorecardEngine
+
+HOUR = pd.Timedelta(hours=1)
+
+
+def engagement_issue_dates(engine, requisition_id):
+    """Dates of a requisition's HM engagement issues, as calculate_hm_engagement counts them"""
+    rows = engine.df[(engine.df['requisition_id'] == requisition_id)
+                     & (engine.df['is_hiring_manager_interview'] == True)]  # noqa: E712
+    dates = []
+    for completed, submitted in zip(rows['interview_completed_date'], rows['feedback_submitted_date']):
+        if pd.isna(completed):
+            continue
+        if pd.isna(submitted):
+            dates.append(completed + 72 * HOUR)
+        elif (submitted - completed).total_seconds() / 3600 > 72:
+            dates.append(submitted)
+    return dates
+
+
+def violations_as_of(engine, violations, date):
+    """The violations as they stood at `date`, one row each"""
+    rows = []
+    for _, row in violations.iterrows():
+        row = row.copy()
+        if row['metric'] == 'feedback_timeliness' and row.get('delay_hours') == 999:
+            if row['event_date'] + 72 * HOUR <= date:
+                pass
+            elif row['event_date'] + 48 * HOUR <= date:
+                row['severity'], row['penalty'] = 'medium', ScorecardEngine.PENALTIES['medium']
+            else:
+                continue
+        elif row['metric'] == 'hm_engagement':
+            issues = sum(d <= date for d in engagement_issue_dates(engine, row['requisition_id']))
+            if issues == 0:
+                continue
+            if issues <= 2:
+                row['severity'], row['penalty'] = 'medium', ScorecardEngine.PENALTIES['medium']
+            else:
+                row['severity'], row['penalty'] = 'high', ScorecardEngine.PENALTIES['high'] * min(issues, 3)
+        elif pd.isna(row['event_date']) or row['event_date'] > date:
+            continue
+        rows.append(row)
+    if not rows:
+        return violations.iloc[:0]
+    return pd.DataFrame(rows).astype({'penalty': violations['penalty'].dtype})
+
+
+def history_mismatches(df, dates=None):
+    """(date, table, difference) wherever score_history differs from the reference"""
+    engine = ScorecardEngine(df)
+    violations = engine.calculate_scores()
+    if dates is None:
+        event_dates = violations['event_date'].dropna() if len(violations) else pd.Series(dtype='datetime64[ns]')
+        if event_dates.empty:
+            dates = [pd.Timestamp('2025-01-01')]
+        else:
+            # Spread over the data, and past every late-feedback deadline
+            dates = sorted(set(event_dates.quantile([0, 0.25, 0.5, 0.75, 1.0], interpolation='nearest')))
+            dates.append(dates[-1] + pd.Timedelta(days=30))
+
+    problems = []
+    for date, recruiter_scores, hm_scores in engine.score_history(violations, dates):
+        upto = violations_as_of(engine, violations, date)
+        for label, table, reference, column in (
+            ('recruiters', recruiter_scores, engine.score_by_recruiter(upto), 'recruiter_name'),
+            ('hiring_managers', hm_scores, engine.score_by_hiring_manager(upto), 'hiring_manager_name'),
+        ):
+            first_opened = engine.df.groupby(column, sort=False)['role_opened_date'].min()
+            active = first_opened.index[(first_opened <= pd.Timestamp(date)).to_numpy()]
+            expected = reference[reference['name'].isin(active)].reset_index(drop=True)
+            problem = diff_frames(expected, table)
+            if problem:
+                problems.append((date, label, problem))
+    return problems
+
+
+def test_history_matches_reference_on_sample():
+    assert history_mismatches(pd.read_csv('sample_ats_export.csv')) == []
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_history_matches_reference_on_random_exports(seed):
+    assert history_mismatches(random_export(seed, max_rows=120)) == []
+
+
+def test_history_ends_at_score_by():
+    # Once every deadline has passed, history is the live score
+    df = pd.read_csv('sample_ats_export.csv')
+    engine = ScorecardEngine(df)
+    violations = engine.calculate_scores()
+    end = violations['event_date'].max() + pd.Timedelta(days=30)
+    _, recruiter_scores, hm_scores = next(engine.score_history(violations, [end]))
+    assert diff_frames(engine.score_by_recruiter(violations), recruiter_scores) is None
+    assert diff_frames(engine.score_by_hiring_manager(violations), hm_scores) is None
+
+
+def hm_interview_export(completed, submitted):
+    """One requisition whose HM interviews completed / got feedback at the given times"""
+    return pd.DataFrame({
+        'requisition_id': 'REQ-1', 'job_title': 'Engineer', 'team': 'Engineering',
+        'recruiter_name': 'Rita Recruiter', 'hiring_manager_name': 'Hank Manager',
+        'role_opened_date': '2025-01-01', 'current_status': 'Onsite', 'stage': 'Onsite',
+        'stage_entered_date': '2025-01-02 00:00:00',
+        'interview_completed_date': completed,
+        'feedback_submitted_date': submitted,
+        'interviewer_name': 'Hank Manager', 'is_hiring_manager_interview': True,
+    })
+
+
+def hm_score(df, dates):
+    engine = ScorecardEngine(df)
+    violations = engine.calculate_scores()
+    return [hm.set_index('name').loc['Hank Manager', ['feedback_score', 'engagement_score', 'total_violations']]
+            .tolist() for _, _, hm in engine.score_history(violations, dates)]
+
+
+def test_missing_feedback_counts_once_late():
+    df = hm_interview_export(['2025-01-10 09:00:00'], [np.nan])
+    completed = pd.Timestamp('2025-01-10 09:00:00')
+    # (feedback_score, engagement_score, violations): the engagement issue
+    # only counts once feedback is over 72h late
+    assert hm_score(df, [completed + HOUR, completed + 49 * HOUR, completed + 73 * HOUR]) == [
+        [100, 100, 0],
+        [90, 100, 1],
+        [75, 90, 2],
+    ]
+
+
+def test_engagement_accrues_per_issue():
+    completed = ['2025-01-10 09:00:00', '2025-01-20 09:00:00', '2025-01-30 09:00:00']
+    submitted = ['2025-01-14 09:00:00', '2025-01-24 09:00:00', '2025-02-03 09:00:00']   # each 96h late
+    df = hm_interview_export(completed, submitted)
+    dates = [pd.Timestamp('2025-01-15'), pd.Timestamp('2025-01-25'), pd.Timestamp('2025-02-04')]
+    # One issue: medium (-10); two: still -10; three: high, 3 x -25
+    assert [score[1] for score in hm_score(df, dates)] == [90, 90, 25]
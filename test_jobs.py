@@ -0,0 +1,85 @@
+"""
+Dataset upload and job retention checks (run with pytest)
+"""
+
+import os
+import time
+
+import jobs
+from conftest import ADMIN_TOKEN
+
+EXPORT = "sample_ats_export.csv"
+
+
+def read_export():
+    with open(EXPORT, "rb") as f:
+        return f.read()
+
+
+def job_ids(api):
+    if not os.path.isdir(api.DATASETS_DIR):
+        return set()
+    return {name for name in os.listdir(api.DATASETS_DIR) if name.isalnum()}
+
+
+def test_upload_requires_admin_token(api, client):
+    before = job_ids(api)
+    for headers in ({}, {"X-Admin-Token": "wrong"}):
+        response = client.post("/api/datasets", content=read_export(), headers=headers)
+        assert response.status_code == 403
+    assert job_ids(api) == before
+    datasets = {d["dataset"]: d for d in client.get("/api/datasets").json()["datasets"]}
+    assert not datasets[jobs.DEFAULT_DATASET]["uploaded"]
+
+
+def test_oversized_upload_is_refused_and_deleted(api, client):
+    body = b"x" * (api.MAX_UPLOAD_BYTES + 1)
+
+    def chunks():
+        for start in range(0, len(body), 64 * 1024):
+            yield body[start:start + 64 * 1024]
+
+    before = job_ids(api)
+    # Streamed without Content-Length, so the cap is enforced while writing
+    response = client.post("/api/datasets?dataset=big", content=chunks(), headers={"X-Admin-Token": ADMIN_TOKEN})
+    assert response.status_code == 413
+    (job_id,) = job_ids(api) - before
+    assert not os.path.exists(jobs.export_path(api.DATASETS_DIR, job_id))
+    assert jobs.read_job(api.DATASETS_DIR, job_id)["status"] == "failed"
+
+    # Declared up front: refused before anything is written
+    response = client.post("/api/datasets?dataset=big", content=body, headers={"X-Admin-Token": ADMIN_TOKEN})
+    assert response.status_code == 413
+    assert job_ids(api) - before == {job_id}
+
+
+def test_upload_with_token_is_served(api, client):
+    response = client.post("/api/datasets?dataset=emea", content=read_export(),
+                           headers={"X-Admin-Token": ADMIN_TOKEN})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    deadline = time.time() + 120
+    while client.get(f"/api/jobs/{job_id}").json()["status"] not in ("done", "failed"):
+        assert time.time() < deadline
+        time.sleep(0.2)
+    assert client.get(f"/api/jobs/{job_id}").json()["status"] == "done"
+    assert client.get("/api/org?dataset=emea").status_code == 200
+
+
+def test_prune_keeps_active_and_unfinished_jobs(tmp_path):
+    datasets = str(tmp_path)
+    created = {}
+    for label, status in (("active", "done"), ("superseded", "done"), ("failed", "failed"),
+                          ("running", "running"), ("recent", "done")):
+        job = jobs.create_job(datasets, dataset="emea")
+        jobs.update_job(jobs.job_dir(datasets, job["id"]), status=status,
+                        finished_at=None if status == "running" else 1000.0)
+        created[label] = job["id"]
+    jobs.update_job(jobs.job_dir(datasets, created["recent"]), finished_at=9000.0)
+    jobs.activate(datasets, created["active"], "emea")
+
+    removed = jobs.prune_jobs(datasets, max_age=3600, now=10_000.0)
+
+    assert sorted(removed) == sorted([created["superseded"], created["failed"]])
+    for label in ("active", "running", "recent"):
+        assert os.path.isdir(jobs.job_dir(datasets, created[label])), label
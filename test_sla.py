@@ -0,0 +1,116 @@
+"""
+SLA forecaster checks (run with pytest)
+"""
+
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from events import SnapshotWatcher
+from sla import BreachForecaster
+
+EXPORT = "sample_ats_export.csv"
+
+
+@pytest.fixture(scope="module")
+def export():
+    return pd.read_csv(EXPORT)
+
+
+def test_upcoming_does_not_move_the_clock(export):
+    forecaster = BreachForecaster(export)
+    pending = len(forecaster)
+    soon = forecaster.upcoming(24 * 20)
+    assert soon
+
+    later = forecaster.as_of + pd.Timedelta(days=365)
+    assert forecaster.upcoming(24 * 20, as_of=later) == []
+    assert forecaster.now == forecaster.as_of
+    assert len(forecaster) == pending
+    assert forecaster.upcoming(24 * 20) == soon
+
+
+def test_advance_emits_what_upcoming_forecast(export):
+    forecaster = BreachForecaster(export)
+    soon = forecaster.upcoming(72)
+    events = forecaster.advance(forecaster.as_of + pd.Timedelta(hours=72))
+    assert [{k: v for k, v in e.items() if k != "seq"} for e in events] == soon
+    assert forecaster.upcoming(72, as_of=forecaster.as_of) == forecaster.upcoming(72)
+
+
+def test_future_now_leaves_other_clients_unchanged(client, export):
+    as_of = BreachForecaster(export).as_of.isoformat()
+    params = {"hours": 24 * 20, "now": as_of}
+
+    before = client.get("/api/sla/upcoming", params=params).json()
+    assert before["upcoming"]
+
+    future = client.get("/api/sla/upcoming", params={"hours": 24, "now": "2099-01-01"}).json()
+    assert future["upcoming"] == []
+    assert future["as_of"].startswith("2099-01-01")
+
+    after = client.get("/api/sla/upcoming", params=params).json()
+    assert after == before
+
+
+def open_interview_export(completed, stage_entered=None):
+    """One recruiter interview completed at `completed` with no feedback yet"""
+    return pd.DataFrame({
+        "requisition_id": ["REQ-1"], "job_title": ["Engineer"], "team": ["Engineering"],
+        "recruiter_name": ["Rita Recruiter"], "hiring_manager_name": ["Hank Manager"],
+        "role_opened_date": ["2025-01-01"], "current_status": ["Hired"], "stage": ["Hired"],
+        "stage_entered_date": [stage_entered or completed],
+        "interview_completed_date": [completed], "feedback_submitted_date": [None],
+        "interviewer_name": ["Rita Recruiter"], "is_hiring_manager_interview": [False],
+    })
+
+
+def test_deadline_at_as_of_has_passed():
+    # as_of is exactly the 48h deadline: medium has passed, only high is ahead
+    completed = pd.Timestamp("2025-01-10 09:00:00")
+    df = open_interview_export(str(completed), stage_entered=str(completed + pd.Timedelta(hours=48)))
+    forecaster = BreachForecaster(df)
+    assert forecaster.as_of == completed + pd.Timedelta(hours=48)
+    assert [e["severity"] for e in forecaster.upcoming(48)] == ["high"]
+    assert forecaster.advance(forecaster.as_of + pd.Timedelta(hours=1)) == []
+    assert [e["severity"] for e in forecaster.advance(completed + pd.Timedelta(hours=72))] == ["high"]
+
+
+class FakeCache:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def current(self, path):
+        return self.snapshot
+
+
+def watched(snapshot):
+    watcher = SnapshotWatcher(FakeCache(snapshot), resolve=lambda dataset: dataset)
+    queue = asyncio.Queue()
+    watcher._subscribers["default"] = {queue}
+    return watcher, queue
+
+
+def test_watcher_does_not_replay_past_breaches(export):
+    # The sample is historical: all its deadlines passed before anyone watched
+    forecaster = BreachForecaster(export)
+    watcher, queue = watched({"version": "v1", "indexes": {"sla": forecaster}})
+    watcher.check_deadlines("default")
+    assert forecaster.breached > 0
+    assert queue.empty()
+
+
+def test_watcher_announces_deadlines_passing_while_watched():
+    completed = pd.Timestamp.now() - pd.Timedelta(hours=48) + pd.Timedelta(seconds=1)
+    forecaster = BreachForecaster(open_interview_export(str(completed)))
+    watcher, queue = watched({"version": "v1", "indexes": {"sla": forecaster}})
+    watcher.check_deadlines("default")
+    assert queue.empty()
+
+    time.sleep(1.5)
+    watcher.check_deadlines("default")
+    event, payload = queue.get_nowait()
+    assert event == "sla_breach"
+    assert [(b["owner"], b["severity"]) for b in payload["breaches"]] == [("Rita Recruiter", "medium")]
@@ -0,0 +1,82 @@
+"""
+Snapshot cache checks (run with pytest)
+"""
+
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from snapshot import TABLE_KEYS, SnapshotCache, deep_nbytes, load_snapshot
+
+EXPORT = "sample_ats_export.csv"
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return load_snapshot(EXPORT)
+
+
+def tables_nbytes(snapshot):
+    return int(sum(snapshot[key].memory_usage(index=True, deep=True).sum() for key in TABLE_KEYS))
+
+
+def test_nbytes_counts_indexes(sample):
+    indexes = deep_nbytes(sample["indexes"])
+    assert indexes > 0
+    for name in ("cube", "windows", "sla", "violations"):
+        assert deep_nbytes(sample["indexes"][name]) > 0, name
+    assert sample["nbytes"] == tables_nbytes(sample) + indexes
+
+
+def test_budget_evicts_on_index_size(sample):
+    # A budget that would hold both snapshots if only their tables counted
+    other = "other_export.csv"
+    cache = SnapshotCache(None, max_bytes=2 * tables_nbytes(sample))
+    cache.put(EXPORT, sample)
+    cache.put(other, {**sample, "version": "other"})
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert [e["path"] for e in stats["entries"]] == [other]
+
+
+def test_cache_builds_on_process_pool():
+    # Without a store the pool pickles the whole snapshot back, indexes included
+    cache = SnapshotCache(lambda: ProcessPoolExecutor(max_workers=1), store=None)
+    try:
+        snapshot = asyncio.run(cache.get(EXPORT))
+    finally:
+        cache.shutdown()
+    assert len(snapshot["violations"]) == len(load_snapshot(EXPORT)["violations"])
+    forecaster = snapshot["indexes"]["sla"]
+    assert forecaster.advance(forecaster.as_of + pd.Timedelta(days=30))
+    assert forecaster.upcoming(24) == []
+
+
+def test_cache_is_thread_safe(sample):
+    # Sync endpoints call current() from worker threads while the loop puts and reads stats
+    cache = SnapshotCache(None, max_bytes=sample["nbytes"] * 3)
+    cache.put(EXPORT, sample)
+    calls = 5000
+
+    def read():
+        for _ in range(calls):
+            assert cache.current(EXPORT) is sample
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)   # switch threads often enough to interleave the updates
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            readers = [pool.submit(read) for _ in range(8)]
+            for i in range(2000):
+                cache.put("other_export.csv", {**sample, "version": str(i)})
+                cache.stats()
+            for reader in readers:
+                reader.result()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert cache.stats()["hits"] == 8 * calls